@@ -5,8 +5,12 @@
 Entry point for dial ui.
 """
 
+import importlib
 import sys
-from typing import List
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    import argparse
 
 
 def main(sys_args: List = sys.argv[1:]):
@@ -16,21 +20,72 @@ def main(sys_args: List = sys.argv[1:]):
     Args:
         sys_args: A list of arguments from the command line.
     """
-    import dial_core
+    # The profiler must be enabled before importing anything else
+    if "--profile-startup" in sys_args:
+        from dial_gui import startup_profiler
+
+        startup_profiler.enable()
+
+    # Subcommands
+    if sys_args and sys_args[0] == "export-notebook":
+        from dial_gui.notebook import notebook_cli
+
+        sys.exit(notebook_cli.main(sys_args[1:]))
+
+    from dial_gui import startup_profiler
+
+    # Imported here only for timing it (It's used by the argument parser)
+    with startup_profiler.phase("import dial_core"):
+        importlib.import_module("dial_core")
 
     # Parse arguments
-    app_config = dial_core.utils.initialization.parse_args(sys_args)
+    app_config = get_arg_parser().parse_args(sys_args)
 
     # Initialize
-    from dial_gui.utils import initialization
+    with startup_profiler.phase("import dial_gui.utils.initialization"):
+        from dial_gui.utils import initialization
 
     initialization.initialize(app_config)
 
-    from dial_gui import app
+    with startup_profiler.phase("import dial_gui.app"):
+        from dial_gui import app
 
     # Run
     sys.exit(app.run(app_config))
 
 
+def get_arg_parser() -> "argparse.ArgumentParser":
+    """Returns the argument parser for the application."""
+    import dial_core
+
+    parser = dial_core.utils.initialization.get_arg_parser()
+
+    parser.add_argument(
+        "--profile-startup",
+        help="Write a report with the time spent on each startup phase",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "--max-loaded-nodes",
+        help="Unload the least recently used projects when the open projects have "
+        "more nodes than this (They're reloaded when activated)",
+        type=int,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--compression-level",
+        help="Save the projects compressed with this zlib level (0-9). Compressed "
+        "projects can't be opened by older versions of Dial",
+        type=int,
+        choices=range(10),
+        metavar="LEVEL",
+        default=None,
+    )
+
+    return parser
+
+
 if __name__ == "__main__":
     main()
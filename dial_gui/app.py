@@ -10,7 +10,9 @@ from typing import TYPE_CHECKING
 from dial_core.utils import log
 from PySide2.QtWidgets import QApplication
 
+from dial_gui import startup_profiler
 from dial_gui.main_window import MainWindowFactory
+from dial_gui.utils.plugin_loader import PluginLoaderSingleton
 
 if TYPE_CHECKING:
     import argparse
@@ -29,8 +31,26 @@ def run(args: "argparse.Namespace"):
         `dial_core.initialization.initialize_application`
     """
 
-    main_window = MainWindowFactory()
-    main_window.show()
+    with startup_profiler.phase("MainWindowFactory()"):
+        main_window = MainWindowFactory()
+
+    # The plugins loaded on background are included on the report too
+    plugin_loader = PluginLoaderSingleton()
+    startup_profiler.report_after_first_paint(
+        main_window,
+        wait_for=[("Plugins loaded", plugin_loader.finished)]
+        if plugin_loader.is_loading()
+        else [],
+    )
+
+    main_window.set_max_loaded_nodes(args.max_loaded_nodes)
+    main_window.set_compression_level(args.compression_level)
+
+    with startup_profiler.phase("MainWindow.show()"):
+        main_window.show()
+
+    with startup_profiler.phase("MainWindow.restore_session()"):
+        main_window.restore_session()
 
     LOGGER.debug("Command Line Arguments: %s", args)
     LOGGER.info("Dial.")
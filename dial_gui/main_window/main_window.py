@@ -1,14 +1,15 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 import dependency_injector.providers as providers
 from dial_core.utils import log
 from dial_gui.project import ProjectManagerGUISingleton
 from dial_gui.utils import application
+from dial_gui.utils.plugin_loader import PluginLoaderSingleton
 from dial_gui.widgets.editor_tabwidget import EditorTabWidgetFactory
 from PySide2.QtCore import QSize
-from PySide2.QtWidgets import QMainWindow
+from PySide2.QtWidgets import QLabel, QMainWindow
 
 from .main_menubar import MainMenuBarFactory
 
@@ -16,7 +17,8 @@ if TYPE_CHECKING:
     from dial_gui.widgets.editor_tabwidget import EditorTabWidget
     from PySide2.QtWidgets import QWidget
     from .main_menubar import MainMenuBar
-    from dial_gui.project import ProjectManagerGUI
+    from dial_gui.project import ProjectGUI, ProjectManagerGUI
+    from dial_gui.utils.plugin_loader import PluginLoader
 
 
 LOGGER = log.get_logger(__name__)
@@ -33,6 +35,7 @@ class MainWindow(QMainWindow):
         editor_tabwidget: "EditorTabWidget",
         main_menubar: "MainMenuBar",
         project_manager: "ProjectManagerGUI",
+        plugin_loader: "PluginLoader",
         parent: "QWidget" = None,
     ):
         super().__init__(parent)
@@ -56,12 +59,57 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.__editor_tabwidget)
 
         self.__main_menu_bar.quit.connect(self.close)
+        self.__project_manager.project_saved.connect(self.__show_project_saved_message)
+
+        # Plugins still loading
+        self.__plugin_loader = plugin_loader
+
+        self.__plugins_status_label = QLabel()
+        self.statusBar().addPermanentWidget(self.__plugins_status_label)
+
+        self.__plugin_loader.loading_changed.connect(self.__update_plugins_status)
+        self.__plugin_loader.finished.connect(self.__update_plugins_status)
+        self.__update_plugins_status()
 
     def closeEvent(self, event):
+        self.__editor_tabwidget.store_view_state()
         self.__project_manager.closeEvent(event)
 
         super().closeEvent(event)
 
+    def restore_session(self):
+        """Reopens the projects that were open when the application was last closed.
+        (See `ProjectManagerGUI.restore_session`)"""
+        self.__project_manager.restore_session()
+
+    def set_max_loaded_nodes(self, max_loaded_nodes: Optional[int]):
+        """Sets the memory budget of the open projects (See
+        `ProjectManagerGUI.max_loaded_nodes`)"""
+        self.__project_manager.max_loaded_nodes = max_loaded_nodes
+
+    def set_compression_level(self, compression_level: Optional[int]):
+        """Sets the zlib level used for saving the projects compressed (See
+        `ProjectManagerGUI.compression_level`)"""
+        self.__project_manager.compression_level = compression_level
+
+    def __show_project_saved_message(self, project: "ProjectGUI", written_bytes: int):
+        """Shows on the status bar how much data has been written when saving."""
+        if written_bytes:
+            message = f"{project.name}: {max(written_bytes // 1024, 1)} KB written"
+        else:
+            message = f"{project.name}: No changes"
+
+        self.statusBar().showMessage(message, 5000)
+
+    def __update_plugins_status(self):
+        """Shows on the status bar which plugins are still being loaded."""
+        loading_plugins = self.__plugin_loader.loading_plugins()
+
+        self.__plugins_status_label.setText(
+            "Loading plugins: " + ", ".join(plugin.name for plugin in loading_plugins)
+        )
+        self.__plugins_status_label.setVisible(bool(loading_plugins))
+
     def sizeHint(self) -> "QSize":
         """Returns the size of the main window."""
         return QSize(1000, 800)
@@ -72,4 +120,5 @@ MainWindowFactory = providers.Factory(
     editor_tabwidget=EditorTabWidgetFactory,
     main_menubar=MainMenuBarFactory,
     project_manager=ProjectManagerGUISingleton,
+    plugin_loader=PluginLoaderSingleton,
 )
@@ -1,6 +1,7 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
 
+from .deferred_inner_widget import DeferredInnerWidget
 from .graphics_connection import GraphicsConnection, GraphicsConnectionFactory
 from .graphics_connection_painter import (
     GraphicsConnectionPainter,
@@ -10,8 +11,11 @@ from .graphics_node import GraphicsNode, GraphicsNodeFactory
 from .graphics_port import GraphicsPort
 from .graphics_port_painter import GraphicsPortPainter
 from .graphics_scene import GraphicsScene, GraphicsSceneFactory
+from .layout_store import LayoutStore
+from .type_colors import TypeColor, TypeStyle
 
 __all__ = [
+    "DeferredInnerWidget",
     "GraphicsNode",
     "GraphicsNodeFactory",
     "GraphicsScene",
@@ -22,4 +26,7 @@ __all__ = [
     "GraphicsPort",
     "GraphicsPortPainter",
     "GraphicsSceneFactory",
+    "LayoutStore",
+    "TypeColor",
+    "TypeStyle",
 ]
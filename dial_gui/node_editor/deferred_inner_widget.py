@@ -0,0 +1,59 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import pickle
+from typing import Any, Optional
+
+from PySide2.QtWidgets import QWidget
+
+
+class DeferredInnerWidget(QWidget):
+    """The DeferredInnerWidget class is a placeholder for the inner widget of a node
+    whose state hasn't been deserialized yet.
+
+    When a project is opened, the inner widgets of its nodes are kept as opaque
+    serialized blobs until they're shown for the first time (See
+    `GraphicsNode.materialize_inner_widget`). If the project is saved before that, the
+    blob is written back as is.
+
+    A single placeholder is shared by all the references to the widget. Once
+    materialized, it keeps the real widget, and forwards to it the attributes that it
+    doesn't have, so objects still referencing the placeholder keep working.
+
+    Important:
+        The state of the widget is serialized independently from the rest of the
+        project, so it must not share references with other objects of the project.
+    """
+
+    def __init__(self, serialized_widget: bytes, parent: "QWidget" = None):
+        super().__init__(parent)
+
+        self.__serialized_widget = serialized_widget
+        self.__widget: Optional["QWidget"] = None
+
+    @property
+    def serialized_widget(self) -> bytes:
+        """Returns the serialized state of the real widget (As it was when the project
+        was opened)."""
+        return self.__serialized_widget
+
+    @property
+    def is_materialized(self) -> bool:
+        """Checks if the real widget has already been deserialized."""
+        return self.__widget is not None
+
+    def materialize(self) -> "QWidget":
+        """Returns the real widget, deserializing it the first time."""
+        if self.__widget is None:
+            self.__widget = pickle.loads(self.__serialized_widget)
+
+        return self.__widget
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for the attributes not found on the placeholder
+        if name.startswith("__") or name.startswith("_DeferredInnerWidget__"):
+            raise AttributeError(name)
+
+        return getattr(self.materialize(), name)
+
+    def __reduce__(self):
+        return (DeferredInnerWidget, (self.__serialized_widget,))
@@ -1,10 +1,10 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
-from typing import TYPE_CHECKING, Any, Dict
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import dependency_injector.providers as providers
 from dial_gui.event_filters import ResizableNodeEventFilter
-from PySide2.QtCore import Qt, Signal
+from PySide2.QtCore import Qt, QTimer, Signal
 from PySide2.QtWidgets import (
     QDialog,
     QGraphicsItem,
@@ -15,6 +15,7 @@ from PySide2.QtWidgets import (
     QWidget,
 )
 
+from .deferred_inner_widget import DeferredInnerWidget
 from .graphics_node_painter import GraphicsNodePainterFactory
 from .graphics_port import GraphicsPortFactory
 from .graphics_port_painter import (
@@ -23,18 +24,20 @@ from .graphics_port_painter import (
 )
 
 if TYPE_CHECKING:
-    from PySide2.QtCore import QRectF
-    from PySide2.QtGui import QPainter, QMouseEvent
+    from PySide2.QtCore import QRectF, QSizeF
+    from PySide2.QtGui import QPainter, QKeyEvent, QMouseEvent
 
     from dial_core.node_editor import Node, Port  # noqa: F401
     from PySide2.QtWidgets import QStyleOptionGraphicsItem, QGraphicsSceneMouseEvent
     from dial_gui.node_editor import GraphicsPort  # noqa: F401
     from .graphics_scene import GraphicsScene
+    from .layout_store import LayoutStore
 
 
 class GraphicsNode(QGraphicsObject):
     class ProxyWidget(QGraphicsProxyWidget):
         widget_resized = Signal("QSizeF")
+        widget_edited = Signal()
 
         def resize(self, x_or_point, y=None):
             if isinstance(x_or_point, float):
@@ -44,6 +47,18 @@ class GraphicsNode(QGraphicsObject):
 
             self.widget_resized.emit(self.size())
 
+        def keyReleaseEvent(self, event: "QKeyEvent"):
+            super().keyReleaseEvent(event)
+
+            self.widget_edited.emit()
+
+        def mouseReleaseEvent(self, event: "QGraphicsSceneMouseEvent"):
+            super().mouseReleaseEvent(event)
+
+            self.widget_edited.emit()
+
+    inner_widget_edited = Signal()
+
     def __init__(
         self,
         node: "Node",
@@ -59,6 +74,10 @@ class GraphicsNode(QGraphicsObject):
         self.__graphics_scene = graphics_scene
         self.parent_node_windows = []
 
+        # Layout store (Optional)
+        self.__layout_store: Optional["LayoutStore"] = None
+        self.__layout_slot = -1
+
         # GraphicsPorts
         self._input_graphics_ports = self.__create_graphics_ports(
             self._node.inputs, InputGraphicsPortPainterFactory
@@ -71,6 +90,8 @@ class GraphicsNode(QGraphicsObject):
         self._proxy_widget.setWidget(
             self._node.inner_widget if self._node.inner_widget else QWidget()
         )
+        self.__materialization_scheduled = False
+        self.__state_version = 0
 
         # Painter
         self._painter_factory = painter_factory
@@ -86,9 +107,9 @@ class GraphicsNode(QGraphicsObject):
         self.installEventFilter(self.__resizable_node_event_filter)
 
         # Connections
-        self._proxy_widget.widget_resized.connect(
-            lambda _: self._graphics_node_painter.recalculateGeometry()
-        )
+        self._proxy_widget.widget_resized.connect(self.__proxy_widget_resized)
+        self._proxy_widget.widget_edited.connect(self.inner_widget_edited)
+        self.inner_widget_edited.connect(self.__increase_state_version)
 
     @property
     def title(self):
@@ -106,6 +127,60 @@ class GraphicsNode(QGraphicsObject):
     def outputs(self):
         return self._output_graphics_ports
 
+    @property
+    def state_version(self) -> int:
+        """Returns a counter increased each time the inner widget is edited, so the
+        objects generated from the state of the node (e.g. notebook cells) can be
+        reused while it doesn't change."""
+        return self.__state_version
+
+    @property
+    def layout_slot(self) -> int:
+        """Returns the slot of this node on the attached LayoutStore (-1 if the node
+        doesn't have a LayoutStore attached)."""
+        return self.__layout_slot
+
+    def attach_layout_store(
+        self, layout_store: "LayoutStore", slot: int, restore: bool = False
+    ):
+        """Mirrors the geometry of this node on a slot of a LayoutStore.
+
+        Args:
+            layout_store: Store where the geometry will be written back.
+            slot: Slot of the store reserved for this node.
+            restore: If True, the node takes the position and size stored on the
+                slot. Otherwise, the current geometry of the node is written to it.
+        """
+        self.detach_layout_store()
+
+        self.__layout_store = layout_store
+        self.__layout_slot = slot
+
+        if restore:
+            self.prepareGeometryChange()
+            self.setPos(*layout_store.position(slot))
+
+            width, height = layout_store.size(slot)
+            if width > 0 and height > 0:
+                self._proxy_widget.resize(width, height)
+        else:
+            proxy_size = self._proxy_widget.size()
+
+            layout_store.set_position(slot, self.x(), self.y())
+            layout_store.set_size(slot, proxy_size.width(), proxy_size.height())
+
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+
+    def detach_layout_store(self):
+        """Stops mirroring the geometry of the node on its LayoutStore."""
+        if not self.__layout_store:
+            return
+
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, False)
+
+        self.__layout_store = None
+        self.__layout_slot = -1
+
     def boundingRect(self) -> "QRectF":
         """Returns a rect enclosing the node."""
         return self._graphics_node_painter.boundingRect()
@@ -123,8 +198,45 @@ class GraphicsNode(QGraphicsObject):
 
             return value
 
+        if change == self.ItemPositionHasChanged and self.__layout_store:
+            self.__layout_store.set_position(self.__layout_slot, value.x(), value.y())
+
         return super().itemChange(change, value)
 
+    def __increase_state_version(self):
+        self.__state_version += 1
+
+    def has_deferred_inner_widget(self) -> bool:
+        """Checks if the inner widget of the node hasn't been deserialized yet."""
+        return isinstance(self._node.inner_widget, DeferredInnerWidget)
+
+    def materialize_inner_widget(self) -> Optional["QWidget"]:
+        """Deserializes the inner widget of the node, if it was deferred when the
+        project was opened, and displays it on the node.
+
+        Returns:
+            The (real) inner widget of the node.
+        """
+        self.__materialization_scheduled = False
+
+        deferred_widget = self._node.inner_widget
+
+        if not isinstance(deferred_widget, DeferredInnerWidget):
+            return deferred_widget
+
+        # The placeholder may be shared, so it isn't deleted: Other objects still
+        # referencing it get the same (real) widget through it
+        inner_widget = deferred_widget.materialize()
+        self._node._inner_widget = inner_widget
+
+        if self._proxy_widget.widget() is deferred_widget:
+            proxy_size = self._proxy_widget.size()
+
+            self.set_inner_widget(inner_widget)
+            self._proxy_widget.resize(proxy_size)
+
+        return inner_widget
+
     def mouseDoubleClickEvent(self, event: "QGraphicsSceneMouseEvent"):
         if event.button() == Qt.LeftButton:
             self.__toggle_widget_dialog(event)
@@ -136,6 +248,7 @@ class GraphicsNode(QGraphicsObject):
         substituted with a button that hides the dialog and shows the inner_widget back
         in the node when pressed.
         """
+        self.materialize_inner_widget()
 
         node_inner_widget = self._proxy_widget.widget()
         previous_node_size = node_inner_widget.size()
@@ -180,6 +293,14 @@ class GraphicsNode(QGraphicsObject):
         self._graphics_node_painter.repositionWidget()
         self._graphics_node_painter.recalculateGeometry()
 
+    def __proxy_widget_resized(self, size: "QSizeF"):
+        self._graphics_node_painter.recalculateGeometry()
+
+        if self.__layout_store:
+            self.__layout_store.set_size(
+                self.__layout_slot, size.width(), size.height()
+            )
+
     def __create_graphics_ports(
         self, ports_dict: Dict[str, "Port"], painter_factory: "providers.Factory"
     ) -> Dict[str, "GraphicsPort"]:
@@ -202,9 +323,17 @@ class GraphicsNode(QGraphicsObject):
         return graphics_ports_dict
 
     def __getstate__(self):
+        # The geometry of nodes using a LayoutStore is saved (and mapped back) on the
+        # sidecar layout file instead (See `ProjectGUI.save_layout`)
+        if self.__layout_store:
+            return {}
+
         return {"pos": self.pos(), "proxy_size": self._proxy_widget.size()}
 
     def __setstate__(self, new_state: dict):
+        if "pos" not in new_state:
+            return
+
         self.prepareGeometryChange()
         self.setPos(new_state["pos"])
 
@@ -216,9 +345,18 @@ class GraphicsNode(QGraphicsObject):
     def paint(
         self, painter: "QPainter", option: "QStyleOptionGraphicsItem", widget: "QWidget"
     ):
-        """Paints the GraphicsNode item."""
+        """Paints the GraphicsNode item.
+
+        The first time a node with a deferred inner widget is painted (It has entered
+        the viewport), the widget is deserialized.
+        """
         self._graphics_node_painter.paint(painter, option, widget)
 
+        if not self.__materialization_scheduled and self.has_deferred_inner_widget():
+            # Don't modify the item while it's being painted
+            self.__materialization_scheduled = True
+            QTimer.singleShot(0, self.materialize_inner_widget)
+
 
 GraphicsNodeFactory = providers.Factory(
     GraphicsNode, painter_factory=GraphicsNodePainterFactory.delegate()
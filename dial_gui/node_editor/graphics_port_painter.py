@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 
 import dependency_injector.providers as providers
 from PySide2.QtCore import QRectF, Qt
-from PySide2.QtGui import QBrush, QPainter, QPen
+from PySide2.QtGui import QPainter
 from PySide2.QtWidgets import QGraphicsItem, QGraphicsTextItem
 
 from .type_colors import TypeColor
@@ -42,17 +42,13 @@ class GraphicsPortPainter:
 
         self.port_name_position = port_name_position
 
-        # Colors/Pens/Brushes
+        # Colors/Pens/Brushes (Shared between all the ports of the same type)
+        type_style = TypeColor.get_style_for(graphics_port._port.port_type)
 
-        self.__color = TypeColor.get_color_for(graphics_port._port.port_type)
-
-        self.__outline_pen = QPen(self.__color.darker())
-        self.__outline_pen.setWidthF(2)
-        self.__background_brush = QBrush(self.__color)
-
-        self.__dashed_outline_pen = QPen(self.__color)
-        self.__dashed_outline_pen.setStyle(Qt.DashLine)
-        self.__dashed_outline_pen.setWidth(2)
+        self.__color = type_style.color
+        self.__outline_pen = type_style.outline_pen
+        self.__background_brush = type_style.background_brush
+        self.__dashed_outline_pen = type_style.dashed_outline_pen
 
     @property
     def port_name_position(self) -> "PortNamePosition":
@@ -1,10 +1,11 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 import dependency_injector.providers as providers
 from dial_core.node_editor import Node, Scene, SceneFactory
 from dial_core.utils import log
+from PySide2.QtCore import QTimer, Signal
 from PySide2.QtWidgets import QGraphicsItem, QGraphicsScene
 
 from .graphics_connection import GraphicsConnection
@@ -15,11 +16,32 @@ if TYPE_CHECKING:
     from PySide2.QtWidgets import QObject
     from PySide2.QtCore import QRectF
     from PySide2.QtGui import QPainter
+    from .layout_store import LayoutStore
 
 LOGGER = log.get_logger(__name__)
 
 
 class GraphicsScene(QGraphicsScene):
+    """The GraphicsScene class provides a surface for managing the graphical items
+    (nodes, connections...) of a Scene.
+
+    When a GraphicsScene is restored from a file, its nodes are added in batches of
+    `loading_batch_size` nodes, each time the event loop is idle. This way, big scenes
+    are displayed progressively instead of blocking the GUI until fully loaded.
+
+    Signals:
+        graph_changed: A node or connection has been added/removed, or the inner
+            widget of a node has been edited. (Not emitted while the scene is loading)
+        loading_progress: Number of nodes added and total of nodes being loaded.
+        loading_finished: All the nodes of the scene have been loaded.
+    """
+
+    graph_changed = Signal()
+    loading_progress = Signal(int, int)
+    loading_finished = Signal()
+
+    loading_batch_size = 100
+
     def __init__(
         self,
         scene: "Scene",
@@ -30,6 +52,15 @@ class GraphicsScene(QGraphicsScene):
 
         self.__scene = scene
         self.__graphics_nodes: List["GraphicsNode"] = []
+        self.__layout_store: Optional["LayoutStore"] = None
+
+        # Nodes waiting to be added to the scene (When loading from a file)
+        self.__pending_graphics_nodes: List["GraphicsNode"] = []
+        self.__pending_total = 0
+
+        self.__loading_timer = QTimer(self)
+        self.__loading_timer.setInterval(0)
+        self.__loading_timer.timeout.connect(self.__add_next_pending_batch)
 
         # Painter
         self._painter_factory = painter_factory
@@ -50,6 +81,70 @@ class GraphicsScene(QGraphicsScene):
     def graphics_nodes(self):
         return self.__graphics_nodes
 
+    @property
+    def layout_store(self) -> Optional["LayoutStore"]:
+        """Returns the LayoutStore where the geometry of the nodes is mirrored (None if
+        the scene doesn't use a LayoutStore)."""
+        return self.__layout_store
+
+    def attach_layout_store(self, layout_store: "LayoutStore", restore: bool = False):
+        """Mirrors the geometry of all the nodes of the scene on a LayoutStore.
+
+        Args:
+            layout_store: The store used.
+            restore: If True, the nodes take the geometry stored on the LayoutStore
+                (The row `i` of the store belongs to the node `i` of the scene).
+                Otherwise, the current geometry of the nodes is written to the store.
+        """
+        self.detach_layout_store()
+
+        self.__layout_store = layout_store
+        restorable_rows = len(layout_store) if restore else 0
+
+        for graphics_node in self.__graphics_nodes:
+            slot = layout_store.allocate()
+            graphics_node.attach_layout_store(
+                layout_store, slot, restore=slot < restorable_rows
+            )
+
+    def detach_layout_store(self):
+        """Stops using a LayoutStore for the nodes geometry."""
+        if not self.__layout_store:
+            return
+
+        for graphics_node in self.__graphics_nodes:
+            graphics_node.detach_layout_store()
+
+        self.__layout_store = None
+
+    def is_loading(self) -> bool:
+        """Checks if there are nodes still waiting to be added to the scene."""
+        return self.__loading_timer.isActive()
+
+    def finish_loading(self):
+        """Adds all the pending nodes to the scene right away."""
+        if self.is_loading():
+            self.__add_pending_graphics_nodes(len(self.__pending_graphics_nodes))
+
+    def cancel_loading(self):
+        """Stops adding pending nodes to the scene. Nodes not added yet are discarded.
+        """
+        self.__loading_timer.stop()
+        self.__pending_graphics_nodes.clear()
+
+    def materialize_inner_widgets(self):
+        """Deserializes all the deferred inner widgets of the nodes in the scene.
+
+        Needed before accessing the state of the inner widgets from outside the canvas
+        (For example, when generating the notebook of the project).
+
+        Important:
+            Only the nodes already added are materialized. If the scene is still
+            loading, wait for `loading_finished` (or call `finish_loading` first).
+        """
+        for graphics_node in self.__graphics_nodes:
+            graphics_node.materialize_inner_widget()
+
     def addItem(self, item: "QGraphicsItem"):
         if isinstance(item, GraphicsNode):
             self.__add_graphics_node(item)
@@ -57,13 +152,20 @@ class GraphicsScene(QGraphicsScene):
 
         super().addItem(item)
 
+        if isinstance(item, GraphicsConnection) and item.is_connected():
+            self.__notify_graph_changed()
+
     def removeItem(self, item: "QGraphicsItem"):
         if isinstance(item, GraphicsNode):
             self.__remove_graphics_node(item)
             return
 
         if isinstance(item, GraphicsConnection):
+            was_connected = item.is_connected()
             self.__remove_graphics_connection(item)
+
+            if was_connected:
+                self.__notify_graph_changed()
             return
 
         super().removeItem(item)
@@ -83,6 +185,7 @@ class GraphicsScene(QGraphicsScene):
             super().addItem(graphics_node)
 
             graphics_node.setPos(old_graphics_node.x() + 50, old_graphics_node.y() - 50)
+            self.__attach_to_layout_store(graphics_node)
 
             for graphics_port in list(graphics_node.inputs.values()) + list(
                 graphics_node.outputs.values()
@@ -91,6 +194,9 @@ class GraphicsScene(QGraphicsScene):
                     # TODO: Solve items duplication with this approach
                     self.addItem(graphics_connection)
 
+        if new_graphics_nodes:
+            self.__notify_graph_changed()
+
         return new_graphics_nodes
 
     def drawBackground(self, painter: "QPainter", rect: "QRectF"):
@@ -102,9 +208,13 @@ class GraphicsScene(QGraphicsScene):
     def __add_graphics_node(self, graphics_node: "GraphicsNode"):
         self.__scene.add_node(graphics_node._node)
         self.__graphics_nodes.append(graphics_node)
+        self.__attach_to_layout_store(graphics_node)
+        graphics_node.inner_widget_edited.connect(self.__notify_graph_changed)
 
         super().addItem(graphics_node)
 
+        self.__notify_graph_changed()
+
     def __remove_graphics_node(self, graphics_node: "GraphicsNode"):
         try:
             self.__graphics_nodes.remove(graphics_node)
@@ -119,8 +229,15 @@ class GraphicsScene(QGraphicsScene):
             for nodes_window in graphics_node.parent_node_windows:
                 nodes_window.remove_graphics_node(graphics_node)
 
+            if self.__layout_store and graphics_node.layout_slot >= 0:
+                self.__layout_store.release(graphics_node.layout_slot)
+                graphics_node.detach_layout_store()
+
+            graphics_node.inner_widget_edited.disconnect(self.__notify_graph_changed)
             super().removeItem(graphics_node)
 
+            self.__notify_graph_changed()
+
         except ValueError:
             pass
 
@@ -129,19 +246,37 @@ class GraphicsScene(QGraphicsScene):
         graphics_connection.end_graphics_port = None
         super().removeItem(graphics_connection)
 
+    def __attach_to_layout_store(self, graphics_node: "GraphicsNode"):
+        """Reserves a slot for the node on the LayoutStore (if the scene uses one)."""
+        if self.__layout_store:
+            graphics_node.attach_layout_store(
+                self.__layout_store, self.__layout_store.allocate()
+            )
+
     def __create_graphics_node_from(self, node: "Node"):
-        return GraphicsNodeFactory(node, graphics_scene=self)
+        graphics_node = GraphicsNodeFactory(node, graphics_scene=self)
+        graphics_node.inner_widget_edited.connect(self.__notify_graph_changed)
 
-    def __getstate__(self):
-        LOGGER.debug("Saving scene:\n%s", self.__scene)
-        return {"graphics_nodes": self.__graphics_nodes}
+        return graphics_node
 
-    def __setstate__(self, new_state: dict):
-        """Composes a GraphicsScene object from a pickled dict."""
-        print("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAa STARTING GRAPHISCENCEn")
-        self.clear()
+    def __notify_graph_changed(self):
+        if not self.is_loading():
+            self.graph_changed.emit()
+
+    def __add_next_pending_batch(self):
+        """Adds the next batch of pending nodes to the scene."""
+        self.__add_pending_graphics_nodes(self.loading_batch_size)
+
+    def __add_pending_graphics_nodes(self, count: int):
+        """Adds (at most) `count` pending nodes, with their connections, to the scene.
 
-        for graphics_node in new_state["graphics_nodes"]:
+        Emits `loading_progress`, and `loading_finished` when there aren't more pending
+        nodes.
+        """
+        batch = self.__pending_graphics_nodes[:count]
+        del self.__pending_graphics_nodes[:count]
+
+        for graphics_node in batch:
             self.addItem(graphics_node)
 
             for graphics_port in list(graphics_node.inputs.values()) + list(
@@ -151,9 +286,35 @@ class GraphicsScene(QGraphicsScene):
                     # TODO: Solve items duplication with this approach
                     self.addItem(graphics_connection)
 
-        LOGGER.debug("Loading scene:\n%s", self.__scene)
+        self.loading_progress.emit(
+            self.__pending_total - len(self.__pending_graphics_nodes),
+            self.__pending_total,
+        )
+
+        if not self.__pending_graphics_nodes:
+            self.__loading_timer.stop()
+
+            LOGGER.debug("Loading scene:\n%s", self.__scene)
+            self.update()
+
+            self.loading_finished.emit()
+
+    def __getstate__(self):
+        LOGGER.debug("Saving scene:\n%s", self.__scene)
+        return {"graphics_nodes": self.__graphics_nodes + self.__pending_graphics_nodes}
+
+    def __setstate__(self, new_state: dict):
+        """Composes a GraphicsScene object from a pickled dict.
+
+        The nodes aren't added immediately, but in batches when the event loop is idle.
+        (See `is_loading` and `loading_finished`)
+        """
+        self.clear()
+
+        self.__pending_graphics_nodes = list(new_state["graphics_nodes"])
+        self.__pending_total = len(self.__pending_graphics_nodes)
 
-        self.update()
+        self.__loading_timer.start()
 
     def __reduce__(self):
         # Return an empty scene (Because the real scene will be restored later)
@@ -0,0 +1,199 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from dial_core.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+
+class LayoutStore:
+    """The LayoutStore class provides a columnar storage for the geometry of the nodes
+    of a scene.
+
+    Each node is assigned a slot (a row) where its position, size and the bitmask of
+    the NodesWindows it belongs to are stored. Keeping this data on a single NumPy
+    array is cheaper than having thousands of Qt objects, and allows running bulk
+    layout operations (translations, bounding rects...) vectorized.
+
+    The store can be saved to a sidecar file next to the `.dial` project file, and
+    memory-mapped when the project is opened again.
+
+    Attributes:
+        dtype: NumPy dtype of each row of the store.
+    """
+
+    dtype = np.dtype(
+        [
+            ("x", "<f8"),
+            ("y", "<f8"),
+            ("width", "<f8"),
+            ("height", "<f8"),
+            ("windows", "<u8"),
+        ]
+    )
+
+    sidecar_extension = ".layout.npy"
+
+    def __init__(self, rows: Optional[np.ndarray] = None, capacity: int = 1024):
+        if rows is None:
+            rows = np.zeros(capacity, dtype=self.dtype)
+
+        self.__rows = rows
+        self.__used = np.zeros(len(rows), dtype=bool)
+        self.__free_slots: List[int] = []
+        self.__next_slot = 0
+
+    @classmethod
+    def layout_file_path(cls, project_file_path: str) -> str:
+        """Returns the path of the sidecar file for the `project_file_path` project."""
+        return os.path.splitext(project_file_path)[0] + cls.sidecar_extension
+
+    @classmethod
+    def open(cls, project_file_path: str) -> Optional["LayoutStore"]:
+        """Memory-maps the sidecar file of a project.
+
+        The file is mapped as copy-on-write: Changes on the store aren't written to the
+        file until the store is explicitly saved.
+
+        Returns:
+            The mapped LayoutStore, or None if the project doesn't have a sidecar file.
+        """
+        layout_file_path = cls.layout_file_path(project_file_path)
+
+        if not os.path.isfile(layout_file_path):
+            return None
+
+        try:
+            rows = np.load(layout_file_path, mmap_mode="c")
+        except ValueError as err:
+            LOGGER.warning("Invalid layout file %s: %s", layout_file_path, err)
+            return None
+
+        if rows.dtype != cls.dtype:
+            LOGGER.warning("Layout file %s has an unknown format.", layout_file_path)
+            return None
+
+        return cls(rows)
+
+    @property
+    def rows(self) -> "np.ndarray":
+        """Returns the array with all the rows of the store (Used or not)."""
+        return self.__rows
+
+    def __len__(self) -> int:
+        """Returns the number of rows of the store."""
+        return len(self.__rows)
+
+    def allocate(self) -> int:
+        """Reserves a new slot on the store, growing it if necessary.
+
+        Returns:
+            The index of the reserved slot.
+        """
+        if self.__free_slots:
+            slot = self.__free_slots.pop()
+        else:
+            slot = self.__next_slot
+            self.__next_slot += 1
+
+            if slot >= len(self.__rows):
+                self.__grow(max(2 * len(self.__rows), 1024))
+
+        self.__used[slot] = True
+
+        return slot
+
+    def release(self, slot: int):
+        """Frees a slot, so it can be reused by another node."""
+        if not self.__used[slot]:
+            return
+
+        self.__used[slot] = False
+        self.__rows[slot] = 0
+        self.__free_slots.append(slot)
+
+    def position(self, slot: int) -> Tuple[float, float]:
+        """Returns the (x, y) position stored on a slot."""
+        row = self.__rows[slot]
+        return (float(row["x"]), float(row["y"]))
+
+    def set_position(self, slot: int, x: float, y: float):
+        """Stores a new (x, y) position on a slot."""
+        self.__rows["x"][slot] = x
+        self.__rows["y"][slot] = y
+
+    def size(self, slot: int) -> Tuple[float, float]:
+        """Returns the (width, height) size stored on a slot."""
+        row = self.__rows[slot]
+        return (float(row["width"]), float(row["height"]))
+
+    def set_size(self, slot: int, width: float, height: float):
+        """Stores a new (width, height) size on a slot."""
+        self.__rows["width"][slot] = width
+        self.__rows["height"][slot] = height
+
+    def windows_mask(self, slot: int) -> int:
+        """Returns the bitmask of the windows the slot belongs to."""
+        return int(self.__rows["windows"][slot])
+
+    def set_windows_mask(self, slot: int, mask: int):
+        """Stores a new windows bitmask on a slot."""
+        self.__rows["windows"][slot] = mask
+
+    def translate(self, slots: Sequence[int], dx: float, dy: float):
+        """Moves all the passed slots by (dx, dy) in a single operation."""
+        slots = np.asarray(slots, dtype=np.intp)
+
+        self.__rows["x"][slots] += dx
+        self.__rows["y"][slots] += dy
+
+    def bounding_rect(
+        self, slots: Optional[Sequence[int]] = None
+    ) -> Tuple[float, float, float, float]:
+        """Returns the (x, y, width, height) rect enclosing all the passed slots (Or all
+        the used slots, if not specified)."""
+        rows = self.__rows[self.__used] if slots is None else self.__rows[list(slots)]
+
+        if len(rows) == 0:
+            return (0.0, 0.0, 0.0, 0.0)
+
+        left = float(rows["x"].min())
+        top = float(rows["y"].min())
+        right = float((rows["x"] + rows["width"]).max())
+        bottom = float((rows["y"] + rows["height"]).max())
+
+        return (left, top, right - left, bottom - top)
+
+    def rows_of(self, slots: Sequence[int]) -> "np.ndarray":
+        """Returns a copy of the rows of the passed slots, in order."""
+        return self.__rows[list(slots)]
+
+    def save(self, project_file_path: str, slots: Sequence[int]):
+        """Writes the rows of the passed slots, in order, to the sidecar file of the
+        project. Later, the row `i` of the file will correspond to `slots[i]`."""
+        layout_file_path = self.layout_file_path(project_file_path)
+
+        saved_rows = np.lib.format.open_memmap(
+            layout_file_path, mode="w+", dtype=self.dtype, shape=(len(slots),)
+        )
+        saved_rows[:] = self.rows_of(slots)
+        saved_rows.flush()
+
+        del saved_rows
+
+        LOGGER.debug("Layout of %s nodes saved on %s", len(slots), layout_file_path)
+
+    def __grow(self, new_capacity: int):
+        """Reallocates the store with more rows. A mapped store is copied into memory.
+        """
+        rows = np.zeros(new_capacity, dtype=self.dtype)
+        rows[: len(self.__rows)] = self.__rows
+
+        used = np.zeros(new_capacity, dtype=bool)
+        used[: len(self.__used)] = self.__used
+
+        self.__rows = rows
+        self.__used = used
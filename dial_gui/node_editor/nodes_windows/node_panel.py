@@ -21,6 +21,7 @@ class NodePanel(QDockWidget):
         super().__init__(graphics_node.title, parent)
 
         self.__graphics_node = graphics_node
+        self.__graphics_node.materialize_inner_widget()
 
         self.__proxy_widget = self.__graphics_node._proxy_widget
 
@@ -1,29 +1,152 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
-from typing import Callable, List
+import re
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple, Union
 
-from dial_core.datasets import Dataset, TTVSets
 from dial_core.utils import Dial
-from PySide2.QtGui import QColor
-from tensorflow.keras import Model
-from tensorflow.keras.callbacks import Callback
+from PySide2.QtCore import Qt
+from PySide2.QtGui import QBrush, QColor, QPen
+
+
+class TypeStyle(NamedTuple):
+    """Color, pens and brushes used for painting the ports of a type."""
+
+    color: "QColor"
+    outline_pen: "QPen"
+    background_brush: "QBrush"
+    dashed_outline_pen: "QPen"
 
 
 class TypeColor:
-    colors = {
-        int: QColor("#B54747"),
-        str: QColor("#0056A6"),
-        Dataset: QColor("#6666FF"),
-        TTVSets: QColor("#1785CF"),
-        Dial.KerasLayerListMIME: QColor("#AA0000"),
-        Model: QColor("#000099"),
-        List[Callable]: QColor("#33AA22"),
-        List[Callback]: QColor("#d00000"),
-    }
+    """The TypeColor class is a registry of the colors used for each port type.
+
+    Colors can be registered for type objects, or for the qualified names of the types
+    (like "tensorflow.keras.Model"). Qualified names are resolved lazily, on lookup,
+    and only if their module has already been imported by someone else. This way, the
+    registry never imports heavy modules (like TensorFlow) just to have their colors.
+
+    Qualified names can be wrapped on a `List[...]`, representing a `typing.List` of
+    the type.
+
+    Plugins can register colors for their own port types with `register_color`.
+    """
+
+    default_color = "#000000"
+
+    __colors: Dict[Any, "QColor"] = {}
+    __pending_names: Dict[str, "QColor"] = {}
+    __styles: Dict[str, "TypeStyle"] = {}
+
+    __list_regex = re.compile(r"^List\[(.+)\]$")
+
+    @classmethod
+    def register_color(cls, port_type: Union[str, Any], color: Union[str, "QColor"]):
+        """Registers the color used for `port_type`.
+
+        Args:
+            port_type: A type object, or its qualified name.
+            color: A QColor, or any string accepted by QColor.
+        """
+        color = QColor(color)
+
+        if isinstance(port_type, str):
+            cls.__pending_names[port_type] = color
+        else:
+            cls.__colors[port_type] = color
+
+    @classmethod
+    def get_color_for(cls, port_type: Any) -> "QColor":
+        """Returns the color registered for `port_type` (or `default_color`)."""
+        try:
+            return QColor(cls.__colors[port_type])
+        except KeyError:
+            pass
+        except TypeError:  # Unhashable types
+            return QColor(cls.default_color)
+
+        cls.__resolve_pending_names()
+
+        return QColor(cls.__colors.get(port_type, cls.default_color))
 
     @classmethod
-    def get_color_for(cls, port_type):
+    def get_style_for(cls, port_type: Any) -> "TypeStyle":
+        """Returns the pens and brushes for painting ports of `port_type`. They're
+        shared between all the ports with the same color, so they must not be modified.
+        """
+        color = cls.get_color_for(port_type)
+
         try:
-            return cls.colors[port_type]
+            return cls.__styles[color.name()]
         except KeyError:
-            return QColor("#000000")
+            pass
+
+        outline_pen = QPen(color.darker())
+        outline_pen.setWidthF(2)
+
+        dashed_outline_pen = QPen(color)
+        dashed_outline_pen.setStyle(Qt.DashLine)
+        dashed_outline_pen.setWidth(2)
+
+        style = TypeStyle(
+            color=color,
+            outline_pen=outline_pen,
+            background_brush=QBrush(color),
+            dashed_outline_pen=dashed_outline_pen,
+        )
+
+        cls.__styles[color.name()] = style
+
+        return style
+
+    @classmethod
+    def __resolve_pending_names(cls):
+        """Converts the registered names whose module is already imported to types."""
+        for name in list(cls.__pending_names.keys()):
+            try:
+                port_type = cls.__resolve_name(name)
+            except LookupError:
+                continue
+
+            cls.__colors[port_type] = cls.__pending_names.pop(name)
+
+    @classmethod
+    def __resolve_name(cls, name: str) -> Any:
+        """Returns the object identified by a qualified name.
+
+        Raises:
+            LookupError: If the module of the object hasn't been imported yet (or the
+                object doesn't exist).
+        """
+        list_match = cls.__list_regex.match(name)
+        if list_match:
+            return List[cls.__resolve_name(list_match.group(1))]  # type: ignore
+
+        parts = name.split(".")
+
+        # Find the longest prefix that is an already imported module
+        for i in range(len(parts) - 1, 0, -1):
+            module = sys.modules.get(".".join(parts[:i]))
+            if module is None:
+                continue
+
+            obj = module
+            try:
+                for attribute in parts[i:]:
+                    obj = getattr(obj, attribute)
+            except AttributeError:
+                raise LookupError(f"{name} not found.")
+
+            return obj
+
+        raise LookupError(f"The module of {name} hasn't been imported.")
+
+
+TypeColor.register_color(int, "#B54747")
+TypeColor.register_color(str, "#0056A6")
+TypeColor.register_color(Dial.KerasLayerListMIME, "#AA0000")
+TypeColor.register_color(List[Callable], "#33AA22")
+TypeColor.register_color("dial_core.datasets.Dataset", "#6666FF")
+TypeColor.register_color("dial_core.datasets.TTVSets", "#1785CF")
+TypeColor.register_color("tensorflow.keras.Model", "#000099")
+TypeColor.register_color("List[tensorflow.keras.callbacks.Callback]", "#d00000")
@@ -0,0 +1,34 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+from .incremental_notebook_generator import (
+    IncrementalNotebookGenerator,
+    IncrementalNotebookGeneratorFactory,
+    cells_digest,
+)
+from .notebook_export import (
+    ExportTarget,
+    NotebookExportJob,
+    export_notebook,
+    export_notebook_to,
+    notebooks_directory,
+)
+from .notebook_exporter_service import NotebookExporterService
+from .notebook_html_renderer import NotebookHTMLRenderer
+from .notebook_html_worker import NotebookHTMLWorker
+from .notebook_kernel_runner import NotebookKernelRunner, output_to_html
+
+__all__ = [
+    "IncrementalNotebookGenerator",
+    "IncrementalNotebookGeneratorFactory",
+    "cells_digest",
+    "ExportTarget",
+    "NotebookExportJob",
+    "export_notebook",
+    "export_notebook_to",
+    "notebooks_directory",
+    "NotebookExporterService",
+    "NotebookHTMLRenderer",
+    "NotebookHTMLWorker",
+    "NotebookKernelRunner",
+    "output_to_html",
+]
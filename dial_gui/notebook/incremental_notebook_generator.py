@@ -0,0 +1,121 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import hashlib
+import json
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import dependency_injector.providers as providers
+from dial_core.notebook import NodeCellsRegistrySingleton, NotebookProjectGenerator
+
+if TYPE_CHECKING:
+    from dial_core.node_editor import Node
+    from nbformat import NotebookNode
+
+CellsBlock = Tuple[str, List["NotebookNode"]]
+
+
+def cells_digest(cells: Sequence["NotebookNode"], upstream_ids: Sequence[str]) -> str:
+    """Returns a hash identifying a block of cells and the upstream connections of the
+    node that generated them.
+
+    Only the type and source of the cells are hashed (Other fields, like the cell ids,
+    can change between generations without changing the rendered cell).
+    """
+    content = json.dumps(
+        [[(cell["cell_type"], cell["source"]) for cell in cells], list(upstream_ids)]
+    )
+
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class IncrementalNotebookGenerator(NotebookProjectGenerator):
+    """The IncrementalNotebookGenerator class is a NotebookProjectGenerator that, in
+    addition to the notebook, keeps the cells grouped by the node that generated them.
+
+    Each block of cells is identified by a digest of its content and the upstream
+    connections of its node, so blocks that didn't change between generations can be
+    detected (and their rendered HTML reused, see `NotebookHTMLRenderer`).
+
+    The blocks are also cached per node, keyed by the state version of its
+    GraphicsNode (See `GraphicsNode.state_version`), its title and its upstream
+    connections, so only the cells of the nodes that changed are generated again. The
+    cells of a node only reference the ports of its upstream nodes (not their state),
+    so edits on a node don't invalidate the cells of its downstream nodes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._cells_blocks: List[CellsBlock] = []
+        self._cached_blocks: Dict["Node", Tuple[Hashable, CellsBlock]] = {}
+
+        super().__init__(*args, **kwargs)
+
+    def cells_blocks(self) -> List[CellsBlock]:
+        """Returns the (digest, cells) blocks of the notebook, in notebook order."""
+        return self._cells_blocks
+
+    def clear(self):
+        super().clear()
+
+        self._cells_blocks = []
+
+    def _generate_notebook(self):
+        """Updates the notebook object, populating it with the cells generated by the
+        transformers, and groups the cells by node."""
+        external_packages_cells = [self._external_packages_cells()]
+
+        self._cells_blocks = [
+            (cells_digest(external_packages_cells, []), external_packages_cells)
+        ]
+
+        cached_blocks = {}
+
+        for node_transformer in reversed(self._node_transformers.values()):
+            node = node_transformer.node
+            upstream_ids = self.__upstream_ids(node)
+            state_key = self.__state_key(node, upstream_ids)
+
+            cached_block = self._cached_blocks.get(node)
+
+            if state_key is not None and cached_block and cached_block[0] == state_key:
+                cells_block = cached_block[1]
+            else:
+                node_cells = node_transformer.cells()
+                cells_block = (cells_digest(node_cells, upstream_ids), node_cells)
+
+            if state_key is not None:
+                cached_blocks[node] = (state_key, cells_block)
+
+            self._cells_blocks.append(cells_block)
+
+        # Only the nodes still on the project are kept
+        self._cached_blocks = cached_blocks
+
+        self._notebook["cells"] = [
+            cell for (_, cells) in self._cells_blocks for cell in cells
+        ]
+
+        return self._notebook
+
+    @staticmethod
+    def __state_key(node: "Node", upstream_ids: List[str]) -> Optional[Hashable]:
+        """Returns the key identifying the state of a node that its cells depend on, or
+        None if the state can't be tracked (The node doesn't have a GraphicsNode)."""
+        graphics_node = getattr(node, "graphics_node", None)
+
+        if graphics_node is None:
+            return None
+
+        return (graphics_node.state_version, node.title, tuple(upstream_ids))
+
+    def __upstream_ids(self, node: "Node") -> List[str]:
+        """Returns the ids of the output ports connected to the node inputs."""
+        return [
+            input_port.port_connected_to.word_id()
+            for input_port in node.inputs.values()
+            if input_port.port_connected_to
+        ]
+
+
+IncrementalNotebookGeneratorFactory = providers.Factory(
+    IncrementalNotebookGenerator, node_cells_registry=NodeCellsRegistrySingleton,
+)
@@ -0,0 +1,195 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+"""
+Command line tool for exporting the notebooks of Dial projects without a GUI.
+
+    python -m dial_gui export-notebook project.dial -o out.ipynb [--html]
+
+Several projects can be exported at once, in parallel (One process per project).
+Projects whose notebooks would be written to the same file (e.g. projects with the
+same file name, exported to a single output directory) are rejected.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import dial_core
+from dial_core.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+# QApplication of the current process (Created once per worker process)
+_APP = None
+
+
+def get_arg_parser() -> "argparse.ArgumentParser":
+    """Returns the argument parser for the `export-notebook` command."""
+    parser = dial_core.utils.initialization.get_arg_parser()
+    parser.prog = "dial export-notebook"
+    parser.description = "Exports the notebooks of Dial projects."
+
+    parser.add_argument("projects", nargs="+", help="Project (.dial) files to export")
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Output .ipynb file (or output directory, if several projects are "
+        "exported). By default, the notebooks folder of each project.",
+    )
+
+    parser.add_argument(
+        "--html", help="Also export the notebooks as HTML", action="store_true"
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of projects exported in parallel",
+    )
+
+    return parser
+
+
+def main(sys_args: List[str]) -> int:
+    """Exports the notebooks of the projects passed as arguments.
+
+    Returns:
+        The exit code (0 if all the projects were exported).
+    """
+    parser = get_arg_parser()
+    args = parser.parse_args(sys_args)
+
+    exports = [
+        (project_file_path, _notebook_path(project_file_path, args))
+        for project_file_path in args.projects
+    ]
+
+    # Projects with the same name exported to the same directory would overwrite each
+    # other's notebooks
+    exported_projects: Dict[str, List[str]] = {}
+    for (project_file_path, notebook_path) in exports:
+        exported_projects.setdefault(
+            os.path.normcase(os.path.abspath(notebook_path)), []
+        ).append(project_file_path)
+
+    for (notebook_path, project_file_paths) in exported_projects.items():
+        if len(project_file_paths) > 1:
+            parser.error(
+                f"{', '.join(project_file_paths)} would be exported to the same "
+                f"notebook ({notebook_path})"
+            )
+
+    start_time = time.perf_counter()
+
+    if len(exports) == 1:
+        _initialize_worker(args)
+        results = [_export_project(*exports[0], args.html)]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=args.jobs, initializer=_initialize_worker, initargs=(args,)
+        ) as executor:
+            results = list(
+                executor.map(
+                    _export_project, *zip(*exports), [args.html] * len(exports),
+                )
+            )
+
+    failed = 0
+
+    for (project_file_path, output_files, elapsed_ms, error) in results:
+        if error:
+            failed += 1
+            print(f"FAILED {project_file_path}: {error}", file=sys.stderr)
+        else:
+            print(f"{project_file_path} -> {', '.join(output_files)} ({elapsed_ms} ms)")
+
+    print(
+        f"{len(results) - failed}/{len(results)} projects exported in "
+        f"{int((time.perf_counter() - start_time) * 1000)} ms"
+    )
+
+    return 1 if failed else 0
+
+
+def _notebook_path(project_file_path: str, args: "argparse.Namespace") -> str:
+    """Returns the path of the .ipynb file for a project."""
+    from .notebook_export import ExportTarget, notebooks_directory
+
+    project_name = os.path.splitext(os.path.basename(project_file_path))[0]
+    notebook_file_name = f"{project_name}.{ExportTarget.Notebook.value}"
+
+    if not args.output:
+        project_directory = os.path.dirname(os.path.abspath(project_file_path))
+        return os.path.join(notebooks_directory(project_directory), notebook_file_name)
+
+    if len(args.projects) == 1 and not os.path.isdir(args.output):
+        return args.output
+
+    return os.path.join(args.output, notebook_file_name)
+
+
+def _initialize_worker(args: "argparse.Namespace"):
+    """Initializes the application components on the current process, without GUI."""
+    global _APP
+
+    from dial_gui.utils import initialization
+
+    _APP = initialization.initialize_headless(args)
+
+
+def _export_project(
+    project_file_path: str, notebook_path: str, html: bool
+) -> Tuple[str, List[str], int, Optional[str]]:
+    """Loads a project and exports its notebook.
+
+    Returns:
+        A tuple (project file path, written files, elapsed milliseconds, error). The
+        error is None if the project could be exported.
+    """
+    from dial_core.notebook import NotebookProjectGeneratorFactory
+    from dial_gui.project import project_file
+
+    from .notebook_export import ExportTarget, export_notebook
+
+    start_time = time.perf_counter()
+    output_files: List[str] = []
+
+    try:
+        with open(project_file_path, "rb") as file:
+            project = project_file.loads(file.read())
+
+        project.file_path = project_file_path
+
+        # Nodes and its widgets must be loaded for generating their cells
+        project.graphics_scene.finish_loading()
+        project.graphics_scene.materialize_inner_widgets()
+
+        notebook_generator = NotebookProjectGeneratorFactory(project=project)
+
+        targets = [(notebook_path, ExportTarget.Notebook)]
+        if html:
+            notebook_base_path = os.path.splitext(notebook_path)[0]
+            targets.append(
+                (f"{notebook_base_path}.{ExportTarget.HTML.value}", ExportTarget.HTML)
+            )
+
+        notebook_directory = os.path.dirname(os.path.abspath(notebook_path))
+        os.makedirs(notebook_directory, exist_ok=True)
+
+        for (file_path, target) in targets:
+            export_notebook(notebook_generator.notebook, file_path, target)
+            output_files.append(file_path)
+
+    except Exception as err:
+        LOGGER.exception(err)
+        return (project_file_path, output_files, 0, str(err))
+
+    elapsed_ms = int((time.perf_counter() - start_time) * 1000)
+
+    return (project_file_path, output_files, elapsed_ms, None)
@@ -0,0 +1,147 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import os
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, List, Sequence
+
+import nbformat as nbf
+from dial_core.utils import log
+from PySide2.QtCore import QCoreApplication, QThread, Signal
+
+if TYPE_CHECKING:
+    from nbformat import NotebookNode
+    from PySide2.QtCore import QObject
+
+LOGGER = log.get_logger(__name__)
+
+
+class ExportTarget(Enum):
+    """Formats a notebook can be exported to. The value is the file extension."""
+
+    Notebook = "ipynb"
+    HTML = "html"
+    Script = "py"
+
+
+def notebooks_directory(project_directory: str) -> str:
+    """Returns the folder where the notebooks of a project are exported by default."""
+    return os.path.join(project_directory, "notebooks")
+
+
+def export_notebook(notebook: "NotebookNode", file_path: str, target: "ExportTarget"):
+    """Writes the notebook on `file_path`, converted to the `target` format.
+
+    Raises:
+        OSError: If the file can't be written.
+    """
+    if target is ExportTarget.Notebook:
+        with open(file_path, "w") as notebook_file:
+            nbf.write(notebook, notebook_file)
+        return
+
+    # nbconvert is slow to import, so it's only imported when needed
+    from nbconvert import HTMLExporter, PythonExporter
+
+    if target is ExportTarget.HTML:
+        (content, _) = HTMLExporter().from_notebook_node(notebook)
+    else:
+        (content, _) = PythonExporter().from_notebook_node(notebook)
+
+    with open(file_path, "w") as output_file:
+        output_file.write(content)
+
+
+def export_notebook_to(
+    notebook: "NotebookNode",
+    directory: str,
+    name: str,
+    targets: Sequence["ExportTarget"],
+) -> List[str]:
+    """Exports the notebook to all the `targets` formats, as `directory/name.<ext>`
+    files. The directory is created if it doesn't exist.
+
+    Returns:
+        The paths of the written files.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    file_paths = []
+
+    for target in targets:
+        file_path = os.path.join(directory, f"{name}.{target.value}")
+        export_notebook(notebook, file_path, target)
+
+        file_paths.append(file_path)
+
+    return file_paths
+
+
+class NotebookExportJob(QThread):
+    """The NotebookExportJob class exports a notebook to several files on a worker
+    thread.
+
+    The job is stopped (after the file being written) when the application quits or
+    its parent is destroyed.
+
+    Signals:
+        exported: Path of each file written.
+        failed: Error message, if any of the files couldn't be written.
+    """
+
+    exported = Signal(str)
+    failed = Signal(str)
+
+    def __init__(
+        self,
+        notebook: "NotebookNode",
+        exports: Sequence[tuple],
+        parent: "QObject" = None,
+    ):
+        """Creates a new job.
+
+        Args:
+            notebook: Notebook to export. Must not be modified while exporting.
+            exports: List of (file path, ExportTarget) pairs.
+        """
+        super().__init__(parent)
+
+        self.__notebook = notebook
+        self.__exports = list(exports)
+
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop)
+
+        if parent:
+            parent.destroyed.connect(self.stop)
+
+    def stop(self):
+        """Stops the job after the file being written, and waits for it."""
+        if not self.isRunning():
+            return
+
+        self.requestInterruption()
+        self.wait()
+
+    def run(self):
+        for (file_path, target) in self.__exports:
+            if self.isInterruptionRequested():
+                LOGGER.info("Notebook export interrupted before %s", file_path)
+                return
+
+            start_time = time.perf_counter()
+
+            try:
+                export_notebook(self.__notebook, file_path, target)
+            except Exception as err:
+                LOGGER.exception(err)
+                self.failed.emit(f"{file_path}: {err}")
+                continue
+
+            LOGGER.info(
+                "Notebook exported to %s in %s ms",
+                file_path,
+                int((time.perf_counter() - start_time) * 1000),
+            )
+            self.exported.emit(file_path)
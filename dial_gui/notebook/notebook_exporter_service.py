@@ -0,0 +1,90 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+import nbformat as nbf
+from dial_core.utils import log
+
+if TYPE_CHECKING:
+    from nbconvert import HTMLExporter
+    from nbformat import NotebookNode
+
+LOGGER = log.get_logger(__name__)
+
+
+class NotebookExporterService:
+    """The NotebookExporterService class keeps a warm nbconvert exporter for converting
+    cells to HTML fragments.
+
+    Creating an HTMLExporter loads its Jinja templates, and every export inlines the
+    whole Jupyter CSS in the resulting resources. The service creates the exporter
+    (and extracts the CSS) only once, and reuses them on every export.
+
+    Important:
+        The service isn't thread-safe. Use it from a single thread (The exporter is
+        initialized, and nbconvert imported, on the thread of the first export).
+
+    Attributes:
+        last_export_ms: Duration, in milliseconds, of the last export.
+        total_export_ms: Accumulated duration of all the exports.
+        exports_count: Number of exports done by the service.
+    """
+
+    def __init__(self):
+        self.__html_exporter: Optional["HTMLExporter"] = None
+        self.__css = ""
+
+        self.last_export_ms = 0.0
+        self.total_export_ms = 0.0
+        self.exports_count = 0
+
+    @property
+    def css(self) -> str:
+        """Returns the CSS needed for displaying the exported fragments."""
+        self.__initialize()
+
+        return self.__css
+
+    def export_cells(self, cells: List["NotebookNode"]) -> str:
+        """Converts a list of cells to an HTML fragment (Without the page header)."""
+        self.__initialize()
+
+        start_time = time.perf_counter()
+
+        (body, _) = self.__html_exporter.from_notebook_node(
+            nbf.v4.new_notebook(cells=cells)
+        )
+
+        self.last_export_ms = (time.perf_counter() - start_time) * 1000
+        self.total_export_ms += self.last_export_ms
+        self.exports_count += 1
+
+        return body
+
+    def __initialize(self):
+        """Creates the exporter and the CSS, if they weren't created before."""
+        if self.__html_exporter:
+            return
+
+        start_time = time.perf_counter()
+
+        from nbconvert import HTMLExporter
+        from traitlets.config import Config
+
+        # The CSS is extracted once, with the default configuration of the exporter
+        (_, resources) = HTMLExporter(template_file="basic").from_notebook_node(
+            nbf.v4.new_notebook()
+        )
+        self.__css = resources["inlining"]["css"][0]
+
+        # Later exports don't need to inline the CSS again
+        self.__html_exporter = HTMLExporter(
+            template_file="basic",
+            config=Config({"CSSHTMLHeaderPreprocessor": {"enabled": False}}),
+        )
+
+        LOGGER.debug(
+            "Notebook exporter initialized in %s ms",
+            int((time.perf_counter() - start_time) * 1000),
+        )
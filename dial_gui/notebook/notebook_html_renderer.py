@@ -0,0 +1,89 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from dial_core.utils import log
+
+from .notebook_exporter_service import NotebookExporterService
+
+if TYPE_CHECKING:
+    from .incremental_notebook_generator import CellsBlock
+
+LOGGER = log.get_logger(__name__)
+
+HTMLFragment = Tuple[str, str]
+
+
+class NotebookHTMLRenderer:
+    """The NotebookHTMLRenderer class converts notebooks (as a list of cells blocks) to
+    HTML, caching the HTML fragment rendered for each block.
+
+    Fragments are cached by the digest of their block, so only blocks whose content
+    changed since the last render are converted again.
+
+    Important:
+        The renderer isn't thread-safe. Use it from a single thread.
+    """
+
+    def __init__(self, exporter_service: "NotebookExporterService" = None):
+        self.__exporter_service = (
+            exporter_service if exporter_service else NotebookExporterService()
+        )
+        self.__fragments: Dict[str, str] = {}
+
+    @property
+    def exporter_service(self) -> "NotebookExporterService":
+        """Returns the service used for converting the cells to HTML."""
+        return self.__exporter_service
+
+    @property
+    def css(self) -> str:
+        """Returns the CSS needed for displaying the rendered fragments."""
+        return self.__exporter_service.css
+
+    def render_fragments(self, cells_blocks: List["CellsBlock"]) -> List[HTMLFragment]:
+        """Returns the (digest, HTML fragment) pairs of the passed blocks of cells, in
+        the same order."""
+        fragments = {}
+        rendered_blocks = 0
+        export_ms = 0.0
+
+        for (digest, cells) in cells_blocks:
+            if digest not in fragments:
+                fragment = self.__fragments.get(digest)
+
+                if fragment is None:
+                    fragment = self.__exporter_service.export_cells(cells)
+                    rendered_blocks += 1
+                    export_ms += self.__exporter_service.last_export_ms
+
+                fragments[digest] = fragment
+
+        # Only keep the fragments of the current notebook
+        self.__fragments = fragments
+
+        LOGGER.debug(
+            "%s of %s notebook blocks rendered in %s ms",
+            rendered_blocks,
+            len(cells_blocks),
+            int(export_ms),
+        )
+
+        return [(digest, fragments[digest]) for (digest, _) in cells_blocks]
+
+    def render(self, cells_blocks: List["CellsBlock"]) -> str:
+        """Returns the HTML document for the passed blocks of cells."""
+        body = "".join(
+            fragment for (_, fragment) in self.render_fragments(cells_blocks)
+        )
+
+        return (
+            f'<html><style type="text/css">{self.css}</style><body>'
+            f'<div tabindex="-1" id="notebook" class="border-box-sizing">'
+            f'<div class="container" id="notebook-container">{body}</div></div>'
+            f"</body></html>"
+        )
+
+    def clear(self):
+        """Removes all the cached fragments."""
+        self.__fragments.clear()
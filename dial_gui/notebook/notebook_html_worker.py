@@ -0,0 +1,130 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from dial_core.utils import log
+from PySide2.QtCore import QCoreApplication, QThread, Signal
+
+from .notebook_html_renderer import NotebookHTMLRenderer
+
+if TYPE_CHECKING:
+    from PySide2.QtCore import QObject
+
+    from .incremental_notebook_generator import CellsBlock
+    from .notebook_html_renderer import HTMLFragment
+
+LOGGER = log.get_logger(__name__)
+
+
+class NotebookHTMLWorker(QThread):
+    """The NotebookHTMLWorker class converts notebooks to HTML on a worker thread, so
+    the GUI isn't blocked while nbconvert renders the notebook.
+
+    Notebooks are passed as blocks of cells (See `IncrementalNotebookGenerator`). The
+    HTML of each block is cached, so only the blocks that changed are rendered again.
+    The result is delivered as a list of (digest, HTML fragment) pairs, so views can
+    update only the fragments that changed.
+
+    Each call to `request` returns an id identifying the request. Requests are
+    coalesced: If several requests arrive while the worker is busy, only the latest one
+    is processed, and results of requests that became stale while being processed are
+    discarded.
+
+    Signals:
+        fragments_ready: Id of the request, CSS of the fragments and the list of
+            (digest, HTML fragment) pairs.
+        failed: Id of the request and the error message.
+    """
+
+    fragments_ready = Signal(int, str, object)
+    failed = Signal(int, str)
+
+    def __init__(self, parent: "QObject" = None):
+        super().__init__(parent)
+
+        self.__condition = threading.Condition()
+        self.__pending_request: Optional[Tuple[int, List["CellsBlock"]]] = None
+        self.__renderer = NotebookHTMLRenderer()
+        self.__last_request_id = 0
+        self.__stopped = False
+
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop)
+
+    @property
+    def last_request_id(self) -> int:
+        """Returns the id of the most recent request."""
+        return self.__last_request_id
+
+    def request(self, cells_blocks: List["CellsBlock"]) -> int:
+        """Queues a new notebook for being converted to HTML. Any pending request is
+        cancelled.
+
+        Important:
+            The cells are accessed from the worker thread, so they must not be modified
+            afterwards.
+
+        Returns:
+            The id of the request.
+        """
+        with self.__condition:
+            self.__last_request_id += 1
+            self.__pending_request = (self.__last_request_id, cells_blocks)
+            self.__condition.notify()
+
+        if not self.isRunning():
+            self.start()
+
+        return self.__last_request_id
+
+    def stop(self):
+        """Stops the worker, waiting for the current request to finish."""
+        with self.__condition:
+            self.__stopped = True
+            self.__pending_request = None
+            self.__condition.notify()
+
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.__condition:
+                while self.__pending_request is None and not self.__stopped:
+                    self.__condition.wait()
+
+                if self.__stopped:
+                    return
+
+                request_id, cells_blocks = self.__pending_request
+                self.__pending_request = None
+
+            self.__process_request(request_id, cells_blocks)
+
+    def __process_request(self, request_id: int, cells_blocks: List["CellsBlock"]):
+        start_time = time.perf_counter()
+
+        try:
+            fragments = self.__export(cells_blocks)
+        except Exception as err:
+            LOGGER.exception(err)
+            self.failed.emit(request_id, str(err))
+            return
+
+        if request_id != self.__last_request_id:
+            LOGGER.debug("Discarding stale notebook request %s", request_id)
+            return
+
+        LOGGER.debug(
+            "Notebook request %s converted to HTML in %s ms",
+            request_id,
+            int((time.perf_counter() - start_time) * 1000),
+        )
+
+        self.fragments_ready.emit(request_id, self.__renderer.css, fragments)
+
+    def __export(self, cells_blocks: List["CellsBlock"]) -> List["HTMLFragment"]:
+        """Converts the notebook to HTML fragments."""
+        return self.__renderer.render_fragments(cells_blocks)
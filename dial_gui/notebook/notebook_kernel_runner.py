@@ -0,0 +1,253 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import base64
+import html
+import queue
+import re
+import time
+from typing import TYPE_CHECKING, Optional
+
+import nbformat as nbf
+from dial_core.utils import log
+from PySide2.QtCore import QCoreApplication, QThread, Signal
+
+if TYPE_CHECKING:
+    from jupyter_client import KernelManager
+    from nbformat import NotebookNode
+    from PySide2.QtCore import QObject
+
+LOGGER = log.get_logger(__name__)
+
+_ANSI_ESCAPE_REGEX = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+_PIP_INSTALL_REGEX = re.compile(r"^[%!]pip\s+install\b")
+
+
+def _is_packages_cell(source: str) -> bool:
+    """Checks if a code cell only installs packages (Like the "External packages" cell
+    added by the notebook generators), ignoring comments and blank lines."""
+    lines = [
+        line.strip()
+        for line in source.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+    return bool(lines) and all(_PIP_INSTALL_REGEX.match(line) for line in lines)
+
+
+def output_to_html(output: "NotebookNode") -> str:
+    """Converts a cell output (as returned by `nbformat.v4.output_from_msg`) to an
+    HTML fragment."""
+    if output["output_type"] == "stream":
+        text = html.escape(output["text"])
+        return f'<pre class="dial-output-{output["name"]}">{text}</pre>'
+
+    if output["output_type"] == "error":
+        traceback = _ANSI_ESCAPE_REGEX.sub("", "\n".join(output["traceback"]))
+        return f'<pre class="dial-output-error">{html.escape(traceback)}</pre>'
+
+    data = output.get("data", {})
+
+    if "text/html" in data:
+        return data["text/html"]
+
+    if "image/png" in data:
+        image = data["image/png"]
+        if isinstance(image, bytes):
+            image = base64.b64encode(image).decode("ascii")
+
+        return f'<img src="data:image/png;base64,{image}"/>'
+
+    return f'<pre>{html.escape(data.get("text/plain", ""))}</pre>'
+
+
+class NotebookKernelRunner(QThread):
+    """The NotebookKernelRunner class executes the code cells of a notebook on a local
+    Jupyter kernel.
+
+    As with nbclient, the execution stops at the first cell that raises an error. The
+    cells that only install packages (`%pip install ...`) are skipped, unless
+    `install_packages` is True, as they would modify the environment of the kernel.
+
+    The kernel runs on its own process, and this thread only waits for its messages,
+    so long running cells never block the GUI. Outputs are emitted as soon as they're
+    received.
+
+    The runner is stopped (and its kernel shut down) when the application quits or its
+    parent is destroyed (See `stop`).
+
+    Signals:
+        cell_started: Index (among the code cells) of the cell being executed.
+        cell_output: Index of the cell and its new output (nbformat output node).
+        cell_finished: Index of the cell and its execution time, in milliseconds.
+        failed: Error message, if the kernel couldn't be started.
+    """
+
+    cell_started = Signal(int)
+    cell_output = Signal(int, object)
+    cell_finished = Signal(int, float)
+    failed = Signal(str)
+
+    kernel_ready_timeout = 60
+
+    # Seconds that an interrupted cell can keep running before the kernel is killed
+    interrupt_timeout = 5
+
+    def __init__(
+        self,
+        notebook: "NotebookNode",
+        kernel_name: str = "python3",
+        install_packages: bool = False,
+        parent: "QObject" = None,
+    ):
+        """Creates a new runner.
+
+        Args:
+            notebook: Notebook to execute. Must not be modified while executing.
+            kernel_name: Name of the Jupyter kernel used.
+            install_packages: If the cells that install packages are executed too.
+        """
+        super().__init__(parent)
+
+        self.__notebook = notebook
+        self.__kernel_name = kernel_name
+        self.__install_packages = install_packages
+        self.__kernel_manager: Optional["KernelManager"] = None
+
+        app = QCoreApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.stop)
+
+        if parent:
+            parent.destroyed.connect(self.stop)
+
+    def interrupt(self):
+        """Interrupts the cell being executed, and stops the execution of the rest."""
+        self.requestInterruption()
+
+        if self.__kernel_manager and self.__kernel_manager.has_kernel:
+            LOGGER.info("Interrupting notebook kernel...")
+            self.__kernel_manager.interrupt_kernel()
+
+    def stop(self):
+        """Interrupts the execution and waits until the kernel has been shut down."""
+        if not self.isRunning():
+            return
+
+        self.interrupt()
+        self.wait()
+
+    def run(self):
+        from jupyter_client import KernelManager
+
+        self.__kernel_manager = KernelManager(kernel_name=self.__kernel_name)
+
+        try:
+            self.__kernel_manager.start_kernel()
+        except Exception as err:
+            LOGGER.exception(err)
+            self.failed.emit(str(err))
+            return
+
+        kernel_client = self.__kernel_manager.client()
+        kernel_client.start_channels()
+
+        try:
+            if not self.__wait_for_ready(kernel_client):
+                return
+
+            code_cells = [
+                cell for cell in self.__notebook["cells"] if cell["cell_type"] == "code"
+            ]
+
+            for (index, cell) in enumerate(code_cells):
+                if self.isInterruptionRequested():
+                    break
+
+                if not self.__install_packages and _is_packages_cell(cell["source"]):
+                    continue
+
+                if not self.__execute_cell(kernel_client, index, cell["source"]):
+                    LOGGER.info("Notebook execution stopped: Cell %s failed.", index)
+                    break
+
+        except RuntimeError as err:
+            LOGGER.exception(err)
+            self.failed.emit(str(err))
+
+        finally:
+            kernel_client.stop_channels()
+            self.__kernel_manager.shutdown_kernel(now=True)
+
+    def __wait_for_ready(self, kernel_client) -> bool:
+        """Waits until the kernel is ready (At most `kernel_ready_timeout` seconds).
+
+        Returns:
+            False if the runner has been interrupted meanwhile.
+
+        Raises:
+            RuntimeError: If the kernel died or didn't get ready in time.
+        """
+        deadline = time.perf_counter() + self.kernel_ready_timeout
+
+        while True:
+            try:
+                kernel_client.wait_for_ready(timeout=1)
+                return True
+
+            except RuntimeError:
+                if self.isInterruptionRequested():
+                    return False
+
+                if (
+                    not self.__kernel_manager.is_alive()
+                    or time.perf_counter() >= deadline
+                ):
+                    raise
+
+    def __execute_cell(self, kernel_client, index: int, source: str) -> bool:
+        """Executes a cell, emitting its outputs until the kernel is idle again.
+
+        Returns:
+            False if the cell raised an error (or was interrupted).
+        """
+        self.cell_started.emit(index)
+        start_time = time.perf_counter()
+
+        msg_id = kernel_client.execute(source, store_history=True)
+        interrupt_time: Optional[float] = None
+        succeeded = True
+
+        while True:
+            try:
+                msg = kernel_client.get_iopub_msg(timeout=0.1)
+            except queue.Empty:
+                if not self.__kernel_manager.is_alive():
+                    raise RuntimeError("The notebook kernel died unexpectedly.")
+
+                # Give up on cells that ignore the interruption (The kernel is killed)
+                if self.isInterruptionRequested():
+                    interrupt_time = interrupt_time or time.perf_counter()
+
+                    if time.perf_counter() - interrupt_time > self.interrupt_timeout:
+                        return False
+
+                continue
+
+            if msg["parent_header"].get("msg_id") != msg_id:
+                continue
+
+            msg_type = msg["msg_type"]
+
+            if msg_type == "status" and msg["content"]["execution_state"] == "idle":
+                break
+
+            if msg_type in ("stream", "execute_result", "display_data", "error"):
+                self.cell_output.emit(index, nbf.v4.output_from_msg(msg))
+
+            if msg_type == "error":
+                succeeded = False
+
+        self.cell_finished.emit(index, (time.perf_counter() - start_time) * 1000)
+
+        return succeeded
@@ -0,0 +1,237 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+"""Functions for reading and writing the content of `.dial` project files.
+
+A project file can be stored either as a plain pickle (legacy format), or as a
+compressed container. The compressed container splits the payload in chunks that are
+compressed (and decompressed) independently, in parallel:
+
+    MAGIC | level (1 byte) | chunk count (4 bytes) | chunk sizes (8 bytes each) | chunks
+
+The inner widgets of the nodes are stored as opaque blobs inside the payload. When the
+project is loaded, they're replaced by DeferredInnerWidget placeholders, and only
+deserialized when shown for the first time.
+"""
+
+import hashlib
+import io
+import os
+import pickle
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Set, Tuple
+
+from dial_core.node_editor import Node
+from dial_gui.node_editor import DeferredInnerWidget
+from PySide2.QtWidgets import QWidget
+
+if TYPE_CHECKING:
+    from .project_gui import ProjectGUI
+
+MAGIC = b"DIALZ\x00\x01\x00"
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+_HEADER_FORMAT = "<BI"
+_CHUNK_SIZE_FORMAT = "<Q"
+
+_WIDGET_PERSISTENT_ID = "widget"
+
+
+class _ProjectPickler(pickle.Pickler):
+    """Pickler that stores the inner widgets of the nodes as independent serialized
+    blobs.
+
+    Each widget is serialized only once: All the references to the same widget get
+    the same persistent id, so they're restored as a single shared placeholder.
+    """
+
+    def __init__(self, file: BinaryIO):
+        super().__init__(file)
+
+        self.__inner_widget_ids: Set[int] = set()
+        self.__persistent_ids: Dict[int, Tuple[str, int, bytes]] = {}
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[str, int, bytes]]:
+        # The inner widget is pickled right after its node (It's a constructor arg)
+        if isinstance(obj, Node):
+            if isinstance(obj.inner_widget, QWidget):
+                self.__inner_widget_ids.add(id(obj.inner_widget))
+
+            return None
+
+        if id(obj) in self.__persistent_ids:
+            return self.__persistent_ids[id(obj)]
+
+        if isinstance(obj, DeferredInnerWidget):
+            if not obj.is_materialized:
+                return self.__add_persistent_id(obj, obj.serialized_widget)
+
+            # A materialized placeholder and its widget are the same widget
+            widget = obj.materialize()
+            persistent_id = self.persistent_id(widget) or self.__add_persistent_id(
+                widget, pickle.dumps(widget)
+            )
+            self.__persistent_ids[id(obj)] = persistent_id
+
+            return persistent_id
+
+        if id(obj) in self.__inner_widget_ids:
+            return self.__add_persistent_id(obj, pickle.dumps(obj))
+
+        return None
+
+    def __add_persistent_id(
+        self, obj: Any, serialized_widget: bytes
+    ) -> Tuple[str, int, bytes]:
+        persistent_id = (
+            _WIDGET_PERSISTENT_ID,
+            len(self.__persistent_ids),
+            serialized_widget,
+        )
+        self.__persistent_ids[id(obj)] = persistent_id
+
+        return persistent_id
+
+
+class _ProjectUnpickler(pickle.Unpickler):
+    """Unpickler that restores widgets as DeferredInnerWidget placeholders (One for
+    each serialized widget, shared by all its references)."""
+
+    def __init__(self, file: BinaryIO):
+        super().__init__(file)
+
+        self.__placeholders: Dict[int, "DeferredInnerWidget"] = {}
+
+    def persistent_load(self, persistent_id: Tuple[str, int, bytes]) -> Any:
+        type_tag, key, serialized_widget = persistent_id
+
+        if type_tag != _WIDGET_PERSISTENT_ID:
+            raise pickle.UnpicklingError(f"Unknown persistent id: {type_tag}")
+
+        if key not in self.__placeholders:
+            self.__placeholders[key] = DeferredInnerWidget(serialized_widget)
+
+        return self.__placeholders[key]
+
+
+def dumps(project: "ProjectGUI") -> bytes:
+    """Serializes a project into its (uncompressed) payload."""
+    stream = io.BytesIO()
+    _ProjectPickler(stream).dump(project)
+
+    return stream.getvalue()
+
+
+def loads(content: bytes) -> "ProjectGUI":
+    """Rebuilds a project from its payload, or from the content of a project file
+    (compressed or not)."""
+    if is_compressed(content):
+        content = decompress(content)
+
+    return _ProjectUnpickler(io.BytesIO(content)).load()
+
+
+def is_compressed(content: bytes) -> bool:
+    """Checks if the content is a compressed container."""
+    return content[: len(MAGIC)] == MAGIC
+
+
+def compress(
+    payload: bytes,
+    level: int = 6,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> bytes:
+    """Compresses the payload into a compressed container.
+
+    Args:
+        payload: Data to compress.
+        level: zlib compression level (0-9).
+        chunk_size: Size of each independently compressed chunk.
+        max_workers: Max number of threads used for compressing the chunks.
+    """
+    chunks = [
+        payload[start : start + chunk_size]
+        for start in range(0, len(payload), chunk_size)
+    ]
+
+    compressed_chunks = _map_chunks(
+        lambda chunk: zlib.compress(chunk, level), chunks, max_workers
+    )
+
+    header = MAGIC + struct.pack(_HEADER_FORMAT, level, len(compressed_chunks))
+    chunk_sizes = b"".join(
+        struct.pack(_CHUNK_SIZE_FORMAT, len(chunk)) for chunk in compressed_chunks
+    )
+
+    return b"".join([header, chunk_sizes] + compressed_chunks)
+
+
+def decompress(content: bytes, max_workers: Optional[int] = None) -> bytes:
+    """Decompresses the payload stored on a compressed container.
+
+    Raises:
+        ValueError: If the content isn't a valid compressed container.
+    """
+    if not is_compressed(content):
+        raise ValueError("The content isn't a compressed project file.")
+
+    offset = len(MAGIC)
+
+    try:
+        _, chunks_count = struct.unpack_from(_HEADER_FORMAT, content, offset)
+        offset += struct.calcsize(_HEADER_FORMAT)
+
+        chunk_sizes = [
+            struct.unpack_from(
+                _CHUNK_SIZE_FORMAT,
+                content,
+                offset + i * struct.calcsize(_CHUNK_SIZE_FORMAT),
+            )[0]
+            for i in range(chunks_count)
+        ]
+        offset += chunks_count * struct.calcsize(_CHUNK_SIZE_FORMAT)
+
+    except struct.error as err:
+        raise ValueError(f"Corrupted project file header: {err}")
+
+    chunks = []
+    for chunk_size in chunk_sizes:
+        chunks.append(content[offset : offset + chunk_size])
+        offset += chunk_size
+
+    try:
+        return b"".join(_map_chunks(zlib.decompress, chunks, max_workers))
+    except zlib.error as err:
+        raise ValueError(f"Corrupted project file: {err}")
+
+
+def content_hash(content: bytes) -> str:
+    """Returns a hash identifying the passed content."""
+    return hashlib.sha1(content).hexdigest()
+
+
+def write(file_path: str, content: bytes):
+    """Writes the content on `file_path`.
+
+    The content is written to a temporary file first, which then replaces the old file.
+    This way, the project file is never left half-written.
+    """
+    temp_file_path = file_path + ".tmp"
+
+    with open(temp_file_path, "wb") as project_file:
+        project_file.write(content)
+
+    os.replace(temp_file_path, file_path)
+
+
+def _map_chunks(function, chunks: List[bytes], max_workers: Optional[int]):
+    """Applies `function` to all the chunks, using a thread pool if there are several
+    chunks. (zlib releases the GIL, so chunks are processed in parallel)"""
+    if len(chunks) <= 1:
+        return [function(chunk) for chunk in chunks]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(function, chunks))
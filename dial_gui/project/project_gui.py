@@ -1,18 +1,34 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
-from typing import TYPE_CHECKING
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import dependency_injector.providers as providers
 from dial_core.project import Project
-from dial_gui.node_editor import GraphicsSceneFactory
+from dial_core.utils import log
+from dial_gui.node_editor import GraphicsSceneFactory, LayoutStore
 from dial_gui.node_editor.nodes_windows import NodesWindowsGroupFactory
 
+from . import project_file
+
 if TYPE_CHECKING:
+    import numpy as np
     from dial_gui.node_editor import GraphicsScene
     from dial_gui.node_editor.nodes_windows import NodesWindowsGroup
 
+LOGGER = log.get_logger(__name__)
+
 
 class ProjectGUI(Project):
+    """
+    Attributes:
+        is_stub: If True, the project is a placeholder (with an empty scene) of a
+            project file that hasn't been loaded yet (See
+            `ProjectManagerGUI.restore_session`).
+        view_state: Zoom and center of the editor view when the project was last
+            displayed (See `NodeEditorView.view_state`).
+    """
+
     def __init__(
         self,
         name: str,
@@ -26,6 +42,12 @@ class ProjectGUI(Project):
 
         self._nodes_windows_manager = nodes_windows_manager
 
+        # Hashes of the last content written to disk, by (file path, section)
+        self.__saved_content_hashes: Dict[Tuple[str, str], str] = {}
+
+        self.is_stub = False
+        self.view_state: Optional[dict] = None
+
     @property
     def graphics_scene(self):
         return self._graphics_scene
@@ -34,6 +56,173 @@ class ProjectGUI(Project):
     def nodes_windows_manager(self):
         return self._nodes_windows_manager
 
+    def update_content_hash(self, section: str, content: bytes):
+        """Stores the hash of the content of a section of the project (The project
+        file, the layout file...) that has been written on (or read from) the current
+        file path.
+
+        Must be called only after the content has been successfully written, so a
+        failed write is retried on the next save.
+        """
+        key = (self.file_path, section)
+
+        self.__saved_content_hashes[key] = project_file.content_hash(content)
+
+    def is_content_saved(self, section: str, content: bytes) -> bool:
+        """Checks if `content` is the content last written (or read) for a section of
+        the project on the current file path."""
+        key = (self.file_path, section)
+
+        return self.__saved_content_hashes.get(key) == project_file.content_hash(
+            content
+        )
+
+    def copy_content_hashes(self, project: "ProjectGUI"):
+        """Takes the hashes of the saved content from another project object of the
+        same project (See `update_content_hash`)."""
+        self.__saved_content_hashes = dict(project.__saved_content_hashes)
+
+    def nodes_windows_masks(self) -> List[int]:
+        """Returns, for each node of the scene, the bitmask of the NodesWindows it
+        belongs to (Only the first 64 windows are considered)."""
+        nodes_windows = self._nodes_windows_manager.nodes_windows
+        windows_masks = []
+
+        for graphics_node in self._graphics_scene.graphics_nodes:
+            windows_mask = 0
+
+            for nodes_window in graphics_node.parent_node_windows:
+                try:
+                    index = nodes_windows.index(nodes_window)
+                except ValueError:
+                    continue
+
+                if index < 64:
+                    windows_mask |= 1 << index
+
+            windows_masks.append(windows_mask)
+
+        return windows_masks
+
+    def restore_nodes_windows(self, windows_masks: List[int]):
+        """Adds each node of the scene to the NodesWindows of its bitmask (See
+        `nodes_windows_masks`), creating the windows that don't exist yet."""
+        nodes_windows = self._nodes_windows_manager.nodes_windows
+
+        for (graphics_node, windows_mask) in zip(
+            self._graphics_scene.graphics_nodes, windows_masks
+        ):
+            index = 0
+            while windows_mask:
+                if windows_mask & 1:
+                    while len(nodes_windows) <= index:
+                        self._nodes_windows_manager.new_nodes_window()
+
+                    nodes_windows[index].add_graphics_node(graphics_node)
+
+                windows_mask >>= 1
+                index += 1
+
+    def layout_rows(self) -> Optional["np.ndarray"]:
+        """Returns a copy of the rows of the LayoutStore of the graphics scene (One for
+        each node, in order), with the bitmask of the NodesWindows each node belongs to
+        updated. None if the scene doesn't use a LayoutStore."""
+        layout_store = self._graphics_scene.layout_store
+
+        if not layout_store:
+            return None
+
+        graphics_nodes = self._graphics_scene.graphics_nodes
+
+        for (graphics_node, windows_mask) in zip(
+            graphics_nodes, self.nodes_windows_masks()
+        ):
+            layout_store.set_windows_mask(graphics_node.layout_slot, windows_mask)
+
+        return layout_store.rows_of(
+            [graphics_node.layout_slot for graphics_node in graphics_nodes]
+        )
+
+    def save_layout(self) -> int:
+        """Saves the LayoutStore of the graphics scene on a sidecar file next to the
+        project file. The file isn't written if the layout hasn't changed since the last
+        save.
+
+        The nodes using a LayoutStore don't pickle their geometry, so this file is the
+        only place where it's saved (See `restore_layout`).
+
+        The bitmask of the NodesWindows each node belongs to is also saved.
+
+        If the scene doesn't use a LayoutStore, any old sidecar file is removed (It
+        would be outdated).
+
+        Returns:
+            The number of bytes written.
+        """
+        if not self.file_path:
+            return 0
+
+        return self.save_layout_rows(self.layout_rows())
+
+    def save_layout_rows(self, rows: Optional["np.ndarray"]) -> int:
+        """Saves the rows of a layout (See `layout_rows`) on the sidecar file of the
+        project, if they have changed since the last save. If `rows` is None, any old
+        sidecar file is removed.
+
+        Returns:
+            The number of bytes written.
+        """
+        if rows is None:
+            layout_file_path = LayoutStore.layout_file_path(self.file_path)
+            if os.path.isfile(layout_file_path):
+                os.remove(layout_file_path)
+
+            self.__saved_content_hashes.pop((self.file_path, "layout"), None)
+
+            return 0
+
+        rows_content = rows.tobytes()
+
+        if self.is_content_saved("layout", rows_content):
+            return 0
+
+        LayoutStore(rows).save(self.file_path, range(len(rows)))
+        self.update_content_hash("layout", rows_content)
+
+        return rows.nbytes
+
+    def restore_layout(self) -> bool:
+        """Maps the sidecar layout file of the project (if any), and uses it as the
+        LayoutStore of the graphics scene. The NodesWindows stored on the layout are
+        recreated too.
+
+        Returns:
+            If the layout has been restored or not.
+        """
+        if not self.file_path:
+            return False
+
+        layout_store = LayoutStore.open(self.file_path)
+        graphics_nodes = self._graphics_scene.graphics_nodes
+
+        if not layout_store or len(layout_store) != len(graphics_nodes):
+            return False
+
+        self._graphics_scene.attach_layout_store(layout_store, restore=True)
+
+        self.restore_nodes_windows(
+            [
+                layout_store.windows_mask(graphics_node.layout_slot)
+                for graphics_node in graphics_nodes
+            ]
+        )
+
+        LOGGER.info(
+            "Layout restored from %s", LayoutStore.layout_file_path(self.file_path)
+        )
+
+        return True
+
     def __reduce__(self):
         return (
             ProjectGUI,
@@ -0,0 +1,189 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import os
+import pickle
+import time
+from typing import TYPE_CHECKING, Optional
+
+from dial_core.utils import log
+from PySide2.QtCore import QObject, QThread, QTimer, Signal
+
+from . import project_file
+
+if TYPE_CHECKING:
+    from .project_gui import ProjectGUI
+
+LOGGER = log.get_logger(__name__)
+
+
+class ProjectFileReader(QThread):
+    """The ProjectFileReader class reads the content of a project file on a worker
+    thread, reporting its progress while the file is being read. Compressed project
+    files are also decompressed on the worker thread.
+
+    The reading can be cancelled at any moment with `requestInterruption`.
+    """
+
+    progress = Signal(int, int)
+    file_read = Signal(object)
+    failed = Signal(str)
+
+    chunk_size = 1024 * 1024
+
+    def __init__(self, file_path: str, parent: "QObject" = None):
+        super().__init__(parent)
+
+        self.__file_path = file_path
+
+    @property
+    def file_path(self) -> str:
+        """Returns the path of the file being read."""
+        return self.__file_path
+
+    def run(self):
+        """Reads the file by chunks. Emits `file_read` with the project payload when the
+        reading finishes, or `failed` if the file can't be read."""
+        try:
+            total_size = os.path.getsize(self.__file_path)
+            chunks = []
+            read_size = 0
+
+            with open(self.__file_path, "rb") as file:
+                while not self.isInterruptionRequested():
+                    chunk = file.read(self.chunk_size)
+                    if not chunk:
+                        break
+
+                    chunks.append(chunk)
+                    read_size += len(chunk)
+
+                    self.progress.emit(read_size, total_size)
+
+            if self.isInterruptionRequested():
+                return
+
+            content = b"".join(chunks)
+
+            if project_file.is_compressed(content):
+                content = project_file.decompress(content)
+
+            self.file_read.emit(content)
+
+        except (OSError, ValueError) as err:
+            self.failed.emit(str(err))
+
+
+class ProjectLoader(QObject):
+    """The ProjectLoader class opens a project file without blocking the GUI.
+
+    The file is read on a worker thread. Once read, the project objects are rebuilt on
+    the GUI thread (They're Qt objects), and the GraphicsScene of the project adds its
+    nodes in batches, so the canvas is filled progressively.
+
+    Signals:
+        project_loaded: The project has been deserialized, but its nodes may still be
+            being added to the scene.
+        progress: Value, maximum and description of the current loading phase.
+        finished: The project, and all its nodes, have been completely loaded.
+        canceled: The loading has been cancelled. If the project was already
+            deserialized, it's passed as argument (None otherwise).
+        failed: The project couldn't be loaded.
+
+    If the content of the file has already been read (For example, prefetched by a
+    ProjectFileReader), it can be passed as `content`, and the file isn't read again.
+    """
+
+    project_loaded = Signal(object)
+    progress = Signal(int, int, str)
+    finished = Signal(object)
+    canceled = Signal(object)
+    failed = Signal(str)
+
+    def __init__(
+        self, file_path: str, content: Optional[bytes] = None, parent: "QObject" = None
+    ):
+        super().__init__(parent)
+
+        self.__file_path = file_path
+        self.__content = content
+        self.__project: Optional["ProjectGUI"] = None
+        self.__canceled = False
+
+        self.__file_reader = ProjectFileReader(file_path, parent=self)
+        self.__file_reader.progress.connect(
+            lambda read, total: self.progress.emit(read, total, "Reading file...")
+        )
+        self.__file_reader.file_read.connect(self.__deserialize_project)
+        self.__file_reader.failed.connect(self.failed)
+
+        self.__start_time = 0.0
+
+    @property
+    def file_path(self) -> str:
+        """Returns the path of the project file being loaded."""
+        return self.__file_path
+
+    def start(self):
+        """Starts loading the project."""
+        LOGGER.info("Opening a new project... %s", self.__file_path)
+
+        self.__start_time = time.perf_counter()
+
+        if self.__content is not None:
+            content = self.__content
+            self.__content = None
+
+            QTimer.singleShot(
+                0, lambda: self.__canceled or self.__deserialize_project(content)
+            )
+            return
+
+        self.__file_reader.start()
+
+    def cancel(self):
+        """Cancels the loading. Nodes not added to the scene yet are discarded."""
+        self.__canceled = True
+        self.__file_reader.requestInterruption()
+
+        if self.__project:
+            self.__project.graphics_scene.cancel_loading()
+
+        LOGGER.info("Project loading cancelled: %s", self.__file_path)
+        self.canceled.emit(self.__project)
+
+    def dispose(self):
+        """Deletes the loader. If its file reader thread is still running (The loading
+        has been cancelled while reading), it's deleted once the thread finishes."""
+        self.__file_reader.finished.connect(self.deleteLater)
+
+        if not self.__file_reader.isRunning():
+            self.deleteLater()
+
+    def __deserialize_project(self, project_content: bytes):
+        """Rebuilds the project from the file content."""
+        if self.__canceled:
+            return
+
+        try:
+            self.__project = project_file.loads(project_content)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as err:
+            LOGGER.exception(err)
+            self.failed.emit(str(err))
+            return
+
+        self.__project.file_path = self.__file_path
+        self.__project.update_content_hash("project", project_content)
+
+        graphics_scene = self.__project.graphics_scene
+        graphics_scene.loading_progress.connect(
+            lambda added, total: self.progress.emit(added, total, "Adding nodes...")
+        )
+        graphics_scene.loading_finished.connect(self.__loading_finished)
+
+        self.project_loaded.emit(self.__project)
+
+    def __loading_finished(self):
+        elapsed_ms = int((time.perf_counter() - self.__start_time) * 1000)
+        LOGGER.info("Project loaded in %s ms", elapsed_ms)
+
+        self.finished.emit(self.__project)
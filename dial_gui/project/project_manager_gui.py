@@ -1,28 +1,96 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
 import os
+import pickle
+import tempfile
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Set
 
 import dependency_injector.providers as providers
 from dial_core.project import ProjectManager
-from dial_core.utils import log
-from PySide2.QtCore import Signal
-from PySide2.QtWidgets import QFileDialog, QMessageBox, QWidget
+from dial_core.utils import Timer, log
+from dial_gui.node_editor import LayoutStore
+from PySide2.QtCore import QThread, Qt, Signal
+from PySide2.QtWidgets import QFileDialog, QMessageBox, QProgressDialog, QWidget
 
+from . import project_file, project_session
 from .project_gui import ProjectGUI, ProjectGUIFactory
+from .project_loader import ProjectFileReader, ProjectLoader
+
+if TYPE_CHECKING:
+    import numpy as np
 
 LOGGER = log.get_logger(__name__)
 
 
+class _UnloadedProject(NamedTuple):
+    """A project whose Qt objects have been released (See `max_loaded_nodes`)."""
+
+    scratch_file_path: str
+    windows_masks: List[int]
+    layout_rows: Optional["np.ndarray"]
+    modified: bool
+
+
 class ProjectManagerGUI(QWidget, ProjectManager):
+    """
+    Signals:
+        project_replaced: A project (old project, new project, index) has been replaced
+            on the projects list: A stub by its loaded project (See `restore_session`),
+            or an unloaded project by its stub (See `max_loaded_nodes`).
+
+    Attributes:
+        max_loaded_nodes: Memory budget, as the maximum number of nodes of all the
+            loaded projects (None to disable). When exceeded, the least recently active
+            projects are serialized to a scratch file and replaced by stubs, releasing
+            their scenes and widgets. They're restored when activated again.
+    """
+
     new_project_created = Signal(ProjectGUI)
     project_added = Signal(ProjectGUI)
     active_project_changed = Signal(ProjectGUI)
     project_removed = Signal(ProjectGUI, int)
+    project_saved = Signal(ProjectGUI, int)
+    project_replaced = Signal(ProjectGUI, ProjectGUI, int)
 
-    def __init__(self, default_project: "ProjectGUI", parent=None):
+    def __init__(
+        self,
+        default_project: "ProjectGUI",
+        layout_store_min_nodes: Optional[int] = 5000,
+        compression_level: Optional[int] = None,
+        max_loaded_nodes: Optional[int] = None,
+        parent=None,
+    ):
         QWidget.__init__(self, parent)
         ProjectManager.__init__(self, default_project)
 
+        # zlib level used for compressing project files (None to save them uncompressed,
+        # readable by any version)
+        self.compression_level = compression_level
+
+        # Projects with at least this number of nodes keep their layout on a LayoutStore
+        # (None to disable)
+        self.layout_store_min_nodes = layout_store_min_nodes
+
+        # Project stubs being loaded, and content of the prefetched project files (Only
+        # the files of the next `max_prefetched_projects` stubs are kept in memory)
+        self.max_prefetched_projects = 2
+
+        self.__stub_loaders: Dict["ProjectGUI", "ProjectLoader"] = {}
+        self.__prefetched_contents: Dict[str, bytes] = {}
+        self.__prefetched_file_paths: Set[str] = set()
+        self.__prefetch_reader: Optional["ProjectFileReader"] = None
+
+        # Projects ordered from the least to the most recently active, and projects
+        # unloaded to scratch files
+        self.max_loaded_nodes = max_loaded_nodes
+
+        self.__recently_active: List["ProjectGUI"] = []
+        self.__unloaded_projects: Dict["ProjectGUI", "_UnloadedProject"] = {}
+        self.__scratch_directory: Optional["tempfile.TemporaryDirectory"] = None
+
+        # While closing all the projects, stubs aren't loaded when activated
+        self.__closing_projects = False
+
     def open_project(self):
         LOGGER.debug("Opening dialog for pickling a file...")
 
@@ -32,19 +100,137 @@ class ProjectManagerGUI(QWidget, ProjectManager):
         LOGGER.info("File path selected for opening: %s", file_path)
 
         if file_path:
-            super().open_project(file_path)
+            self.open_project_file(file_path)
         else:
             LOGGER.info("Invalid file path. Loading cancelled.")
 
+    def open_project_file(self, file_path: str) -> "ProjectLoader":
+        """Opens a project from a `.dial` file without blocking the GUI.
+
+        The project is added (and made active) as soon as it's deserialized, and its
+        nodes appear on the canvas progressively. A progress dialog allows cancelling
+        the operation, which closes the partially loaded project.
+
+        Returns:
+            The ProjectLoader object used for loading the project.
+        """
+        loader = ProjectLoader(file_path, parent=self)
+
+        progress_dialog = QProgressDialog(
+            "Opening project...", "Cancel", 0, 0, self, Qt.Dialog
+        )
+        progress_dialog.setWindowTitle("Open Dial project")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.setAutoReset(False)
+        progress_dialog.setAutoClose(False)
+
+        def update_progress(value: int, maximum: int, text: str):
+            progress_dialog.setLabelText(text)
+            progress_dialog.setMaximum(maximum)
+            progress_dialog.setValue(value)
+
+        def loading_canceled(project: "ProjectGUI"):
+            if project in self.projects:
+                ProjectManager.close_project(self, project)
+
+        def loading_done():
+            progress_dialog.canceled.disconnect(loader.cancel)
+            progress_dialog.close()
+            loader.dispose()
+
+        def loading_failed(message: str):
+            loading_done()
+            QMessageBox.critical(self, "Open Dial project", message)
+
+        loader.progress.connect(update_progress)
+        loader.project_loaded.connect(self.add_project)
+        loader.finished.connect(lambda project: project.restore_layout())
+        loader.finished.connect(loading_done)
+        loader.canceled.connect(loading_canceled)
+        loader.canceled.connect(loading_done)
+        loader.failed.connect(loading_failed)
+
+        progress_dialog.canceled.connect(loader.cancel)
+
+        loader.start()
+
+        return loader
+
     def save_project(self, project: "ProjectGUI") -> "ProjectGUI":
-        try:
-            return super().save_project(project)
+        """Saves the project on its file path.
+
+        Each section of the project (project file, layout file) is only written if its
+        content has changed since the last time it was saved or opened.
+
+        Emits `project_saved` with the number of bytes written (0 if nothing changed).
+        If the project can't be serialized or written, an error dialog is shown instead
+        (And the sections that weren't written are still considered modified).
+        Project stubs aren't saved (They haven't been modified), except the ones of
+        modified unloaded projects, which are saved from their scratch file.
+        """
+        unloaded_project = self.__unloaded_projects.get(project)
+
+        if project.is_stub and not (unloaded_project and unloaded_project.modified):
+            self.project_saved.emit(project, 0)
+            return project
 
-        except ValueError:
+        if not project.file_path:
             LOGGER.warning("Project doesn't have a file path set!")
             return self.save_project_as(project)
 
+        if unloaded_project:
+            self.__save_unloaded_project(project, unloaded_project)
+            return project
+
+        self.__use_layout_store_if_needed(project)
+
+        LOGGER.info("Saving project: %s", project.file_path)
+
+        with Timer() as timer:
+            written_bytes = 0
+
+            try:
+                payload = project_file.dumps(project)
+                if not project.is_content_saved("project", payload):
+                    content = (
+                        project_file.compress(payload, self.compression_level)
+                        if self.compression_level is not None
+                        else payload
+                    )
+
+                    project_file.write(project.file_path, content)
+                    project.update_content_hash("project", payload)
+
+                    written_bytes += len(content)
+
+                written_bytes += project.save_layout()
+
+            except (OSError, pickle.PicklingError, TypeError) as err:
+                LOGGER.exception(err)
+                QMessageBox.critical(
+                    self, "Save Dial project", f"The project couldn't be saved: {err}"
+                )
+                return project
+
+        if written_bytes:
+            LOGGER.info(
+                "Project saved in %s ms (%s bytes written)",
+                timer.elapsed(),
+                written_bytes,
+            )
+        else:
+            LOGGER.info("Project not saved: There aren't any changes.")
+
+        self.project_saved.emit(project, written_bytes)
+
+        return project
+
     def save_project_as(self, project: "ProjectGUI"):
+        if project.is_stub and project not in self.__unloaded_projects:
+            LOGGER.info("The project %s hasn't been loaded yet.", project.name)
+            return
+
         LOGGER.debug("Opening dialog for picking a save file...")
 
         selected_parent_dir = QFileDialog.getExistingDirectory(
@@ -65,6 +251,35 @@ class ProjectManagerGUI(QWidget, ProjectManager):
             LOGGER.info("Invalid file path. Saving cancelled.")
 
     def close_project(self, project: "ProjectGUI"):
+        if project.is_stub:
+            unloaded_project = self.__unloaded_projects.get(project)
+
+            if unloaded_project and unloaded_project.modified:
+                return_code = QMessageBox.warning(
+                    self,
+                    "The document has been modified",
+                    "Do you want to save your changes?",
+                    QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
+                )
+
+                if return_code == QMessageBox.Cancel:
+                    return
+
+                if return_code == QMessageBox.Save:
+                    self.save_project(project)
+
+                    # Not saved (Cancelled or failed): Keep the project open
+                    if self.__unloaded_projects[project].modified:
+                        return
+
+            self.__cancel_stub_loading(project)
+            super().close_project(project)
+
+            if self.__prefetched_contents.pop(project.file_path, None) is not None:
+                self.__prefetch_next_stub()
+
+            return
+
         return_code = QMessageBox.warning(
             self,
             "The document has been modified",
@@ -81,10 +296,93 @@ class ProjectManagerGUI(QWidget, ProjectManager):
         # The project is closed if we discard the project or we save it
         super().close_project(project)
 
+    def save_session(self):
+        """Stores the open projects (the ones saved on a file) on the session file."""
+        projects = [project for project in self.projects if project.file_path]
+
+        active_index = projects.index(self.active) if self.active in projects else 0
+
+        project_session.save(
+            project_session.Session(
+                projects=[
+                    project_session.SessionProject(
+                        file_path=project.file_path,
+                        name=project.name,
+                        view_state=project.view_state,
+                    )
+                    for project in projects
+                ],
+                active_index=active_index,
+            )
+        )
+
+    def restore_session(self) -> bool:
+        """Reopens the projects of the last session.
+
+        The projects are added as stubs (empty projects), and each one is loaded the
+        first time it's activated. Only the active project of the session is loaded
+        right away. The files of the other projects are read in the background,
+        one by one, so they're loaded faster when activated.
+
+        Unmodified default projects are closed.
+
+        Returns:
+            If there was a session to restore.
+        """
+        session = project_session.load()
+        if not session:
+            return False
+
+        LOGGER.info("Restoring session: %s", [p.file_path for p in session.projects])
+
+        default_projects = [
+            project
+            for project in self.projects
+            if not project.file_path and not project.graphics_scene.graphics_nodes
+        ]
+
+        first_index = self.projects_count()
+
+        for session_project in session.projects:
+            stub = ProjectGUIFactory(name=session_project.name)
+            stub.file_path = session_project.file_path
+            stub.view_state = session_project.view_state
+            stub.is_stub = True
+
+            self._add_project_impl(stub)
+
+        for project in default_projects:
+            self._remove_project_impl(project)
+
+        first_index -= len(default_projects)
+        self.set_active_project(first_index + session.active_index)
+
+        self.__prefetch_next_stub()
+
+        return True
+
     def closeEvent(self, event):
+        self.save_session()
+
+        self.__closing_projects = True
+
         for project in list(self.projects):
             self.close_project(project)
 
+        self.__closing_projects = False
+
+    def __use_layout_store_if_needed(self, project: "ProjectGUI"):
+        """Starts using a LayoutStore for big projects."""
+        graphics_scene = project.graphics_scene
+
+        if (
+            self.layout_store_min_nodes is not None
+            and not graphics_scene.layout_store
+            and not graphics_scene.is_loading()
+            and len(graphics_scene.graphics_nodes) >= self.layout_store_min_nodes
+        ):
+            graphics_scene.attach_layout_store(LayoutStore())
+
     def _new_project_impl(self) -> "ProjectGUI":
         new_project = super()._new_project_impl()
         self.new_project_created.emit(new_project)
@@ -99,17 +397,308 @@ class ProjectManagerGUI(QWidget, ProjectManager):
 
     def _set_active_project_impl(self, index: int) -> "ProjectGUI":
         active_project = super()._set_active_project_impl(index)
+
+        if active_project in self.__recently_active:
+            self.__recently_active.remove(active_project)
+        self.__recently_active.append(active_project)
+
+        if self.__closing_projects:
+            self.active_project_changed.emit(active_project)
+            return active_project
+
+        if active_project.is_stub:
+            self.__load_stub(active_project)
+
         self.active_project_changed.emit(active_project)
+
+        self.__unload_projects_over_budget()
+
         return active_project
 
     def _remove_project_impl(self, project: "ProjectGUI") -> "ProjectGUI":
         index = self.index_of(project)
         super()._remove_project_impl(project)
 
+        if project in self.__recently_active:
+            self.__recently_active.remove(project)
+
+        self.__remove_scratch_file(project)
+
         self.project_removed.emit(project, index)
 
         return project
 
+    def __load_stub(self, stub: "ProjectGUI"):
+        """Starts loading the project file of the stub (Using the prefetched content,
+        if available), or its scratch file if the project was unloaded. The stub is
+        replaced by the project once deserialized."""
+        if stub in self.__stub_loaders:
+            return
+
+        unloaded_project = self.__unloaded_projects.get(stub)
+
+        if unloaded_project:
+            loader = ProjectLoader(unloaded_project.scratch_file_path, parent=self)
+        else:
+            loader = ProjectLoader(
+                stub.file_path,
+                content=self.__prefetched_contents.pop(stub.file_path, None),
+                parent=self,
+            )
+
+        self.__stub_loaders[stub] = loader
+
+        # Its prefetched content (if any) has been taken: Prefetch another one
+        self.__prefetch_next_stub()
+
+        def loading_done():
+            self.__stub_loaders.pop(stub, None)
+            loader.dispose()
+
+        def loading_failed(message: str):
+            loading_done()
+            LOGGER.error("Project %s couldn't be loaded: %s", stub.file_path, message)
+            QMessageBox.critical(self, "Open Dial project", message)
+
+        loader.project_loaded.connect(
+            lambda project: self.__replace_stub(stub, project)
+        )
+        if unloaded_project:
+            loader.finished.connect(
+                lambda project: self.__restore_unloaded_layout(
+                    project, unloaded_project
+                )
+            )
+        else:
+            loader.finished.connect(lambda project: project.restore_layout())
+        loader.finished.connect(loading_done)
+        loader.canceled.connect(loading_done)
+        loader.failed.connect(loading_failed)
+
+        loader.start()
+
+    def __cancel_stub_loading(self, stub: "ProjectGUI"):
+        loader = self.__stub_loaders.get(stub)
+
+        if loader:
+            loader.cancel()
+
+    def __replace_stub(self, stub: "ProjectGUI", project: "ProjectGUI"):
+        """Puts the loaded project on the place of its stub."""
+        index = self.index_of(stub)
+        if index == -1:  # The stub has been closed meanwhile
+            return
+
+        if stub in self.__unloaded_projects:
+            project.file_path = stub.file_path
+            project.copy_content_hashes(stub)
+
+            self.__remove_scratch_file(stub)
+
+        project.view_state = stub.view_state
+        project.index = index
+        self._projects[index] = project
+
+        self.__recently_active = [
+            project if recent_project is stub else recent_project
+            for recent_project in self.__recently_active
+        ]
+
+        LOGGER.info("Project %s loaded", project.file_path or project.name)
+
+        self.project_replaced.emit(stub, project, index)
+
+        if self._active is stub:
+            self._active = project
+            self.active_project_changed.emit(project)
+
+        self.__unload_projects_over_budget()
+
+    def __unload_projects_over_budget(self):
+        """Unloads the least recently active projects until the loaded projects fit on
+        the `max_loaded_nodes` budget. The active project is never unloaded."""
+        if self.max_loaded_nodes is None:
+            return
+
+        loaded_projects = [project for project in self.projects if not project.is_stub]
+        loaded_nodes = sum(
+            len(project.graphics_scene.graphics_nodes) for project in loaded_projects
+        )
+
+        for project in list(self.__recently_active):
+            if loaded_nodes <= self.max_loaded_nodes:
+                break
+
+            if (
+                project is self._active
+                or project.is_stub
+                or project.graphics_scene.is_loading()
+            ):
+                continue
+
+            loaded_nodes -= len(project.graphics_scene.graphics_nodes)
+            self.__unload_project(project)
+
+            # Its content (if it was prefetched) isn't needed anymore: Unloaded projects
+            # are restored from their scratch file. The rest of the prefetched files
+            # are already bounded by `max_prefetched_projects`.
+            self.__prefetched_contents.pop(project.file_path, None)
+
+    def __unload_project(self, project: "ProjectGUI"):
+        """Serializes the project to a scratch file, and replaces it by a stub."""
+        index = self.index_of(project)
+
+        # Nodes with a LayoutStore don't pickle their geometry: Keep it apart
+        payload = project_file.dumps(project)
+        layout_rows = project.layout_rows()
+
+        if not self.__scratch_directory:
+            self.__scratch_directory = tempfile.TemporaryDirectory(prefix="dial-")
+
+        (scratch_file, scratch_file_path) = tempfile.mkstemp(
+            suffix=".dial", dir=self.__scratch_directory.name
+        )
+        with os.fdopen(scratch_file, "wb") as file:
+            file.write(payload)
+
+        stub = ProjectGUIFactory(name=project.name)
+        stub.file_path = project.file_path
+        stub.view_state = project.view_state
+        stub.is_stub = True
+        stub.index = index
+        stub.copy_content_hashes(project)
+
+        self.__unloaded_projects[stub] = _UnloadedProject(
+            scratch_file_path=scratch_file_path,
+            windows_masks=project.nodes_windows_masks(),
+            layout_rows=layout_rows,
+            modified=not project.is_content_saved("project", payload)
+            or (
+                layout_rows is not None
+                and not project.is_content_saved("layout", layout_rows.tobytes())
+            ),
+        )
+
+        self._projects[index] = stub
+        self.__recently_active = [
+            stub if recent_project is project else recent_project
+            for recent_project in self.__recently_active
+        ]
+
+        LOGGER.info(
+            "Project %s unloaded to %s (%s bytes)",
+            project.name,
+            scratch_file_path,
+            len(payload),
+        )
+
+        self.project_replaced.emit(project, stub, index)
+
+        project.graphics_scene.deleteLater()
+        project.nodes_windows_manager.deleteLater()
+
+    def __save_unloaded_project(
+        self, stub: "ProjectGUI", unloaded_project: "_UnloadedProject"
+    ):
+        """Writes the content of the scratch file of an unloaded project on its file,
+        and its layout on the sidecar file. If it succeeds, the unloaded project isn't
+        considered modified anymore.
+        """
+        try:
+            with open(unloaded_project.scratch_file_path, "rb") as scratch_file:
+                payload = scratch_file.read()
+
+            content = (
+                project_file.compress(payload, self.compression_level)
+                if self.compression_level is not None
+                else payload
+            )
+            project_file.write(stub.file_path, content)
+            stub.update_content_hash("project", payload)
+
+            written_bytes = len(content) + stub.save_layout_rows(
+                unloaded_project.layout_rows
+            )
+
+        except OSError as err:
+            LOGGER.exception(err)
+            QMessageBox.critical(
+                self, "Save Dial project", f"The project couldn't be saved: {err}"
+            )
+            return
+
+        self.__unloaded_projects[stub] = unloaded_project._replace(modified=False)
+
+        LOGGER.info("Unloaded project saved: %s", stub.file_path)
+
+        self.project_saved.emit(stub, written_bytes)
+
+    @staticmethod
+    def __restore_unloaded_layout(
+        project: "ProjectGUI", unloaded_project: "_UnloadedProject"
+    ):
+        """Restores the geometry and NodesWindows of a reloaded project."""
+        if unloaded_project.layout_rows is not None:
+            project.graphics_scene.attach_layout_store(
+                LayoutStore(unloaded_project.layout_rows), restore=True
+            )
+
+        project.restore_nodes_windows(unloaded_project.windows_masks)
+
+    def __remove_scratch_file(self, stub: "ProjectGUI"):
+        unloaded_project = self.__unloaded_projects.pop(stub, None)
+
+        if unloaded_project and os.path.isfile(unloaded_project.scratch_file_path):
+            os.remove(unloaded_project.scratch_file_path)
+
+    def __prefetch_next_stub(self):
+        """Reads (on a low priority thread) the file of the next stub that isn't being
+        loaded yet. The files are read one by one, until `max_prefetched_projects`
+        files are kept in memory."""
+        if (
+            self.__prefetch_reader
+            or self.__closing_projects
+            or len(self.__prefetched_contents) >= self.max_prefetched_projects
+        ):
+            return
+
+        stub = next(
+            (
+                project
+                for project in self.projects
+                if project.is_stub
+                and project not in self.__stub_loaders
+                and project not in self.__unloaded_projects
+                and project.file_path not in self.__prefetched_file_paths
+            ),
+            None,
+        )
+
+        if not stub:
+            return
+
+        file_path = stub.file_path
+        self.__prefetched_file_paths.add(file_path)
+
+        def file_read(content: bytes):
+            self.__prefetched_contents[file_path] = content
+
+        def reader_finished():
+            self.__prefetch_reader.deleteLater()
+            self.__prefetch_reader = None
+
+            self.__prefetch_next_stub()
+
+        self.__prefetch_reader = ProjectFileReader(file_path, parent=self)
+        self.__prefetch_reader.file_read.connect(file_read)
+        self.__prefetch_reader.failed.connect(
+            lambda message: LOGGER.warning(
+                "Project %s couldn't be prefetched: %s", file_path, message
+            )
+        )
+        self.__prefetch_reader.finished.connect(reader_finished)
+        self.__prefetch_reader.start(QThread.LowPriority)
+
 
 ProjectManagerGUISingleton = providers.Singleton(
     ProjectManagerGUI, default_project=ProjectGUIFactory
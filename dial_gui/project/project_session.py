@@ -0,0 +1,106 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+"""Functions for saving and restoring the working session: The projects that were open
+when the application was closed, which one was active, and the view state (zoom and
+center of the editor) of each one.
+
+The session is stored as a JSON file on the configuration directory. Only projects
+saved on a file can be restored.
+"""
+
+import json
+import os
+from typing import List, NamedTuple, Optional
+
+from dial_core.utils import log
+
+LOGGER = log.get_logger(__name__)
+
+SESSION_FILE_NAME = "session.json"
+
+SESSION_FORMAT_VERSION = 1
+
+
+class SessionProject(NamedTuple):
+    """A project of the session."""
+
+    file_path: str
+    name: str
+    view_state: Optional[dict] = None
+
+
+class Session(NamedTuple):
+    """The projects of the session, and the index of the active one."""
+
+    projects: List["SessionProject"]
+    active_index: int = 0
+
+
+def session_file() -> str:
+    """Returns the path of the file where the session is stored."""
+    from dial_gui.utils import application
+
+    return os.path.join(application.config_directory(), SESSION_FILE_NAME)
+
+
+def save(session: "Session", file_path: str = None):
+    """Writes the session on `file_path` (By default, `session_file()`)."""
+    file_path = file_path or session_file()
+
+    content = {
+        "format": SESSION_FORMAT_VERSION,
+        "active_index": session.active_index,
+        "projects": [project._asdict() for project in session.projects],
+    }
+
+    with open(file_path, "w") as json_file:
+        json.dump(content, json_file, indent=2)
+
+    LOGGER.info("Session saved with %s projects", len(session.projects))
+
+
+def load(file_path: str = None) -> Optional["Session"]:
+    """Reads the session stored on `file_path` (By default, `session_file()`).
+
+    Projects whose file doesn't exist anymore are discarded.
+
+    Returns:
+        The session, or None if there isn't a valid session with projects.
+    """
+    file_path = file_path or session_file()
+
+    try:
+        with open(file_path) as json_file:
+            content = json.load(json_file)
+
+        if content.get("format") != SESSION_FORMAT_VERSION or not content["projects"]:
+            return None
+
+        active_file_path = content["projects"][content["active_index"]]["file_path"]
+
+        projects = [
+            SessionProject(**project)
+            for project in content["projects"]
+            if os.path.isfile(project["file_path"])
+        ]
+
+    except FileNotFoundError:
+        return None
+
+    except (ValueError, KeyError, IndexError, TypeError) as err:
+        LOGGER.warning("Invalid session file %s: %s", file_path, err)
+        return None
+
+    if not projects:
+        return None
+
+    active_index = next(
+        (
+            index
+            for (index, project) in enumerate(projects)
+            if project.file_path == active_file_path
+        ),
+        0,
+    )
+
+    return Session(projects=projects, active_index=active_index)
@@ -0,0 +1,252 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+"""
+Profiler for the startup of the application (Enabled with `--profile-startup`).
+
+Records the wall-clock duration of the startup phases and a tree with the time spent
+importing each module, and writes a report when the application is idle for the first
+time after the main window has been painted (and the rest of the startup work, like the
+plugins loaded on background, has finished).
+
+Important:
+    This module must only import standard library modules, because it has to be
+    enabled before anything else is imported.
+"""
+
+import builtins
+import contextlib
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    from PySide2.QtCore import SignalInstance
+    from PySide2.QtWidgets import QWidget
+
+REPORT_FILE_NAME = "startup_profile.txt"
+
+# Imports faster than this aren't included on the report
+MIN_REPORTED_IMPORT_MS = 1.0
+
+
+class _Node:
+    """A timed node of a tree (A phase or an import)."""
+
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.elapsed = 0.0
+        self.children: List["_Node"] = []
+
+
+_enabled = False
+_start_time = 0.0
+_original_import: Optional[Callable] = None
+
+_lock = threading.Lock()
+_thread_state = threading.local()
+
+_phases_root = _Node("startup", 0.0)
+_phases_stack: List["_Node"] = [_phases_root]
+_import_roots: List["_Node"] = []
+_marks: List[tuple] = []
+
+
+def is_enabled() -> bool:
+    """Checks if the startup is being profiled."""
+    return _enabled
+
+
+def enable():
+    """Starts profiling. Imports done from now on are timed."""
+    global _enabled, _start_time, _original_import
+
+    if _enabled:
+        return
+
+    _enabled = True
+    _start_time = time.perf_counter()
+
+    _original_import = builtins.__import__
+    builtins.__import__ = _profiled_import
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """Context manager that times a startup phase. Phases can be nested.
+
+    Does nothing if the profiler isn't enabled.
+    """
+    if not _enabled:
+        yield
+        return
+
+    node = _Node(name, time.perf_counter())
+    _phases_stack[-1].children.append(node)
+    _phases_stack.append(node)
+
+    try:
+        yield
+    finally:
+        node.elapsed = time.perf_counter() - node.start
+        _phases_stack.pop()
+
+
+def mark(name: str):
+    """Records an instant event (like the first paint of the main window)."""
+    if _enabled:
+        _marks.append((name, time.perf_counter()))
+
+
+def report_after_first_paint(
+    widget: "QWidget", wait_for: Sequence[Tuple[str, "SignalInstance"]] = ()
+):
+    """Marks the first paint of `widget`, and writes the report when the application
+    becomes idle afterwards.
+
+    Args:
+        widget: The widget whose first paint is waited for.
+        wait_for: (name, signal) pairs of other startup tasks still running. The report
+            isn't written until all the signals have been emitted too (Each one is
+            recorded as a mark with its name).
+    """
+    if not _enabled:
+        return
+
+    from PySide2.QtCore import QEvent, QObject, QTimer
+
+    pending: Set[str] = {"First paint"} | {name for (name, _) in wait_for}
+
+    def finished(name: str):
+        if name not in pending:
+            return
+
+        pending.discard(name)
+        mark(name)
+
+        if not pending:
+            # Executed when the event loop is idle
+            QTimer.singleShot(0, write_report)
+
+    for (name, signal) in wait_for:
+        signal.connect(lambda *_, name=name: finished(name))
+
+    class FirstPaintEventFilter(QObject):
+        def eventFilter(self, watched: "QObject", event: "QEvent") -> bool:
+            if event.type() == QEvent.Paint:
+                watched.removeEventFilter(self)
+                finished("First paint")
+
+            return False
+
+    widget._first_paint_event_filter = FirstPaintEventFilter(widget)
+    widget.installEventFilter(widget._first_paint_event_filter)
+
+
+def write_report(file_path: str = None) -> str:
+    """Stops profiling and writes the report.
+
+    Args:
+        file_path: Path of the report. By default, `startup_profile.txt` on the
+            configuration directory.
+
+    Returns:
+        The path of the written report.
+    """
+    global _enabled
+
+    if not _enabled:
+        return ""
+
+    mark("First idle")
+
+    _enabled = False
+    builtins.__import__ = _original_import
+
+    if not file_path:
+        from dial_gui.utils import application
+
+        file_path = os.path.join(application.config_directory(), REPORT_FILE_NAME)
+
+    with open(file_path, "w") as report_file:
+        report_file.write("\n".join(_report_lines()) + "\n")
+
+    from dial_core.utils import log
+
+    log.get_logger(__name__).info("Startup profile written to %s", file_path)
+
+    return file_path
+
+
+def _report_lines() -> List[str]:
+    lines = [f"Dial startup profile ({datetime.now().ctime()})", ""]
+
+    for (name, timestamp) in _marks:
+        lines.append(f"{_ms(timestamp - _start_time)} ms  {name}")
+
+    lines += ["", "Phases (start offset, duration):"]
+    for child in _phases_root.children:
+        lines += _node_lines(child, 1, show_offset=True)
+
+    lines += ["", f"Imports (cumulative, >= {MIN_REPORTED_IMPORT_MS} ms):"]
+    for root in sorted(_import_roots, key=lambda node: node.start):
+        for child in root.children:
+            lines += _node_lines(child, 1, show_offset=False)
+
+    return lines
+
+
+def _node_lines(node: "_Node", depth: int, show_offset: bool) -> List[str]:
+    elapsed_ms = node.elapsed * 1000
+
+    if not show_offset and elapsed_ms < MIN_REPORTED_IMPORT_MS:
+        return []
+
+    indent = "  " * depth
+    offset = f"[+{_ms(node.start - _start_time)} ms] " if show_offset else ""
+
+    lines = [f"{offset}{elapsed_ms:9.1f} ms{indent}{node.name}"]
+
+    for child in node.children:
+        lines += _node_lines(child, depth + 1, show_offset)
+
+    return lines
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.1f}"
+
+
+def _import_stack() -> List["_Node"]:
+    """Returns the stack of imports being executed on the current thread."""
+    try:
+        return _thread_state.import_stack
+    except AttributeError:
+        root = _Node(threading.current_thread().name, time.perf_counter())
+        _thread_state.import_stack = [root]
+
+        with _lock:
+            _import_roots.append(root)
+
+        return _thread_state.import_stack
+
+
+def _profiled_import(name, globals=None, locals=None, fromlist=(), level=0):
+    # Already imported modules are ignored
+    if not _enabled or (level == 0 and name in sys.modules):
+        return _original_import(name, globals, locals, fromlist, level)
+
+    import_stack = _import_stack()
+
+    node = _Node(name if level == 0 else "." * level + name, time.perf_counter())
+    import_stack[-1].children.append(node)
+    import_stack.append(node)
+
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        node.elapsed = time.perf_counter() - node.start
+        import_stack.pop()
@@ -4,6 +4,20 @@
 Utility and helper methods (Logging system, version checkers, code timers...).
 """
 
-from . import application, initialization
+from . import (
+    application,
+    initialization,
+    log_persistence,
+    log_records_buffer,
+    plugin_loader,
+    plugins_index,
+)
 
-__all__ = ["initialization", "application"]
+__all__ = [
+    "initialization",
+    "application",
+    "log_persistence",
+    "log_records_buffer",
+    "plugin_loader",
+    "plugins_index",
+]
@@ -1,16 +1,20 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
+import functools
 import json
 import os
 from typing import Optional
 
-import pkg_resources
 from PySide2.QtCore import QStandardPaths
 
 
+@functools.lru_cache(maxsize=None)
 def version() -> str:
-    """Returns the current version of the application."""
-    return pkg_resources.require("dial-gui")[0].version
+    """Returns the current version of the application (Read from the plugins index
+    while it's up to date, see `PluginsIndex`)."""
+    from .plugins_index import PluginsIndexSingleton
+
+    return PluginsIndexSingleton().application_version()
 
 
 def config_directory() -> str:
@@ -58,6 +62,26 @@ def installed_plugins_file() -> str:
     return plugins_file_path
 
 
+def plugins_index_file() -> str:
+    """Returns the file with the cached metadata of the installed plugins."""
+    return plugins_directory() + os.path.sep + "plugins_index.json"
+
+
+def logs_directory() -> str:
+    """Returns the directory where the log files are written."""
+    logs_directory = config_directory() + os.path.sep + "logs"
+
+    if not os.path.isdir(logs_directory):
+        os.mkdir(logs_directory)
+
+    return logs_directory
+
+
+def log_file() -> str:
+    """Returns the file where the log records are persisted (See `LogPersistence`)."""
+    return logs_directory() + os.path.sep + "dial.jsonl"
+
+
 def installed_plugins_file_content() -> Optional[dict]:
     """Returns the content of the `plugins.json` file."""
     with open(installed_plugins_file()) as plugins_file:
@@ -5,20 +5,26 @@ Functions to check that python versions, libraries... used by the program are co
 
 
 import json
+import logging
 import os
 import signal
 import sys
 from typing import TYPE_CHECKING
 
 import dial_core
-import pkg_resources
 from dial_core.plugin import PluginManagerSingleton
 from dial_core.utils import log
+from dial_gui import startup_profiler
 
 from . import application
+from .log_persistence import LogPersistenceSingleton
+from .log_records_buffer import LogRecordsBufferSingleton
+from .plugin_loader import PluginLoaderSingleton
+from .plugins_index import PluginsIndexSingleton
 
 if TYPE_CHECKING:
     import argparse
+    from PySide2.QtWidgets import QApplication
 
 
 LOGGER = log.get_logger(__name__)
@@ -33,10 +39,17 @@ def initialize(args: "argparse.Namespace"):
         ImportError: If couldn't import a necessary module.
         SystemError: If the Python version isn't compatible.
     """
+    # Keep the log records (capped) for the logging window
+    log.add_handler_to_root(LogRecordsBufferSingleton())
+
     try:
+        with startup_profiler.phase("dial_core.utils.initialization.initialize"):
+            dial_core.utils.initialization.initialize(args)
 
-        dial_core.utils.initialization.initialize(args)
-        __gui_initialization(args)
+        __remove_log_stream_handler()
+
+        with startup_profiler.phase("__gui_initialization"):
+            __gui_initialization(args)
 
     except (ImportError, SystemError) as err:
         LOGGER.exception(err)
@@ -47,9 +60,51 @@ def initialize(args: "argparse.Namespace"):
         tk.Tk().withdraw()
         messagebox.showerror("Error", str(err))
 
+        LogPersistenceSingleton().stop()
+
         sys.exit(1)
 
 
+def __remove_log_stream_handler():
+    """Removes the handler that dial_core adds for writing all the log messages on
+    `log.LOG_STREAM`, which grows without limit. The LogRecordsBuffer (capped) is used
+    instead to show the log history."""
+    root_logger = logging.getLogger()
+
+    for handler in list(root_logger.handlers):
+        if getattr(handler, "stream", None) is log.LOG_STREAM:
+            root_logger.removeHandler(handler)
+
+    log.LOG_STREAM.seek(0)
+    log.LOG_STREAM.truncate()
+
+
+def initialize_headless(args: "argparse.Namespace") -> "QApplication":
+    """Performs the initialization needed for using the application components without
+    showing a GUI (Used by command line tools). Qt runs with the "offscreen" platform,
+    so no display is needed.
+
+    Returns:
+        The QApplication instance. The caller must keep a reference to it.
+
+    Raises:
+        ImportError: If couldn't import a necessary module.
+        SystemError: If the Python version isn't compatible.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    dial_core.utils.initialization.initialize(args)
+
+    from PySide2.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    app.setApplicationName("dial")
+
+    __plugins_initialization(args, background=False)
+
+    return app
+
+
 def __gui_initialization(args: "argparse.Namespace"):
     """Performs all the initialization of the GUI components.
 
@@ -60,28 +115,41 @@ def __gui_initialization(args: "argparse.Namespace"):
 
     # Necessary for Qt Web Engine
     from PySide2.QtCore import Qt, QCoreApplication
+
     QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
 
     # Initialize PySide2
     from PySide2.QtWidgets import QApplication
 
-    app = QApplication()
-    app.setApplicationName("dial")
-    app.aboutToQuit.connect(exit_application)
+    with startup_profiler.phase("QApplication creation"):
+        app = QApplication()
+        app.setApplicationName("dial")
+        app.aboutToQuit.connect(exit_application)
+
+    # Write the log records to disk from a background thread (On the config
+    # directory, which depends on the application name)
+    LogPersistenceSingleton().start()
 
     from dial_gui.project import ProjectManagerGUISingleton
-    __plugins_initialization(args)
 
+    with startup_profiler.phase("__plugins_initialization"):
+        __plugins_initialization(args)
 
-def __plugins_initialization(args: "argparse.Namespace"):
+
+def __plugins_initialization(args: "argparse.Namespace", background: bool = True):
     """Initializes the plugin manager and loads all the necessary plugins.
+
+    Args:
+        args: App configuration namespace.
+        background: If True, the plugins are loaded by the PluginLoader while the GUI
+            is running (See `PluginLoader`). Otherwise, they're loaded right now.
     """
-    plugins_install_abs_path = os.path.abspath(application.plugins_install_directory())
+    plugins_index = PluginsIndexSingleton()
 
-    sys.path.append(plugins_install_abs_path)
-    pkg_resources.working_set.add_entry(plugins_install_abs_path)
+    sys.path.append(plugins_index.install_directory)
+    plugins_index.register_distributions()
 
-    LOGGER.info("%s added to sys.path", plugins_install_abs_path)
+    LOGGER.info("%s added to sys.path", plugins_index.install_directory)
 
     plugins_manager = PluginManagerSingleton(
         application.installed_plugins_file_content()
@@ -89,9 +157,17 @@ def __plugins_initialization(args: "argparse.Namespace"):
 
     LOGGER.debug("Installed plugins: %s", plugins_manager.installed_plugins)
 
-    for plugin in plugins_manager.installed_plugins.values():
+    active_plugins = [
+        plugin for plugin in plugins_manager.installed_plugins.values() if plugin.active
+    ]
+
+    if background:
+        PluginLoaderSingleton().start(active_plugins)
+        return
+
+    for plugin in active_plugins:
         try:
-            if plugin.active:
+            with startup_profiler.phase(f"Plugin {plugin.name}"):
                 plugin.load()
         except ModuleNotFoundError as err:
             LOGGER.exception(err)
@@ -116,3 +192,5 @@ def exit_application():
     QApplication.quit()
 
     LOGGER.info("Dial closed.")
+
+    LogPersistenceSingleton().stop()
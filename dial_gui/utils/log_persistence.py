@@ -0,0 +1,133 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+import dependency_injector.providers as providers
+
+from . import application
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """The JsonLinesFormatter class formats each record as a JSON object on a single
+    line, so the log files can be parsed back (One record per line)."""
+
+    def format(self, record: "logging.LogRecord") -> str:
+        message = record.getMessage()
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        # Records prepared by a QueueHandler already have the traceback on the message
+        if record.exc_text and record.exc_text not in message:
+            message += "\n" + record.exc_text
+
+        return json.dumps(
+            {
+                "time": record.created,
+                "level": record.levelname,
+                "logger": record.name,
+                "thread": record.threadName,
+                "message": message,
+            },
+            ensure_ascii=False,
+        )
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that doesn't modify the records (Before Python 3.8, `prepare`
+    modifies them in place, so the handlers called afterwards get them mangled)."""
+
+    def prepare(self, record: "logging.LogRecord") -> "logging.LogRecord":
+        return super().prepare(copy.copy(record))
+
+
+class LogPersistence:
+    """The LogPersistence class writes the log records to a file (JSON lines, see
+    `JsonLinesFormatter`), rotating it when it reaches `max_bytes`.
+
+    The handler installed on the root logger only puts the records on a queue; they're
+    formatted and written to disk by a QueueListener on its own thread, so logging
+    never blocks on I/O.
+
+    Attributes:
+        log_file: Path of the file where the records are written.
+        max_bytes: Size at which the file is rotated.
+        backup_count: Number of rotated files kept ("dial.jsonl.1", ...).
+
+    Examples:
+        log_persistence = LogPersistence("dial.jsonl")
+        log_persistence.start()
+        ...
+        log_persistence.stop()
+    """
+
+    def __init__(
+        self, log_file: str, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3
+    ):
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self.__queue_handler: Optional["logging.handlers.QueueHandler"] = None
+        self.__queue_listener: Optional["logging.handlers.QueueListener"] = None
+        self.__file_handler: Optional["logging.Handler"] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Checks if the records are being written to the file."""
+        return self.__queue_listener is not None
+
+    def start(self, logger: "logging.Logger" = None):
+        """Starts writing the records of `logger` (The root logger by default). Does
+        nothing if it's already running."""
+        if self.is_running:
+            return
+
+        log_directory = os.path.dirname(self.log_file)
+        if log_directory:
+            os.makedirs(log_directory, exist_ok=True)
+
+        self.__file_handler = logging.handlers.RotatingFileHandler(
+            self.log_file,
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            encoding="utf-8",
+            delay=True,
+        )
+        self.__file_handler.setFormatter(JsonLinesFormatter())
+
+        records_queue: "queue.Queue" = queue.Queue()
+
+        self.__queue_handler = _QueueHandler(records_queue)
+        self.__queue_listener = logging.handlers.QueueListener(
+            records_queue, self.__file_handler
+        )
+        self.__queue_listener.start()
+
+        (logger or logging.getLogger()).addHandler(self.__queue_handler)
+
+    def stop(self, logger: "logging.Logger" = None):
+        """Stops writing the records. The records already queued are written before
+        returning."""
+        if not self.is_running:
+            return
+
+        (logger or logging.getLogger()).removeHandler(self.__queue_handler)
+
+        self.__queue_listener.stop()
+        self.__file_handler.close()
+
+        self.__queue_handler = None
+        self.__queue_listener = None
+        self.__file_handler = None
+
+
+LogPersistenceSingleton = providers.Singleton(
+    LogPersistence, log_file=providers.Callable(application.log_file)
+)
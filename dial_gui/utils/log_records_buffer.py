@@ -0,0 +1,263 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import heapq
+import logging
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional
+
+import dependency_injector.providers as providers
+
+
+class LogEntry(NamedTuple):
+    """A log record stored on a LogRecordsBuffer."""
+
+    sequence: int
+    created: float
+    levelno: int
+    levelname: str
+    name: str
+    message: str
+
+
+class LogRecordsBuffer(logging.Handler):
+    """The LogRecordsBuffer class is a logging handler that keeps the last `capacity`
+    records on a ring buffer, so the memory used is capped regardless of how long the
+    application runs.
+
+    Each record gets a sequence number (increasing, never reused). Indexes of the
+    sequence numbers by level and by logger name are kept updated, so the records can
+    be filtered (See `filtered`) without checking all of them.
+
+    Records can be emitted from any thread.
+
+    Examples:
+        records_buffer = LogRecordsBuffer(capacity=1000)
+        logging.getLogger().addHandler(records_buffer)
+    """
+
+    def __init__(self, capacity: int = 100000):
+        super().__init__()
+
+        self.capacity = capacity
+
+        self.__entries: List[Optional["LogEntry"]] = [None] * capacity
+        self.__search_texts: List[str] = [""] * capacity
+        self.__first_sequence = 0
+        self.__next_sequence = 0
+
+        self.__level_indexes: Dict[int, Deque[int]] = {}
+        self.__logger_indexes: Dict[str, Deque[int]] = {}
+
+    @property
+    def first_sequence(self) -> int:
+        """Returns the sequence number of the oldest record stored."""
+        return self.__first_sequence
+
+    @property
+    def next_sequence(self) -> int:
+        """Returns the sequence number that the next record will have."""
+        return self.__next_sequence
+
+    def __len__(self) -> int:
+        return self.__next_sequence - self.first_sequence
+
+    def entry(self, sequence: int) -> Optional["LogEntry"]:
+        """Returns the record with the sequence number, or None if it isn't stored (It
+        has been discarded)."""
+        with self.lock:
+            if not self.__first_sequence <= sequence < self.__next_sequence:
+                return None
+
+            return self.__entries[sequence % self.capacity]
+
+    def logger_names(self) -> List[str]:
+        """Returns the names of the loggers of the stored records, sorted."""
+        with self.lock:
+            return sorted(self.__logger_indexes.keys())
+
+    def filtered(
+        self,
+        min_level: int = logging.NOTSET,
+        logger_name: str = "",
+        text: str = "",
+        start: int = 0,
+        stop: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[int]:
+        """Returns the sequence numbers (sorted) of the stored records that match all
+        the filters.
+
+        Args:
+            min_level: Minimum level of the records.
+            logger_name: Name of the logger of the records. Records of its child
+                loggers ("name.child") also match.
+            text: Text contained on the message (Case insensitive).
+            start: Only sequence numbers greater or equal than `start` are returned.
+            stop: Only sequence numbers lower than `stop` are returned.
+            limit: If set, only the last `limit` matching sequence numbers are returned.
+        """
+        with self.lock:
+            start = max(start, self.__first_sequence)
+            stop = self.__next_sequence if stop is None else stop
+            stop = min(stop, self.__next_sequence)
+
+            if start >= stop:
+                return []
+
+            candidates: Optional[List[int]] = None
+
+            if min_level > logging.NOTSET:
+                candidates = self.__merge_indexes(
+                    (
+                        index
+                        for (level, index) in self.__level_indexes.items()
+                        if level >= min_level
+                    ),
+                    start,
+                    stop,
+                )
+
+            if logger_name:
+                logger_candidates = self.__merge_indexes(
+                    (
+                        index
+                        for (name, index) in self.__logger_indexes.items()
+                        if name == logger_name or name.startswith(logger_name + ".")
+                    ),
+                    start,
+                    stop,
+                )
+
+                candidates = (
+                    logger_candidates
+                    if candidates is None
+                    else self.__intersect(candidates, logger_candidates)
+                )
+
+            sequences: Iterable[int] = (
+                range(start, stop) if candidates is None else candidates
+            )
+
+            if text:
+                text = text.lower()
+                matches = []
+
+                # From the end, so it can stop as soon as `limit` records are found
+                for sequence in reversed(sequences):
+                    if limit is not None and len(matches) >= limit:
+                        break
+
+                    if text in self.__search_texts[sequence % self.capacity]:
+                        matches.append(sequence)
+
+                matches.reverse()
+
+                return matches
+
+            if limit is not None:
+                sequences = sequences[max(len(sequences) - limit, 0) :]
+
+            return list(sequences)
+
+    def clear(self):
+        """Removes all the stored records."""
+        with self.lock:
+            self.__entries = [None] * self.capacity
+            self.__search_texts = [""] * self.capacity
+            self.__level_indexes.clear()
+            self.__logger_indexes.clear()
+
+            # Sequence numbers are never reused
+            self.__first_sequence = self.__next_sequence
+
+    def emit(self, record: "logging.LogRecord"):
+        """Stores the record, discarding the oldest one if the buffer is full.
+
+        Called by the logging system with the handler lock acquired.
+        """
+        try:
+            message = record.getMessage()
+
+            if record.exc_info:
+                formatter = self.formatter or logging.Formatter()
+                message += "\n" + formatter.formatException(record.exc_info)
+
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
+            return
+
+        sequence = self.__next_sequence
+
+        if sequence - self.__first_sequence >= self.capacity:
+            self.__discard_oldest()
+
+        entry = LogEntry(
+            sequence=sequence,
+            created=record.created,
+            levelno=record.levelno,
+            levelname=record.levelname,
+            name=record.name,
+            message=message,
+        )
+
+        position = sequence % self.capacity
+        self.__entries[position] = entry
+        self.__search_texts[position] = message.lower()
+
+        self.__level_indexes.setdefault(entry.levelno, deque()).append(sequence)
+        self.__logger_indexes.setdefault(entry.name, deque()).append(sequence)
+
+        self.__next_sequence += 1
+
+    def __discard_oldest(self):
+        """Removes the oldest record from the indexes."""
+        entry = self.__entries[self.__first_sequence % self.capacity]
+        self.__first_sequence += 1
+
+        for (indexes, key) in (
+            (self.__level_indexes, entry.levelno),
+            (self.__logger_indexes, entry.name),
+        ):
+            index = indexes[key]
+            index.popleft()
+
+            if not index:
+                del indexes[key]
+
+    @staticmethod
+    def __merge_indexes(
+        indexes: Iterable[Deque[int]], start: int, stop: int
+    ) -> List[int]:
+        """Merges the sequence numbers in [start, stop) of several indexes (sorted).
+
+        The indexes are traversed from the end, so getting only the most recent
+        sequence numbers is fast.
+        """
+        ranges = []
+
+        for index in indexes:
+            index_range = []
+
+            for sequence in reversed(index):
+                if sequence < start:
+                    break
+
+                if sequence < stop:
+                    index_range.append(sequence)
+
+            index_range.reverse()
+            ranges.append(index_range)
+
+        return list(heapq.merge(*ranges))
+
+    @staticmethod
+    def __intersect(sequences_a: List[int], sequences_b: List[int]) -> List[int]:
+        if len(sequences_a) > len(sequences_b):
+            (sequences_a, sequences_b) = (sequences_b, sequences_a)
+
+        sequences_b_set = set(sequences_b)
+
+        return [sequence for sequence in sequences_a if sequence in sequences_b_set]
+
+
+LogRecordsBufferSingleton = providers.Singleton(LogRecordsBuffer)
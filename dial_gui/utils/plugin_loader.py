@@ -0,0 +1,167 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+import dependency_injector.providers as providers
+from dial_core.utils import log
+from dial_gui import startup_profiler
+from PySide2.QtCore import QObject, Signal
+
+from .plugins_index import PluginsIndexSingleton
+
+if TYPE_CHECKING:
+    from dial_core.plugin import Plugin
+
+LOGGER = log.get_logger(__name__)
+
+
+class PluginLoader(QObject):
+    """The PluginLoader class loads plugins without blocking the GUI.
+
+    The modules of the plugins are imported concurrently on a thread pool (Importing
+    is what takes most of the time). Once a plugin module is imported, the plugin is
+    loaded (`Plugin.load`) on the GUI thread, as it registers nodes and other objects
+    used by the GUI.
+
+    Dependencies between plugins (declared on their distributions, read from the
+    `PluginsIndex`) are respected: A plugin isn't imported until all the plugins it
+    depends on have been loaded.
+
+    Signals:
+        plugin_loaded: A plugin has been loaded.
+        plugin_failed: A plugin couldn't be loaded (With the error message).
+        loading_changed: Emitted each time a plugin finishes loading (or fails).
+        finished: All the plugins have been processed.
+    """
+
+    plugin_loaded = Signal(object)
+    plugin_failed = Signal(object, str)
+    loading_changed = Signal()
+    finished = Signal()
+
+    # Emitted from the worker threads
+    _plugin_imported = Signal(object, object)
+
+    def __init__(self, max_workers: Optional[int] = None, parent: "QObject" = None):
+        super().__init__(parent)
+
+        self.__max_workers = max_workers
+        self.__executor: Optional["ThreadPoolExecutor"] = None
+
+        self.__pending: Dict[str, "Plugin"] = {}
+        self.__importing: Dict[str, "Plugin"] = {}
+        self.__dependencies: Dict[str, Set[str]] = {}
+
+        self._plugin_imported.connect(self.__plugin_imported)
+
+    def is_loading(self) -> bool:
+        """Checks if there are plugins still being loaded."""
+        return bool(self.__pending or self.__importing)
+
+    def loading_plugins(self) -> List["Plugin"]:
+        """Returns the plugins that haven't been loaded yet."""
+        return list(self.__importing.values()) + list(self.__pending.values())
+
+    def start(self, plugins: List["Plugin"]):
+        """Starts loading the passed plugins."""
+        for plugin in plugins:
+            self.__pending[plugin.name] = plugin
+
+        for plugin in plugins:
+            self.__dependencies[plugin.name] = self.__plugin_dependencies(plugin)
+
+        if not self.__executor:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.__max_workers, thread_name_prefix="PluginLoader"
+            )
+
+        LOGGER.info("Loading plugins: %s", list(self.__pending.keys()))
+
+        self.__import_ready_plugins()
+
+    def __plugin_dependencies(self, plugin: "Plugin") -> Set[str]:
+        """Returns the names of the plugins being loaded that `plugin` depends on."""
+        requirements = PluginsIndexSingleton().requirements(plugin.name)
+
+        return {
+            requirement for requirement in requirements if requirement in self.__pending
+        }
+
+    def __import_ready_plugins(self):
+        """Submits the import of all the plugins whose dependencies are loaded."""
+        ready_plugins = [
+            plugin
+            for plugin in self.__pending.values()
+            if not self.__dependencies[plugin.name] & self.__not_loaded_names()
+        ]
+
+        if not ready_plugins and self.__pending and not self.__importing:
+            LOGGER.warning(
+                "Circular dependencies between plugins: %s", list(self.__pending)
+            )
+            ready_plugins = list(self.__pending.values())
+
+        for plugin in ready_plugins:
+            del self.__pending[plugin.name]
+            self.__importing[plugin.name] = plugin
+
+            self.__executor.submit(self.__import_plugin_module, plugin)
+
+        if not self.is_loading():
+            LOGGER.info("All plugins loaded.")
+
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+            self.finished.emit()
+
+    def __not_loaded_names(self) -> Set[str]:
+        return set(self.__pending.keys()) | set(self.__importing.keys())
+
+    def __import_plugin_module(self, plugin: "Plugin"):
+        """Imports the module of the plugin, so `plugin.load` doesn't block the GUI
+        thread on the import. (Executed on a worker thread)
+
+        This is only a warm-up: The module name is guessed from the plugin name, so if
+        it can't be imported, the plugin is still loaded by `plugin.load`.
+        """
+        module_name = plugin.name.replace("-", "_")
+
+        try:
+            importlib.import_module(module_name)
+        except ImportError as err:
+            LOGGER.debug("Module %s not pre-imported: %s", module_name, err)
+        except Exception as err:
+            self._plugin_imported.emit(plugin, err)
+            return
+
+        self._plugin_imported.emit(plugin, None)
+
+    def __plugin_imported(self, plugin: "Plugin", error: Optional[Exception]):
+        """Loads the plugin once its module has been imported. (On the GUI thread)"""
+        del self.__importing[plugin.name]
+
+        if error is None:
+            try:
+                with startup_profiler.phase(f"Plugin {plugin.name}"):
+                    plugin.load()
+            except Exception as err:
+                error = err
+
+        if error is None:
+            LOGGER.info("Plugin loaded: %s", plugin.name)
+            self.plugin_loaded.emit(plugin)
+        else:
+            LOGGER.error(
+                "Plugin %s couldn't be loaded: %s", plugin.name, error, exc_info=error
+            )
+            self.plugin_failed.emit(plugin, str(error))
+
+        self.loading_changed.emit()
+
+        self.__import_ready_plugins()
+
+
+PluginLoaderSingleton = providers.Singleton(PluginLoader)
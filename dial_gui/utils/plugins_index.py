@@ -0,0 +1,246 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import dependency_injector.providers as providers
+from dial_core.utils import log
+
+from . import application
+
+if TYPE_CHECKING:
+    import pkg_resources
+
+LOGGER = log.get_logger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+
+_METADATA_DIRECTORY_EXTENSIONS = (".dist-info", ".egg-info")
+
+
+class PluginsIndex:
+    """The PluginsIndex class keeps a cache (a JSON file) with the metadata of the
+    distributions installed on the plugins install directory: Their versions,
+    summaries, requirements and entry points. The version of the application is stored
+    too.
+
+    The cache is invalidated when the modification times of the install directory (or
+    of any of the metadata directories inside it) change, so it's rebuilt each time a
+    plugin is installed, upgraded or removed. While the cache is up to date, the
+    plugins distributions are registered on `pkg_resources` from it, without scanning
+    the install directory.
+
+    `pkg_resources` (slow to import) is only imported when the index has to be rebuilt.
+
+    Attributes:
+        install_directory: Directory where the plugins are installed.
+        index_file: Path of the JSON file with the cached metadata.
+    """
+
+    def __init__(self, install_directory: str, index_file: str):
+        self.install_directory = os.path.abspath(install_directory)
+        self.index_file = index_file
+
+        self.__index: Optional[dict] = None
+        self.__up_to_date: Optional[bool] = None
+
+    def is_up_to_date(self) -> bool:
+        """Checks if the cached index matches the install directory contents."""
+        if self.__up_to_date is None:
+            self.__index = self.__read_index()
+            self.__up_to_date = (
+                self.__index is not None
+                and self.__index.get("format") == INDEX_FORMAT_VERSION
+                and self.__index.get("signature") == self.__signature()
+            )
+
+        return self.__up_to_date
+
+    def invalidate(self):
+        """Forces checking the install directory again the next time the index is used
+        (Call it after installing, upgrading or removing plugins)."""
+        self.__index = None
+        self.__up_to_date = None
+
+    def register_distributions(self, working_set: "pkg_resources.WorkingSet" = None):
+        """Registers the distributions of the install directory on `working_set` (By
+        default, the global `pkg_resources.working_set`).
+
+        If the cached index is up to date, the distributions are created from it.
+        Otherwise, the install directory is scanned and the index is rebuilt.
+
+        If the index is up to date and `pkg_resources` hasn't been imported yet,
+        nothing is registered: Its global working set will find the distributions on
+        `sys.path` when it's imported.
+        """
+        if not self.is_up_to_date():
+            LOGGER.info("Plugins index outdated. Scanning %s", self.install_directory)
+
+            import pkg_resources
+
+            if working_set is None:
+                working_set = pkg_resources.working_set
+
+            working_set.add_entry(self.install_directory)
+            self.rebuild()
+            return
+
+        pkg_resources = sys.modules.get("pkg_resources")
+
+        if working_set is None:
+            if pkg_resources is None:
+                LOGGER.debug(
+                    "pkg_resources not imported. Distributions not registered."
+                )
+                return
+
+            working_set = pkg_resources.working_set
+
+        if self.install_directory not in working_set.entries:
+            working_set.entries.append(self.install_directory)
+
+        for info in self.__index["distributions"].values():
+            metadata_directory = info["metadata_directory"]
+            metadata = pkg_resources.PathMetadata(
+                self.install_directory,
+                os.path.join(self.install_directory, metadata_directory),
+            )
+
+            distribution = pkg_resources.Distribution.from_location(
+                self.install_directory, metadata_directory, metadata
+            )
+            working_set.add(distribution, self.install_directory, insert=False)
+
+        LOGGER.debug(
+            "Plugins distributions registered from the index: %s",
+            list(self.__index["distributions"]),
+        )
+
+    def rebuild(self):
+        """Scans the install directory and writes the index file again."""
+        import pkg_resources
+
+        distributions = {}
+
+        for distribution in pkg_resources.find_distributions(
+            self.install_directory, only=True
+        ):
+            try:
+                distributions[distribution.project_name] = self.__distribution_info(
+                    distribution
+                )
+            except Exception as err:
+                LOGGER.warning("Metadata of %s couldn't be read: %s", distribution, err)
+
+        try:
+            application_version = self.__installed_application_version()
+        except pkg_resources.DistributionNotFound:  # Running from the sources
+            application_version = None
+
+        self.__index = {
+            "format": INDEX_FORMAT_VERSION,
+            "signature": self.__signature(),
+            "application_version": application_version,
+            "distributions": distributions,
+        }
+        self.__up_to_date = True
+
+        temporary_file = self.index_file + ".tmp"
+        with open(temporary_file, "w") as json_file:
+            json.dump(self.__index, json_file, indent=2)
+
+        os.replace(temporary_file, self.index_file)
+
+        LOGGER.info("Plugins index written to %s", self.index_file)
+
+    def distributions(self) -> Dict[str, dict]:
+        """Returns the cached metadata of all the distributions, by project name."""
+        if not self.is_up_to_date():
+            return {}
+
+        return dict(self.__index["distributions"])
+
+    def version(self, name: str) -> Optional[str]:
+        """Returns the version of the `name` distribution, or None if it isn't
+        installed on the plugins install directory."""
+        return self.distributions().get(name, {}).get("version")
+
+    def requirements(self, name: str) -> List[str]:
+        """Returns the project names of the distributions required by `name`."""
+        return self.distributions().get(name, {}).get("requirements", [])
+
+    def entry_points(self, name: str) -> Dict[str, List[str]]:
+        """Returns the entry points of the `name` distribution, by group."""
+        return self.distributions().get(name, {}).get("entry_points", {})
+
+    def application_version(self) -> str:
+        """Returns the version of the application, cached on the index."""
+        if self.is_up_to_date() and self.__index.get("application_version"):
+            return self.__index["application_version"]
+
+        return self.__installed_application_version()
+
+    def __read_index(self) -> Optional[dict]:
+        try:
+            with open(self.index_file) as json_file:
+                return json.load(json_file)
+
+        except FileNotFoundError:
+            return None
+
+        except ValueError as err:
+            LOGGER.warning("Invalid plugins index %s: %s", self.index_file, err)
+            return None
+
+    def __signature(self) -> Dict[str, int]:
+        """Returns the modification times that invalidate the index."""
+        signature = {".": os.stat(self.install_directory).st_mtime_ns}
+
+        for entry in os.scandir(self.install_directory):
+            if entry.name.endswith(_METADATA_DIRECTORY_EXTENSIONS):
+                signature[entry.name] = entry.stat().st_mtime_ns
+
+        # The application is upgraded by replacing its package directory
+        application_directory = os.path.dirname(os.path.dirname(__file__))
+        signature["dial_gui"] = os.stat(application_directory).st_mtime_ns
+
+        return signature
+
+    def __distribution_info(self, distribution: "pkg_resources.Distribution") -> dict:
+        metadata_directory = os.path.basename(distribution.egg_info)
+
+        summary = ""
+        for metadata_file in ("METADATA", "PKG-INFO"):
+            if distribution.has_metadata(metadata_file):
+                for line in distribution.get_metadata_lines(metadata_file):
+                    if line.startswith("Summary: "):
+                        summary = line[len("Summary: ") :]
+                        break
+                break
+
+        return {
+            "version": distribution.version,
+            "summary": summary,
+            "metadata_directory": metadata_directory,
+            "requirements": [
+                requirement.project_name for requirement in distribution.requires()
+            ],
+            "entry_points": {
+                group: [str(entry_point) for entry_point in entry_points.values()]
+                for (group, entry_points) in distribution.get_entry_map().items()
+            },
+        }
+
+    def __installed_application_version(self) -> str:
+        import pkg_resources
+
+        return pkg_resources.get_distribution("dial-gui").version
+
+
+PluginsIndexSingleton = providers.Singleton(
+    PluginsIndex,
+    install_directory=providers.Callable(application.plugins_install_directory),
+    index_file=providers.Callable(application.plugins_index_file),
+)
@@ -13,7 +13,7 @@ from PySide2.QtWidgets import QStackedWidget, QTabBar, QTabWidget, QWidget
 from .tab_settings_dialog import TabSettingsDialog
 
 if TYPE_CHECKING:
-    from dial_gui.project import ProjectManagerGUI
+    from dial_gui.project import ProjectGUI, ProjectManagerGUI
     from dial_gui.node_editor.nodes_windows import NodesWindowsGroup
 
 
@@ -104,6 +104,9 @@ class EditorTabWidget(QStackedWidget):
     """The EditorTabWidget class provides a widget with a default NodeEditorWindow.
 
     It also can display NodePanelsWindow objects on tabs.
+
+    The zoom and center of the editor are stored on each project when another project
+    is activated, and restored when the project is displayed again.
     """
 
     def __init__(
@@ -121,6 +124,8 @@ class EditorTabWidget(QStackedWidget):
         )
         self.__node_editor_window.setParent(self)
 
+        self.__displayed_project: "ProjectGUI" = self.__project_manager.active
+
         self.__new_tabs_widget(self.__project_manager.active.nodes_windows_manager)
         self.setCurrentIndex(0)
 
@@ -130,11 +135,46 @@ class EditorTabWidget(QStackedWidget):
     def node_editor_window(self):
         return self.__node_editor_window
 
-    def __new_tabs_widget(self, nodes_windows_manager):
+    def store_view_state(self):
+        """Stores the current zoom and center of the editor on the displayed project."""
+        if self.__displayed_project:
+            self.__displayed_project.view_state = self.__node_editor_window.view_state()
+
+    def __new_tabs_widget(self, nodes_windows_manager, index: int = -1):
         tabs_widget = CustomTabWidget(
             nodes_windows_manager=nodes_windows_manager, parent=self,
         )
-        self.addWidget(tabs_widget)
+        self.insertWidget(index, tabs_widget)
+
+    def __display_project(self, project: "ProjectGUI"):
+        """Shows the scene of the project on the editor, with its last zoom/center."""
+        if project is self.__displayed_project:
+            return
+
+        self.store_view_state()
+        self.__displayed_project = project
+
+        self.__node_editor_window.change_graphics_scene(project.graphics_scene)
+
+        if project.view_state:
+            self.__node_editor_window.set_view_state(project.view_state)
+
+    def __replace_project(self, stub: "ProjectGUI", project: "ProjectGUI", index: int):
+        """Replaces the tabs of a project stub by the tabs of its loaded project."""
+        if self.__displayed_project is stub:
+            self.store_view_state()
+            project.view_state = stub.view_state
+            self.__displayed_project = None
+
+        old_tabs_widget = self.widget(index)
+
+        # The editor is shared between all the tabs widgets, don't delete it
+        if old_tabs_widget.isAncestorOf(self.__node_editor_window):
+            self.__node_editor_window.setParent(self)
+
+        self.__new_tabs_widget(project.nodes_windows_manager, index)
+        self.removeWidget(old_tabs_widget)
+        old_tabs_widget.deleteLater()
 
     def __setup_connections(self):
         self.__project_manager.project_added.connect(
@@ -146,11 +186,9 @@ class EditorTabWidget(QStackedWidget):
             )
         )
 
-        self.__project_manager.active_project_changed.connect(
-            lambda project: self.__node_editor_window.change_graphics_scene(
-                project.graphics_scene
-            )
-        )
+        self.__project_manager.active_project_changed.connect(self.__display_project)
+
+        self.__project_manager.project_replaced.connect(self.__replace_project)
 
         self.__project_manager.project_removed.connect(
             lambda project, index: self.removeWidget(self.widget(index))
@@ -4,7 +4,17 @@
 This package includes several widgets that can be used to display a logging dialog.
 """
 
-from .logger_dialog import LoggerDialogFactory
+from .log_records_model import LogRecordsModel, LogRecordsModelFactory
+from .log_viewer import LogViewerFactory, LogViewerWidget
+from .logger_dialog import LoggerDialog, LoggerDialogFactory
 from .logger_textbox import LoggerTextboxFactory
 
-__all__ = ["LoggerDialogFactory", "LoggerTextboxFactory"]
+__all__ = [
+    "LogRecordsModel",
+    "LogRecordsModelFactory",
+    "LogViewerWidget",
+    "LogViewerFactory",
+    "LoggerDialog",
+    "LoggerDialogFactory",
+    "LoggerTextboxFactory",
+]
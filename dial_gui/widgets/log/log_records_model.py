@@ -0,0 +1,250 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import bisect
+import logging
+from datetime import datetime
+from enum import IntEnum
+from typing import TYPE_CHECKING, List, Optional
+
+import dependency_injector.providers as providers
+from dial_gui.utils.log_records_buffer import LogRecordsBufferSingleton
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PySide2.QtGui import QColor
+
+if TYPE_CHECKING:
+    from PySide2.QtCore import QObject
+    from dial_gui.utils.log_records_buffer import LogEntry, LogRecordsBuffer
+
+
+class LogRecordsModel(QAbstractTableModel):
+    """The LogRecordsModel class provides a table model with the records of a
+    LogRecordsBuffer that match a filter (level, logger name and text).
+
+    The model only holds the sequence numbers of the matching records. The buffer is
+    polled periodically: New matching records are appended as rows, and the rows of
+    the records discarded by the buffer are removed.
+
+    When the filter changes, only the last `page_size` matching records are loaded.
+    Older records are prepended a page at a time by calling `fetch_older` (For
+    example, when the view is scrolled to the top).
+    """
+
+    class ColumnLabel(IntEnum):
+        Time = 0
+        Level = 1
+        Logger = 2
+        Message = 3
+
+    level_colors = {
+        logging.WARNING: QColor("#B36B00"),
+        logging.ERROR: QColor("#CC0000"),
+        logging.CRITICAL: QColor("#CC0000"),
+    }
+
+    def __init__(
+        self,
+        records_buffer: "LogRecordsBuffer",
+        refresh_interval_ms: int = 200,
+        page_size: int = 1000,
+        parent: "QObject" = None,
+    ):
+        super().__init__(parent)
+
+        self.__records_buffer = records_buffer
+        self.page_size = page_size
+
+        self.__min_level = logging.NOTSET
+        self.__logger_name = ""
+        self.__text = ""
+
+        self.__sequences: List[int] = []
+        self.__next_sequence = 0
+
+        # Every matching record from this sequence number onwards is loaded
+        self.__loaded_sequence = 0
+
+        self.__role_map = {
+            Qt.DisplayRole: self.__data_display_role,
+            Qt.ToolTipRole: self.__data_tooltip_role,
+            Qt.ForegroundRole: self.__data_foreground_role,
+        }
+
+        self.__reload()
+
+        self.__refresh_timer = QTimer(self)
+        self.__refresh_timer.setInterval(refresh_interval_ms)
+        self.__refresh_timer.timeout.connect(self.refresh)
+        self.__refresh_timer.start()
+
+    @property
+    def records_buffer(self) -> "LogRecordsBuffer":
+        """Returns the buffer where the records are read from."""
+        return self.__records_buffer
+
+    def set_filter(
+        self,
+        min_level: Optional[int] = None,
+        logger_name: Optional[str] = None,
+        text: Optional[str] = None,
+    ):
+        """Changes the filter of the records. Only the passed arguments are changed.
+
+        Args:
+            min_level: Minimum level of the records.
+            logger_name: Name of the logger of the records (Or any of its parents).
+            text: Text contained on the message (Case insensitive).
+        """
+        if min_level is not None:
+            self.__min_level = min_level
+
+        if logger_name is not None:
+            self.__logger_name = logger_name
+
+        if text is not None:
+            self.__text = text
+
+        self.__reload()
+
+    def entry(self, row: int) -> Optional["LogEntry"]:
+        """Returns the record on the row, or None if it has been discarded."""
+        return self.__records_buffer.entry(self.__sequences[row])
+
+    def has_older_records(self) -> bool:
+        """Checks if there are matching records older than the loaded ones."""
+        return self.__loaded_sequence > self.__records_buffer.first_sequence
+
+    def fetch_older(self) -> int:
+        """Prepends the previous page of matching records.
+
+        Returns:
+            The number of rows prepended.
+        """
+        if not self.has_older_records():
+            return 0
+
+        older_sequences = self.__load_page(stop=self.__loaded_sequence)
+
+        if older_sequences:
+            self.beginInsertRows(QModelIndex(), 0, len(older_sequences) - 1)
+            self.__sequences[:0] = older_sequences
+            self.endInsertRows()
+
+        return len(older_sequences)
+
+    def refresh(self):
+        """Removes the rows of the discarded records, and appends the new ones."""
+        discarded_rows = bisect.bisect_left(
+            self.__sequences, self.__records_buffer.first_sequence
+        )
+
+        if discarded_rows:
+            self.beginRemoveRows(QModelIndex(), 0, discarded_rows - 1)
+            del self.__sequences[:discarded_rows]
+            self.endRemoveRows()
+
+        next_sequence = self.__records_buffer.next_sequence
+        if next_sequence == self.__next_sequence:
+            return
+
+        new_sequences = self.__filtered(start=self.__next_sequence, stop=next_sequence)
+        self.__next_sequence = next_sequence
+
+        if new_sequences:
+            rows_count = len(self.__sequences)
+
+            self.beginInsertRows(
+                QModelIndex(), rows_count, rows_count + len(new_sequences) - 1
+            )
+            self.__sequences += new_sequences
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self.__sequences)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.ColumnLabel)
+
+    def headerData(
+        self, section: int, orientation: "Qt.Orientation", role=Qt.DisplayRole
+    ) -> Optional[str]:
+        if role != Qt.DisplayRole:
+            return None
+
+        if orientation == Qt.Horizontal:
+            return self.ColumnLabel(section).name
+
+        return None
+
+    def data(self, index: "QModelIndex", role=Qt.DisplayRole):
+        if role in self.__role_map and index.isValid():
+            entry = self.entry(index.row())
+
+            if entry:
+                return self.__role_map[role](entry, index.column())
+
+        return None
+
+    def __reload(self):
+        """Fills the model again with the records that match the filter."""
+        self.beginResetModel()
+
+        self.__next_sequence = self.__records_buffer.next_sequence
+        self.__sequences = self.__load_page(stop=self.__next_sequence)
+
+        self.endResetModel()
+
+    def __load_page(self, stop: int) -> List[int]:
+        """Returns the last `page_size` matching sequence numbers lower than `stop`,
+        and updates the sequence number from which all the records are loaded."""
+        sequences = self.__filtered(stop=stop, limit=self.page_size)
+
+        self.__loaded_sequence = (
+            sequences[0]
+            if len(sequences) >= self.page_size
+            else self.__records_buffer.first_sequence
+        )
+
+        return sequences
+
+    def __filtered(
+        self, start: int = 0, stop: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[int]:
+        return self.__records_buffer.filtered(
+            min_level=self.__min_level,
+            logger_name=self.__logger_name,
+            text=self.__text,
+            start=start,
+            stop=stop,
+            limit=limit,
+        )
+
+    def __data_display_role(self, entry: "LogEntry", column: int) -> Optional[str]:
+        if column == self.ColumnLabel.Time:
+            return datetime.fromtimestamp(entry.created).strftime("%H:%M:%S")
+
+        if column == self.ColumnLabel.Level:
+            return entry.levelname
+
+        if column == self.ColumnLabel.Logger:
+            return entry.name
+
+        if column == self.ColumnLabel.Message:
+            return entry.message.split("\n", 1)[0]
+
+        return None
+
+    def __data_tooltip_role(self, entry: "LogEntry", column: int) -> Optional[str]:
+        if column == self.ColumnLabel.Message:
+            return entry.message
+
+        return None
+
+    def __data_foreground_role(
+        self, entry: "LogEntry", column: int
+    ) -> Optional["QColor"]:
+        return self.level_colors.get(entry.levelno)
+
+
+LogRecordsModelFactory = providers.Factory(
+    LogRecordsModel, records_buffer=LogRecordsBufferSingleton
+)
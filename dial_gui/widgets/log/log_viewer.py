@@ -0,0 +1,160 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import logging
+from typing import TYPE_CHECKING
+
+import dependency_injector.providers as providers
+from PySide2.QtCore import QStringListModel
+from PySide2.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QCompleter,
+    QHBoxLayout,
+    QHeaderView,
+    QLineEdit,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from .log_records_model import LogRecordsModelFactory
+
+if TYPE_CHECKING:
+    from .log_records_model import LogRecordsModel
+
+
+class LogViewerWidget(QWidget):
+    """The LogViewerWidget class displays the records of a LogRecordsModel on a table,
+    with controls for filtering them by level, logger name and text.
+
+    Only the visible rows of the table are painted, so the number of records doesn't
+    affect the performance. While the table is scrolled to the bottom, it follows the
+    new records. When it's scrolled to the top, the older records are paged in.
+    """
+
+    levels = [
+        ("All levels", logging.NOTSET),
+        ("Debug", logging.DEBUG),
+        ("Info", logging.INFO),
+        ("Warning", logging.WARNING),
+        ("Error", logging.ERROR),
+        ("Critical", logging.CRITICAL),
+    ]
+
+    def __init__(self, records_model: "LogRecordsModel", parent: "QWidget" = None):
+        super().__init__(parent)
+
+        self.__records_model = records_model
+        self.__records_model.setParent(self)
+
+        # Filters
+        self.__level_combobox = QComboBox()
+        for (name, level) in self.levels:
+            self.__level_combobox.addItem(name, level)
+        self.__level_combobox.currentIndexChanged.connect(self.__level_changed)
+
+        self.__logger_names_model = QStringListModel(self)
+
+        logger_completer = QCompleter(self.__logger_names_model, self)
+        logger_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+
+        self.__logger_lineedit = QLineEdit()
+        self.__logger_lineedit.setPlaceholderText("Logger")
+        self.__logger_lineedit.setCompleter(logger_completer)
+        self.__logger_lineedit.setClearButtonEnabled(True)
+        self.__logger_lineedit.textChanged.connect(
+            lambda text: self.__records_model.set_filter(logger_name=text.strip())
+        )
+
+        self.__text_lineedit = QLineEdit()
+        self.__text_lineedit.setPlaceholderText("Search")
+        self.__text_lineedit.setClearButtonEnabled(True)
+        self.__text_lineedit.textChanged.connect(
+            lambda text: self.__records_model.set_filter(text=text)
+        )
+
+        # Table
+        self.__table_view = QTableView()
+        self.__table_view.setModel(self.__records_model)
+        self.__table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.__table_view.setWordWrap(False)
+        self.__table_view.setShowGrid(False)
+        self.__table_view.verticalHeader().hide()
+        self.__table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.__table_view.verticalHeader().setDefaultSectionSize(
+            self.fontMetrics().height() + 4
+        )
+        self.__table_view.horizontalHeader().setStretchLastSection(True)
+
+        for (column, width) in zip(self.__records_model.ColumnLabel, (70, 70, 200)):
+            self.__table_view.setColumnWidth(column, width)
+
+        self.__follow_new_records = True
+
+        self.__records_model.rowsAboutToBeInserted.connect(self.__store_scroll_state)
+        self.__records_model.rowsInserted.connect(self.__records_inserted)
+        self.__records_model.modelReset.connect(self.__table_view.scrollToBottom)
+
+        self.__table_view.verticalScrollBar().valueChanged.connect(
+            self.__scroll_value_changed
+        )
+
+        # Layout
+        filters_layout = QHBoxLayout()
+        filters_layout.addWidget(self.__level_combobox)
+        filters_layout.addWidget(self.__logger_lineedit)
+        filters_layout.addWidget(self.__text_lineedit, 1)
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addLayout(filters_layout)
+        main_layout.addWidget(self.__table_view)
+
+        self.setLayout(main_layout)
+
+        self.__update_logger_names()
+        self.__table_view.scrollToBottom()
+
+    @property
+    def records_model(self) -> "LogRecordsModel":
+        """Returns the model with the displayed records."""
+        return self.__records_model
+
+    def __level_changed(self, index: int):
+        self.__records_model.set_filter(min_level=self.__level_combobox.itemData(index))
+
+    def __scroll_value_changed(self, value: int):
+        scroll_bar = self.__table_view.verticalScrollBar()
+
+        if value != scroll_bar.minimum() or value == scroll_bar.maximum():
+            return
+
+        fetched_rows = self.__records_model.fetch_older()
+
+        if fetched_rows:
+            # Keep the previously first row on the top of the view
+            self.__table_view.scrollTo(
+                self.__records_model.index(fetched_rows, 0),
+                QAbstractItemView.PositionAtTop,
+            )
+
+    def __store_scroll_state(self):
+        scroll_bar = self.__table_view.verticalScrollBar()
+        self.__follow_new_records = scroll_bar.value() == scroll_bar.maximum()
+
+    def __records_inserted(self):
+        self.__update_logger_names()
+
+        if self.__follow_new_records:
+            self.__table_view.scrollToBottom()
+
+    def __update_logger_names(self):
+        logger_names = self.__records_model.records_buffer.logger_names()
+
+        if logger_names != self.__logger_names_model.stringList():
+            self.__logger_names_model.setStringList(logger_names)
+
+
+LogViewerFactory = providers.Factory(
+    LogViewerWidget, records_model=LogRecordsModelFactory
+)
@@ -1,9 +1,12 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
 import logging
+from collections import deque
+from typing import Deque, Optional
 
 import dependency_injector.providers as providers
 from dial_core.utils import log
+from PySide2.QtCore import QTimer
 from PySide2.QtWidgets import QPlainTextEdit, QVBoxLayout, QWidget
 
 
@@ -11,17 +14,37 @@ class LoggerTextboxWidget(logging.Handler, QWidget):
     """The LoggerTextboxWidget class provides a textbox widget that can also work as a
     logging handler for the Python logging system.
 
+    Records can be emitted from any thread: They're formatted and pushed to a queue,
+    which is drained on the GUI thread by a timer. Each tick appends up to
+    `max_lines_per_flush` lines to the textbox in a single insert, so the maximum rate
+    is `max_lines_per_flush` lines every `flush_interval_ms`.
+
+    If the lines are emitted faster than that for a long time, only the latest
+    `max_pending_lines` pending lines are kept.
+
     Examples:
         textbox_logger = LoggerTextboxWidget()
         logging.getLogger().addHandler(textbox_logger)
     """
 
-    def __init__(self, formatter: "logging.Formatter", parent: QWidget = None):
+    def __init__(
+        self,
+        formatter: "logging.Formatter",
+        flush_interval_ms: int = 100,
+        max_lines_per_flush: int = 500,
+        max_pending_lines: Optional[int] = 100000,
+        parent: QWidget = None,
+    ):
         logging.Handler.__init__(self)
         QWidget.__init__(self, parent)
 
         self.setFormatter(formatter)
 
+        self.max_lines_per_flush = max_lines_per_flush
+
+        # Appending/popping from a deque is atomic, so no lock is needed
+        self.__pending_lines: Deque[str] = deque(maxlen=max_pending_lines)
+
         self._textbox = QPlainTextEdit(self)
         self._textbox.setReadOnly(True)
 
@@ -30,20 +53,42 @@ class LoggerTextboxWidget(logging.Handler, QWidget):
         layout.addWidget(self._textbox)
         self.setLayout(layout)
 
+        self.__flush_timer = QTimer(self)
+        self.__flush_timer.setInterval(flush_interval_ms)
+        self.__flush_timer.timeout.connect(
+            lambda: self.__append_pending_lines(self.max_lines_per_flush)
+        )
+        self.__flush_timer.start()
+
     @property
     def text(self) -> str:
-        """Returns the text written on the textbox."""
+        """Returns the text written on the textbox (Including the pending lines)."""
+        self.__append_pending_lines()
+
         return self._textbox.toPlainText()
 
     def set_plain_text(self, text: str):
-        """Replaces the textbox content with `text`."""
+        """Replaces the textbox content with `text`. Pending lines are discarded."""
+        self.__pending_lines.clear()
+
         self._textbox.setPlainText(text)
 
     def emit(self, record):
-        """This method is called each time a logger emits a message. It applies the
-        corresponding format and sends it to the textbox."""
+        """This method is called each time a logger emits a message (From any thread).
+        It applies the corresponding format and queues it for the textbox."""
         msg = self.format(record)
-        self._textbox.appendPlainText(msg)
+        self.__pending_lines.append(msg)
+
+    def __append_pending_lines(self, max_lines: int = None):
+        """Appends (at most `max_lines`) pending lines to the textbox, in one insert.
+        Must be called from the GUI thread."""
+        lines = []
+
+        while self.__pending_lines and (max_lines is None or len(lines) < max_lines):
+            lines.append(self.__pending_lines.popleft())
+
+        if lines:
+            self._textbox.appendPlainText("\n".join(lines))
 
 
 LoggerTextboxFactory = providers.Factory(LoggerTextboxWidget, formatter=log.FORMATTER)
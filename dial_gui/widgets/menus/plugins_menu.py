@@ -1,6 +1,6 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional
 
 import dependency_injector.providers as providers
 from dial_gui.utils import application
@@ -17,15 +17,20 @@ if TYPE_CHECKING:
 class PluginsMenu(QMenu):
     """The PluginsMenu class provides a menu with all the options for the Plugins
     system, like popup the Plugins Dialog.
+
+    The plugin manager dialog is created the first time it's shown.
     """
 
     def __init__(
-        self, plugin_manager_dialog: "PluginManagerDialog", parent: "QWidget" = None
+        self,
+        plugin_manager_dialog_factory: Callable[[], "PluginManagerDialog"],
+        parent: "QWidget" = None,
     ):
         super().__init__("&Plugins", parent)
 
         # Components
-        self.__plugin_manager_dialog = plugin_manager_dialog
+        self.__plugin_manager_dialog_factory = plugin_manager_dialog_factory
+        self.__plugin_manager_dialog: Optional["PluginManagerDialog"] = None
 
         # Actions
         self._open_plugin_manager_act = QAction("Open plugin manager...", self)
@@ -43,6 +48,9 @@ class PluginsMenu(QMenu):
 
     def __show_plugin_manager(self):
         """Display the plugins manager window."""
+        if not self.__plugin_manager_dialog:
+            self.__plugin_manager_dialog = self.__plugin_manager_dialog_factory()
+
         self.__plugin_manager_dialog.show()
 
     def __open_plugins_directory(self):
@@ -60,5 +68,5 @@ class PluginsMenu(QMenu):
 
 
 PluginsMenuFactory = providers.Factory(
-    PluginsMenu, plugin_manager_dialog=PluginManagerDialogFactory
+    PluginsMenu, plugin_manager_dialog_factory=PluginManagerDialogFactory.delegate()
 )
@@ -17,7 +17,11 @@ LOGGER = log.get_logger(__name__)
 
 class ProjectsMenu(QMenu):
     """The ProjectsMenu class provides a menu with all the currently active project, and
-    allows changing between them when clicking."""
+    allows changing between them when clicking.
+
+    Projects that haven't been loaded yet (stubs restored from the last session) are
+    marked as "not loaded".
+    """
 
     def __init__(
         self, project_manager: "ProjectManagerGUI", parent: "QWidget" = None
@@ -36,11 +40,13 @@ class ProjectsMenu(QMenu):
         self.__project_manager.project_removed.connect(
             lambda: self.__generate_menu_from_projects()
         )
+        self.__project_manager.project_replaced.connect(
+            lambda: self.__generate_menu_from_projects()
+        )
 
         # Actions
         self.__projects_actions_group = QActionGroup(self)
         self.__generate_menu_from_projects()
-        self.__set_active_project(self.__project_manager.active)
 
     def mouseReleaseEvent(self, event):
         """Ignores right clicks on the QMenu (Avoids unintentional clicks)"""
@@ -55,10 +61,15 @@ class ProjectsMenu(QMenu):
         for project in self.__project_manager.projects:
             self.__add_project_to_menu(project)
 
+        if self.__project_manager.active in self.__project_manager.projects:
+            self.__set_active_project(self.__project_manager.active)
+
     def __add_project_to_menu(self, project: "Project"):
         """Creates a new entry for the passed project. Clicking on the project will make
         it the active project on the project manager."""
-        project_action = QAction(project.name, self)
+        name = f"{project.name} (not loaded)" if project.is_stub else project.name
+
+        project_action = QAction(name, self)
         project_action.setCheckable(True)
 
         index = self.__project_manager.projects.index(project)
@@ -1,35 +1,49 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional
 
 import dependency_injector.providers as providers
 from dial_gui.widgets.log import LoggerDialogFactory
-from dial_gui.widgets.notebook_editor import (
-    NotebookEditorDialog,
-    NotebookEditorDialogFactory,
-)
 from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QAction, QMenu
 
 if TYPE_CHECKING:
     from dial_gui.widgets.log import LoggerDialog
+    from dial_gui.widgets.notebook_editor import NotebookEditorDialog
     from PySide2.QtWidgets import QWidget
 
 
+def create_notebook_editor_dialog() -> "NotebookEditorDialog":
+    """Creates a new NotebookEditorDialog.
+
+    The notebook editor imports QtWebEngine (And creating it starts the Chromium
+    process), so it's only imported when the dialog is created.
+    """
+    from dial_gui.widgets.notebook_editor import NotebookEditorDialogFactory
+
+    return NotebookEditorDialogFactory()
+
+
 class WindowsMenu(QMenu):
     """The WindowsMenu class providers a menu with some windows (dialogs) that can be
-    pop up. For example, a window with all the log."""
+    pop up. For example, a window with all the log.
+
+    The dialogs are created the first time they're shown.
+    """
 
     def __init__(
         self,
-        logger_dialog: "LoggerDialog",
-        notebook_editor_dialog: "NotebookEditorDialog",
+        logger_dialog_factory: Callable[[], "LoggerDialog"],
+        notebook_editor_dialog_factory: Callable[[], "NotebookEditorDialog"],
         parent: "QWidget" = None,
     ):
         super().__init__("&Windows", parent)
 
-        self.__logger_dialog = logger_dialog
-        self.__notebook_editor_dialog = notebook_editor_dialog
+        self.__logger_dialog_factory = logger_dialog_factory
+        self.__logger_dialog: Optional["LoggerDialog"] = None
+
+        self.__notebook_editor_dialog_factory = notebook_editor_dialog_factory
+        self.__notebook_editor_dialog: Optional["NotebookEditorDialog"] = None
 
         self._show_log_act = QAction("Show log", self)
         self._show_log_act.triggered.connect(self.__toggle_logger_dialog)
@@ -51,15 +65,21 @@ class WindowsMenu(QMenu):
 
     def __toggle_logger_dialog(self):
         """Shows the log dialog window."""
+        if not self.__logger_dialog:
+            self.__logger_dialog = self.__logger_dialog_factory()
+
         self.__logger_dialog.show()
 
     def __toggle_notebook_editor_dialog(self):
         """Shows the notebook editor window."""
+        if not self.__notebook_editor_dialog:
+            self.__notebook_editor_dialog = self.__notebook_editor_dialog_factory()
+
         self.__notebook_editor_dialog.show()
 
 
 WindowsMenuFactory = providers.Factory(
     WindowsMenu,
-    logger_dialog=LoggerDialogFactory,
-    notebook_editor_dialog=NotebookEditorDialogFactory,
+    logger_dialog_factory=LoggerDialogFactory.delegate(),
+    notebook_editor_dialog_factory=create_notebook_editor_dialog,
 )
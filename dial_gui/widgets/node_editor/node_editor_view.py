@@ -72,6 +72,18 @@ class NodeEditorView(QGraphicsView):
         """Toggles if the view can be zoomed or not with the mouse wheel."""
         self.__toggle_event_filter(toggle, self.__zoom_event_filter)
 
+    def view_state(self) -> dict:
+        """Returns the zoom and the center (in scene coordinates) of the view."""
+        center = self.mapToScene(self.viewport().rect().center())
+
+        return {"zoom": self.transform().m11(), "center": [center.x(), center.y()]}
+
+    def set_view_state(self, view_state: dict):
+        """Restores a zoom and center returned by `view_state`."""
+        self.resetTransform()
+        self.scale(view_state["zoom"], view_state["zoom"])
+        self.centerOn(*view_state["center"])
+
     def mousePressEvent(self, event: "QMouseEvent"):
         if event.button() == self.__panning_event_filter.button_used_for_panning:
             event.ignore()
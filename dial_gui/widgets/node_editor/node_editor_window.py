@@ -42,6 +42,14 @@ class NodeEditorWindow(QWidget):
         self.__graphics_scene = new_graphics_scene
         self.__node_editor_view.setScene(self.__graphics_scene)
 
+    def view_state(self) -> dict:
+        """Returns the zoom and center of the view (See `NodeEditorView.view_state`)"""
+        return self.__node_editor_view.view_state()
+
+    def set_view_state(self, view_state: dict):
+        """Restores the zoom and center of the view."""
+        self.__node_editor_view.set_view_state(view_state)
+
 
 NodeEditorWindowFactory = providers.Factory(
     NodeEditorWindow,
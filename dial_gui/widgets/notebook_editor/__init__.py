@@ -3,10 +3,12 @@
 
 from .notebook_editor_dialog import NotebookEditorDialog, NotebookEditorDialogFactory
 from .notebook_editor_widget import NotebookEditorWidget, NotebookEditorWidgetFactory
+from .notebook_preview_view import NotebookPreviewView
 
 __all__ = [
     "NotebookEditorDialog",
     "NotebookEditorDialogFactory",
     "NotebookEditorWidget",
     "NotebookEditorWidgetFactory",
+    "NotebookPreviewView",
 ]
@@ -1,21 +1,71 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
+import copy
+import os
+from typing import List, Optional, Sequence, Tuple
+
 import dependency_injector.providers as providers
-from dial_core.notebook import NotebookProjectGenerator, NotebookProjectGeneratorFactory
+from dial_core.utils import log
+from dial_gui.notebook import (
+    ExportTarget,
+    IncrementalNotebookGenerator,
+    IncrementalNotebookGeneratorFactory,
+    NotebookExportJob,
+    NotebookHTMLWorker,
+    NotebookKernelRunner,
+    notebooks_directory,
+    output_to_html,
+)
 from dial_gui.project import ProjectGUI, ProjectManagerGUI, ProjectManagerGUISingleton
-from PySide2.QtWebEngineWidgets import QWebEngineView
-from PySide2.QtWidgets import QPushButton, QVBoxLayout, QWidget
+from PySide2.QtCore import Qt, QTimer
+from PySide2.QtWidgets import (
+    QCheckBox,
+    QFileDialog,
+    QHBoxLayout,
+    QMenu,
+    QProgressBar,
+    QPushButton,
+    QToolButton,
+    QVBoxLayout,
+    QWidget,
+)
+
+from .notebook_preview_view import NotebookPreviewView
 
-from nbconvert import HTMLExporter
+LOGGER = log.get_logger(__name__)
 
 
 class NotebookEditorWidget(QWidget):
     """The NotebookEditorWidget class provides an interface for visualizing the graph as
-    a Jupyter Notebook, HTML rendered."""
+    a Jupyter Notebook, HTML rendered.
+
+    The notebook is converted to HTML on a worker thread. While the conversion is
+    running, a busy indicator is shown.
+
+    On live preview mode, the notebook is regenerated automatically when the graph of
+    the active project changes. Changes are coalesced: the notebook is generated once,
+    `live_preview_delay_ms` milliseconds after the last change.
+
+    The preview is generated in memory. Notebooks are only written to disk when
+    exported explicitly, on a background thread. Exporting to the project folder
+    writes all the `export_targets` formats inside the `notebooks` folder of the
+    project.
+
+    The notebook can also be executed on a local Jupyter kernel (on its own process).
+    The outputs of the cells are displayed on the preview as they're received.
+
+    Generating the notebook materializes the (deferred) inner widgets of the nodes, so
+    it's only generated automatically while the widget is visible. Otherwise, the
+    notebook is marked as outdated and generated when the widget is shown.
+    """
+
+    live_preview_delay_ms = 500
+
+    export_targets = [ExportTarget.Notebook, ExportTarget.HTML, ExportTarget.Script]
 
     def __init__(
         self,
-        notebook_generator: "NotebookProjectGenerator",
+        notebook_generator: "IncrementalNotebookGenerator",
         project_manager: "ProjectManagerGUI",
         parent: "QWidget" = None,
     ):
@@ -25,57 +75,379 @@ class NotebookEditorWidget(QWidget):
         self._project_manager = project_manager
         self._notebook_generator = notebook_generator
 
+        self._html_worker = NotebookHTMLWorker(parent=self)
+        self._html_worker.fragments_ready.connect(self._set_fragments)
+        self._html_worker.failed.connect(self._generation_failed)
+
         self._project_manager.active_project_changed.connect(self._set_active_project)
 
+        self._observed_project: Optional["ProjectGUI"] = None
+
+        # The notebook doesn't belong to the current state of the active project
+        self._notebook_outdated = False
+
+        self._live_preview_timer = QTimer(self)
+        self._live_preview_timer.setSingleShot(True)
+        self._live_preview_timer.setInterval(self.live_preview_delay_ms)
+        self._live_preview_timer.timeout.connect(self._generate_html_if_visible)
+
+        self._export_jobs: List["NotebookExportJob"] = []
+
+        # Exports requested while the project was still loading
+        self._pending_exports: List[Sequence[Tuple[str, "ExportTarget"]]] = []
+
+        self._kernel_runner: Optional["NotebookKernelRunner"] = None
+        self._execute_request_id = 0
+
         # Widgets
-        self._text_browser = QWebEngineView()
-        self._text_browser.show()
+        self._preview_view = NotebookPreviewView()
+        self._preview_view.show()
+
+        self._busy_indicator = QProgressBar()
+        self._busy_indicator.setRange(0, 0)
+        self._busy_indicator.setTextVisible(False)
+        self._busy_indicator.setMaximumHeight(5)
+        self._busy_indicator.hide()
 
         self._generate_notebook_button = QPushButton("Generate Notebook")
         self._generate_notebook_button.clicked.connect(self._generate_html)
 
+        self._live_preview_checkbox = QCheckBox("Live preview")
+        self._live_preview_checkbox.toggled.connect(self.set_live_preview)
+
+        self._export_menu = QMenu(self)
+        self._export_menu.addAction("To project folder").triggered.connect(
+            self.export_to_project_folder
+        )
+        self._export_menu.addSeparator()
+        self._export_menu.addAction("As Notebook (.ipynb)...").triggered.connect(
+            lambda: self.export_as(ExportTarget.Notebook)
+        )
+        self._export_menu.addAction("As HTML (.html)...").triggered.connect(
+            lambda: self.export_as(ExportTarget.HTML)
+        )
+        self._export_menu.addAction("As Python script (.py)...").triggered.connect(
+            lambda: self.export_as(ExportTarget.Script)
+        )
+
+        self._execute_button = QPushButton("Execute")
+        self._execute_button.clicked.connect(self.execute_notebook)
+
+        self._interrupt_button = QPushButton("Interrupt")
+        self._interrupt_button.setEnabled(False)
+        self._interrupt_button.clicked.connect(self.interrupt_execution)
+
+        self._export_button = QToolButton()
+        self._export_button.setText("Export")
+        self._export_button.setPopupMode(QToolButton.InstantPopup)
+        self._export_button.setMenu(self._export_menu)
+
         # Layout
         self._main_layout = QVBoxLayout()
         self._main_layout.setContentsMargins(0, 0, 0, 0)
-        self._main_layout.addWidget(self._text_browser)
-        self._main_layout.addWidget(self._generate_notebook_button)
+        self._main_layout.addWidget(self._preview_view)
+        self._main_layout.addWidget(self._busy_indicator)
+
+        self._buttons_layout = QHBoxLayout()
+        self._buttons_layout.addWidget(self._generate_notebook_button, 1)
+        self._buttons_layout.addWidget(self._live_preview_checkbox)
+        self._buttons_layout.addWidget(self._execute_button)
+        self._buttons_layout.addWidget(self._interrupt_button)
+        self._buttons_layout.addWidget(self._export_button)
+
+        self._main_layout.addLayout(self._buttons_layout)
 
         self.setLayout(self._main_layout)
 
         # Set active project and generate notebook
         self._set_active_project(self._project_manager.active)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+
+        if self._notebook_outdated:
+            self._generate_html()
+
+    def is_live_preview(self) -> bool:
+        """Checks if the notebook is regenerated automatically on graph changes."""
+        return self._live_preview_checkbox.isChecked()
+
+    def set_live_preview(self, toggled: bool):
+        """Enables/Disables regenerating the notebook when the graph changes."""
+        self._live_preview_checkbox.setChecked(toggled)
+
+        if toggled:
+            self._observe_project(self._notebook_generator.get_project())
+            self._schedule_generation()
+        else:
+            self._observe_project(None)
+            self._live_preview_timer.stop()
+
+    def is_executing(self) -> bool:
+        """Checks if the notebook is being executed on a kernel."""
+        return self._kernel_runner is not None
+
+    def execute_notebook(self):
+        """Regenerates the notebook and executes it on a background kernel. The cells
+        are executed once the preview displays the regenerated notebook."""
+        if self.is_executing():
+            return
+
+        self._execute_request_id = self._generate_html()
+
+        self._execute_button.setEnabled(False)
+
+    def interrupt_execution(self):
+        """Interrupts the notebook execution."""
+        if self._kernel_runner:
+            self._kernel_runner.interrupt()
+
+    def _start_kernel_runner(self):
+        self._preview_view.clear_outputs()
+
+        # The notebook displayed on the preview (A copy, as the live preview can
+        # regenerate it while the kernel is starting)
+        self._kernel_runner = NotebookKernelRunner(
+            copy.deepcopy(self._notebook_generator.notebook), parent=self
+        )
+        self._kernel_runner.cell_started.connect(
+            lambda index: self._preview_view.set_cell_status(index, "Running...")
+        )
+        self._kernel_runner.cell_output.connect(
+            lambda index, output: self._preview_view.append_cell_output(
+                index, output_to_html(output)
+            )
+        )
+        self._kernel_runner.cell_finished.connect(
+            lambda index, elapsed_ms: self._preview_view.set_cell_status(
+                index, f"Executed in {int(elapsed_ms)} ms"
+            )
+        )
+        self._kernel_runner.failed.connect(
+            lambda error: LOGGER.error("Notebook execution failed: %s", error)
+        )
+        self._kernel_runner.finished.connect(self._kernel_runner_finished)
+
+        self._interrupt_button.setEnabled(True)
+
+        self._kernel_runner.start()
+
+    def _kernel_runner_finished(self):
+        self._kernel_runner.deleteLater()
+        self._kernel_runner = None
+
+        self._execute_button.setEnabled(True)
+        self._interrupt_button.setEnabled(False)
+
+    def export_as(self, target: "ExportTarget"):
+        """Asks for a file path and exports the notebook to the `target` format."""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export notebook",
+            self._default_export_directory(),
+            f"{target.name} (*.{target.value})",
+        )
+
+        if not file_path:
+            return
+
+        if not file_path.endswith(f".{target.value}"):
+            file_path += f".{target.value}"
+
+        self._start_export_job([(file_path, target)])
+
+    def export_to_project_folder(self):
+        """Exports the notebook, in all the `export_targets` formats, to the notebooks
+        folder of the active project."""
+        project = self._notebook_generator.get_project()
+        if not project:
+            return
+
+        directory = self._default_export_directory()
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as err:
+            LOGGER.warning("Can't create the notebooks folder %s: %s", directory, err)
+            return
+
+        self._start_export_job(
+            [
+                (os.path.join(directory, f"{project.name}.{target.value}"), target)
+                for target in self.export_targets
+            ]
+        )
+
+    def _default_export_directory(self) -> str:
+        """Returns the notebooks folder of the active project (or of the current
+        directory, if the project hasn't been saved yet)."""
+        project = self._notebook_generator.get_project()
+
+        project_directory = (
+            project.directory() if project and project.file_path else os.getcwd()
+        )
+
+        return notebooks_directory(project_directory)
+
+    def _start_export_job(self, exports: Sequence[Tuple[str, "ExportTarget"]]):
+        """Regenerates the notebook and exports it on a background thread."""
+        if self._wait_for_loading():
+            self._pending_exports.append(exports)
+            return
+
+        self._update_notebook()
+
+        # The live preview can regenerate the notebook while it's being exported
+        export_job = NotebookExportJob(
+            copy.deepcopy(self._notebook_generator.notebook), exports, parent=self
+        )
+        export_job.finished.connect(lambda: self._export_job_finished(export_job))
+
+        self._export_jobs.append(export_job)
+        export_job.start()
+
+    def _export_job_finished(self, export_job: "NotebookExportJob"):
+        self._export_jobs.remove(export_job)
+        export_job.deleteLater()
+
     def _set_active_project(self, project: "ProjectGUI"):
         """Sets a new active project for this notebook generator."""
         if project is not self._notebook_generator.get_project():
             self._notebook_generator.set_project(project)
+            self._generate_html_if_visible()
+
+            if self.is_live_preview():
+                self._observe_project(project)
+
+    def _observe_project(self, project: Optional["ProjectGUI"]):
+        """Starts listening to the graph changes of `project` (instead of the changes
+        of the previously observed project)."""
+        if self._observed_project:
+            self._observed_project.graphics_scene.graph_changed.disconnect(
+                self._schedule_generation
+            )
+
+        self._observed_project = project
+
+        if self._observed_project:
+            self._observed_project.graphics_scene.graph_changed.connect(
+                self._schedule_generation
+            )
+
+    def _schedule_generation(self):
+        """(Re)starts the timer that regenerates the notebook on live preview mode."""
+        self._live_preview_timer.start()
+
+    def _generate_html_if_visible(self):
+        """Regenerates the notebook only if the widget is visible and the project has
+        finished loading. Otherwise, it's marked as outdated, and regenerated once the
+        widget is shown (See `showEvent`)."""
+        project = self._notebook_generator.get_project()
+
+        if self.isVisible() and not (project and project.graphics_scene.is_loading()):
             self._generate_html()
+        else:
+            self._notebook_outdated = True
 
-    def _generate_html(self):
-        """Fills the html viewer with the jupyter notebook html."""
-        self._notebook_generator.update_project_changes()
+    def _generate_html(self) -> int:
+        """Requests the html of the jupyter notebook to the worker thread.
+
+        The cells are generated on the GUI thread (they're created from the state of the
+        nodes and its widgets), but the (slow) html conversion is done on the worker,
+        which only renders the cells of the nodes that changed.
+        A new request cancels any previous request not finished yet.
+
+        If the nodes of the project are still being added to the scene, the request is
+        made once the loading finishes (See `_wait_for_loading`).
 
-        notebook = self._notebook_generator.notebook
+        Returns:
+            The id of the request.
+        """
+        self._live_preview_timer.stop()
+        self._notebook_outdated = False
 
-        html_exporter = HTMLExporter()
+        if self._wait_for_loading():
+            self._set_busy(True)
 
-        (body, resources) = html_exporter.from_notebook_node(notebook)
+            # The id that the request will have
+            return self._html_worker.last_request_id + 1
 
-        html_content = (
-            f'<html><style type="text/css">{resources["inlining"]["css"][0]}'
-            f"</style><body>{body}</body></html>"
+        self._update_notebook()
+
+        request_id = self._html_worker.request(self._notebook_generator.cells_blocks())
+        self._set_busy(True)
+
+        return request_id
+
+    def _wait_for_loading(self) -> bool:
+        """Checks if the nodes of the active project are still being added to its
+        scene. If so, the notebook is generated (and the pending exports are started)
+        once the loading finishes, instead of forcing it to finish now.
+        """
+        project = self._notebook_generator.get_project()
+
+        if not project or not project.graphics_scene.is_loading():
+            return False
+
+        project.graphics_scene.loading_finished.connect(
+            self._project_loading_finished, Qt.UniqueConnection
         )
 
-        with open("file.html", "w") as html_file:
-            html_file.write(html_content)
+        return True
 
-        self._notebook_generator.save_notebook_as("nb.ipynb")
+    def _project_loading_finished(self):
+        if self._execute_request_id:
+            self._generate_html()
+        else:
+            self._generate_html_if_visible()
 
-        self._text_browser.setHtml(html_content)
+        pending_exports = self._pending_exports
+        self._pending_exports = []
+
+        for exports in pending_exports:
+            self._start_export_job(exports)
+
+    def _update_notebook(self):
+        """Regenerates the cells of the notebook from the active project."""
+        project = self._notebook_generator.get_project()
+        if project:
+            # The cells of the nodes are generated from the state of their widgets
+            project.graphics_scene.materialize_inner_widgets()
+
+        self._notebook_generator.update_project_changes()
+
+    def _set_fragments(self, request_id: int, css: str, fragments: list):
+        """Fills the html viewer with the jupyter notebook html fragments."""
+        if request_id != self._html_worker.last_request_id:
+            return
+
+        self._preview_view.set_fragments(css, fragments)
+        self._set_busy(False)
+
+        if self._execute_request_id and request_id >= self._execute_request_id:
+            self._execute_request_id = 0
+            self._start_kernel_runner()
+
+    def _generation_failed(self, request_id: int, error: str):
+        if request_id != self._html_worker.last_request_id:
+            return
+
+        self._set_busy(False)
+
+        if self._execute_request_id and request_id >= self._execute_request_id:
+            self._execute_request_id = 0
+            self._execute_button.setEnabled(True)
+
+    def _set_busy(self, busy: bool):
+        """Shows/Hides the busy indicator while the notebook is being generated."""
+        self._busy_indicator.setVisible(busy)
+        self._generate_notebook_button.setText(
+            "Generating Notebook..." if busy else "Generate Notebook"
+        )
 
 
 NotebookEditorWidgetFactory = providers.Factory(
     NotebookEditorWidget,
-    notebook_generator=NotebookProjectGeneratorFactory,
+    notebook_generator=IncrementalNotebookGeneratorFactory,
     project_manager=ProjectManagerGUISingleton,
 )
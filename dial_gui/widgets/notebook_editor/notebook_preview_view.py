@@ -0,0 +1,213 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import json
+from typing import List, Optional, Set, Tuple
+
+from dial_core.utils import log
+from PySide2.QtWebEngineWidgets import QWebEngineView
+from PySide2.QtWidgets import QWidget
+
+LOGGER = log.get_logger(__name__)
+
+_SHELL_SCRIPT = """
+function dialPatchNotebook(update) {
+    var container = document.getElementById("notebook-container");
+    var existing = {};
+    var placed = {};
+
+    Array.prototype.forEach.call(container.children, function (block) {
+        var digest = block.getAttribute("data-digest");
+        (existing[digest] = existing[digest] || []).push(block);
+    });
+
+    update.order.forEach(function (digest, index) {
+        var block = existing[digest] && existing[digest].shift();
+
+        if (!block && placed[digest]) {
+            block = placed[digest].cloneNode(true);
+        } else if (!block) {
+            block = document.createElement("div");
+            block.className = "dial-block";
+            block.setAttribute("data-digest", digest);
+            block.innerHTML = update.fragments[digest];
+        }
+
+        placed[digest] = block;
+
+        var current = container.children[index];
+        if (current !== block) {
+            container.insertBefore(block, current || null);
+        }
+    });
+
+    while (container.children.length > update.order.length) {
+        container.removeChild(container.lastChild);
+    }
+}
+
+function dialCodeCell(index) {
+    return document.querySelectorAll("#notebook-container .code_cell")[index];
+}
+
+function dialCellOutputs(index) {
+    var cell = dialCodeCell(index);
+    if (!cell) {
+        return null;
+    }
+
+    var outputs = cell.querySelector(".dial-outputs");
+    if (!outputs) {
+        outputs = document.createElement("div");
+        outputs.className = "dial-outputs output_area";
+        cell.appendChild(outputs);
+    }
+
+    return outputs;
+}
+
+function dialClearOutputs() {
+    document.querySelectorAll(".dial-outputs").forEach(function (outputs) {
+        outputs.parentNode.removeChild(outputs);
+    });
+}
+
+function dialAppendOutput(index, html) {
+    var outputs = dialCellOutputs(index);
+    if (outputs) {
+        outputs.insertAdjacentHTML("beforeend", html);
+    }
+}
+
+function dialSetCellStatus(index, text) {
+    var outputs = dialCellOutputs(index);
+    if (!outputs) {
+        return;
+    }
+
+    var status = outputs.querySelector(".dial-cell-status");
+    if (!status) {
+        status = document.createElement("div");
+        status.className = "dial-cell-status";
+        status.style.cssText = "color: gray; font-size: smaller;";
+        outputs.insertBefore(status, outputs.firstChild);
+    }
+
+    status.textContent = text;
+}
+"""
+
+
+class NotebookPreviewView(QWebEngineView):
+    """The NotebookPreviewView class displays the HTML fragments of a notebook.
+
+    A shell page (with the notebook CSS) is loaded only once. Later updates only send
+    the fragments that weren't displayed yet, and the page rearranges its blocks in
+    place, so the scroll position is preserved and the CSS isn't parsed again.
+
+    Updates received while the shell page is loading are queued (only the latest one
+    is kept) and applied when the page finishes loading.
+
+    The outputs of executed cells can be appended below the code cells (See
+    `append_cell_output`).
+    """
+
+    def __init__(self, parent: "QWidget" = None):
+        super().__init__(parent)
+
+        self.__shell_requested = False
+        self.__shell_loaded = False
+
+        self.__displayed_digests: Set[str] = set()
+        self.__pending_fragments: Optional[List[Tuple[str, str]]] = None
+        self.__pending_scripts: List[str] = []
+
+        self.loadFinished.connect(self.__shell_load_finished)
+
+    def set_fragments(self, css: str, fragments: List[Tuple[str, str]]):
+        """Displays the (digest, HTML fragment) pairs, in order.
+
+        Args:
+            css: Style sheet of the fragments. Only used when the shell page is created
+                (The first time, or again if it couldn't be loaded).
+            fragments: List of pairs (digest, HTML fragment).
+        """
+        if not self.__shell_loaded:
+            self.__pending_fragments = fragments
+
+            if not self.__shell_requested:
+                self.__shell_requested = True
+                self.setHtml(self.__shell_html(css))
+
+            return
+
+        order = [digest for (digest, _) in fragments]
+        new_fragments = {
+            digest: fragment
+            for (digest, fragment) in fragments
+            if digest not in self.__displayed_digests
+        }
+
+        LOGGER.debug(
+            "Patching notebook preview: %s new of %s blocks",
+            len(new_fragments),
+            len(order),
+        )
+
+        update = json.dumps({"order": order, "fragments": new_fragments})
+        self.page().runJavaScript(f"dialPatchNotebook({update});")
+
+        self.__displayed_digests = set(order)
+
+    def clear_outputs(self):
+        """Removes the outputs of all the cells."""
+        self.__run_script("dialClearOutputs();")
+
+    def append_cell_output(self, index: int, html: str):
+        """Appends an HTML output below the `index` code cell."""
+        self.__run_script(f"dialAppendOutput({index}, {json.dumps(html)});")
+
+    def set_cell_status(self, index: int, text: str):
+        """Shows a status text (like the execution time) on the `index` code cell."""
+        self.__run_script(f"dialSetCellStatus({index}, {json.dumps(text)});")
+
+    def __run_script(self, script: str):
+        """Runs the script on the page, or queues it if the page isn't loaded yet."""
+        if not self.__shell_loaded:
+            self.__pending_scripts.append(script)
+            return
+
+        self.page().runJavaScript(script)
+
+    def __shell_load_finished(self, ok: bool):
+        if self.__shell_loaded:
+            return
+
+        if not ok:
+            LOGGER.warning("The notebook preview page couldn't be loaded.")
+
+            # The shell page is requested again on the next update
+            self.__shell_requested = False
+            return
+
+        self.__shell_loaded = True
+
+        if self.__pending_fragments is not None:
+            pending_fragments = self.__pending_fragments
+            self.__pending_fragments = None
+
+            self.set_fragments("", pending_fragments)
+
+        pending_scripts = self.__pending_scripts
+        self.__pending_scripts = []
+
+        for script in pending_scripts:
+            self.__run_script(script)
+
+    def __shell_html(self, css: str) -> str:
+        return (
+            f'<html><head><style type="text/css">{css}</style>'
+            f"<script>{_SHELL_SCRIPT}</script></head><body>"
+            f'<div tabindex="-1" id="notebook" class="border-box-sizing">'
+            f'<div class="container" id="notebook-container"></div></div>'
+            f"</body></html>"
+        )
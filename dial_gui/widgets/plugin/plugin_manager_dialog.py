@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 
 import dependency_injector.providers as providers
 from dial_core.utils import log
+from dial_gui.utils.plugins_index import PluginsIndexSingleton
 from dial_gui.widgets.log import LoggerTextboxFactory
 from PySide2.QtCore import QSize
 from PySide2.QtWidgets import QDialog, QGroupBox, QVBoxLayout
@@ -44,6 +45,12 @@ class PluginManagerDialog(QDialog):
 
         self.setLayout(self.__main_layout)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+
+        # Plugins can be installed or removed while the application is running
+        PluginsIndexSingleton().invalidate()
+
     def sizeHint(self) -> "QSize":
         """Preferred size of this dialog."""
         return QSize(600, 400)
@@ -0,0 +1,75 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import pytest
+
+from dial_gui.node_editor import LayoutStore
+
+
+@pytest.fixture
+def layout_store():
+    return LayoutStore(capacity=2)
+
+
+def test_allocate_grows_store(layout_store):
+    slots = [layout_store.allocate() for _ in range(5)]
+
+    assert slots == [0, 1, 2, 3, 4]
+    assert len(layout_store) >= 5
+
+
+def test_release_reuses_slot(layout_store):
+    layout_store.allocate()
+    slot = layout_store.allocate()
+
+    layout_store.release(slot)
+
+    assert layout_store.allocate() == slot
+
+
+def test_translate(layout_store):
+    slot_a = layout_store.allocate()
+    slot_b = layout_store.allocate()
+
+    layout_store.set_position(slot_a, 10, 20)
+    layout_store.set_position(slot_b, -5, 0)
+
+    layout_store.translate([slot_a, slot_b], 5, -10)
+
+    assert layout_store.position(slot_a) == (15, 10)
+    assert layout_store.position(slot_b) == (0, -10)
+
+
+def test_bounding_rect(layout_store):
+    slot_a = layout_store.allocate()
+    slot_b = layout_store.allocate()
+
+    layout_store.set_position(slot_a, 0, 0)
+    layout_store.set_size(slot_a, 10, 10)
+    layout_store.set_position(slot_b, 20, 30)
+    layout_store.set_size(slot_b, 5, 5)
+
+    assert layout_store.bounding_rect() == (0, 0, 25, 35)
+
+
+def test_save_and_open(tmpdir, layout_store):
+    project_file_path = str(tmpdir.join("project.dial"))
+
+    slot_a = layout_store.allocate()
+    slot_b = layout_store.allocate()
+
+    layout_store.set_position(slot_a, 1, 2)
+    layout_store.set_position(slot_b, 3, 4)
+    layout_store.set_windows_mask(slot_b, 0b101)
+
+    layout_store.save(project_file_path, [slot_b, slot_a])
+
+    opened_layout_store = LayoutStore.open(project_file_path)
+
+    assert len(opened_layout_store) == 2
+    assert opened_layout_store.position(0) == (3, 4)
+    assert opened_layout_store.windows_mask(0) == 0b101
+    assert opened_layout_store.position(1) == (1, 2)
+
+
+def test_open_missing_file(tmpdir):
+    assert LayoutStore.open(str(tmpdir.join("missing.dial"))) is None
@@ -0,0 +1,49 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import sys
+from collections import OrderedDict
+from typing import List
+
+from dial_gui.node_editor import TypeColor
+from PySide2.QtGui import QColor
+
+
+def test_default_color():
+    class UnregisteredType:
+        pass
+
+    assert TypeColor.get_color_for(UnregisteredType) == QColor(TypeColor.default_color)
+
+
+def test_register_type():
+    class RegisteredType:
+        pass
+
+    TypeColor.register_color(RegisteredType, "#123456")
+
+    assert TypeColor.get_color_for(RegisteredType) == QColor("#123456")
+
+
+def test_register_qualified_name():
+    TypeColor.register_color("collections.OrderedDict", "#654321")
+
+    assert TypeColor.get_color_for(OrderedDict) == QColor("#654321")
+
+
+def test_register_list_of_qualified_name():
+    TypeColor.register_color("List[collections.OrderedDict]", "#AABBCC")
+
+    assert TypeColor.get_color_for(List[OrderedDict]) == QColor("#AABBCC")
+
+
+def test_qualified_name_does_not_import_module():
+    TypeColor.register_color("dial_not_imported_module.SomeType", "#ABCDEF")
+
+    TypeColor.get_color_for(int)
+
+    assert "dial_not_imported_module" not in sys.modules
+
+
+def test_styles_are_shared():
+    assert TypeColor.get_style_for(int) is TypeColor.get_style_for(int)
+    assert TypeColor.get_style_for(int).color == TypeColor.get_color_for(int)
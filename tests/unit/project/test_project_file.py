@@ -0,0 +1,83 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import pickle
+
+import pytest
+from dial_core.node_editor import Node
+from PySide2.QtWidgets import QWidget
+
+from dial_gui.node_editor import DeferredInnerWidget
+from dial_gui.project import project_file
+
+
+class _InnerWidget(QWidget):
+    def __reduce__(self):
+        return (_InnerWidget, ())
+
+
+def test_compress_roundtrip():
+    payload = bytes(range(256)) * 1000
+
+    content = project_file.compress(payload, level=6, chunk_size=1000)
+
+    assert project_file.is_compressed(content)
+    assert len(content) < len(payload)
+    assert project_file.decompress(content) == payload
+
+
+def test_compress_empty_payload():
+    content = project_file.compress(b"")
+
+    assert project_file.decompress(content) == b""
+
+
+def test_loads_compressed_and_legacy_content():
+    payload = pickle.dumps({"name": "project"})
+
+    assert project_file.loads(payload) == {"name": "project"}
+    assert project_file.loads(project_file.compress(payload)) == {"name": "project"}
+
+
+def test_decompress_corrupted_content():
+    content = project_file.compress(b"foo" * 1000)
+
+    with pytest.raises(ValueError):
+        project_file.decompress(content[:-5])
+
+    with pytest.raises(ValueError):
+        project_file.decompress(b"not compressed")
+
+
+def test_write(tmpdir):
+    file_path = str(tmpdir.join("project.dial"))
+
+    project_file.write(file_path, b"foo")
+    project_file.write(file_path, b"bar")
+
+    with open(file_path, "rb") as written_file:
+        assert written_file.read() == b"bar"
+
+    assert tmpdir.listdir() == [tmpdir.join("project.dial")]
+
+
+def test_inner_widgets_deferred_once(qtbot):
+    inner_widget = _InnerWidget()
+    node = Node("Node", inner_widget=inner_widget)
+
+    payload = project_file.dumps({"node": node, "widget": inner_widget})
+
+    assert payload.count(pickle.dumps(inner_widget)) == 1
+
+    loaded = project_file.loads(payload)
+    placeholder = loaded["node"].inner_widget
+
+    assert isinstance(placeholder, DeferredInnerWidget)
+    assert loaded["widget"] is placeholder
+
+    assert placeholder.materialize() is placeholder.materialize()
+
+
+def test_other_widgets_not_deferred(qtbot):
+    loaded = project_file.loads(project_file.dumps({"widget": _InnerWidget()}))
+
+    assert isinstance(loaded["widget"], _InnerWidget)
@@ -0,0 +1,72 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import pytest
+
+from dial_gui.project import project_session
+
+
+@pytest.fixture
+def project_files(tmpdir):
+    file_paths = []
+
+    for name in ("a", "b", "c"):
+        project_file = tmpdir.join(f"{name}.dial")
+        project_file.write_binary(b"")
+        file_paths.append(str(project_file))
+
+    return file_paths
+
+
+@pytest.fixture
+def session_file(tmpdir):
+    return str(tmpdir.join("session.json"))
+
+
+def test_save_and_load(project_files, session_file):
+    session = project_session.Session(
+        projects=[
+            project_session.SessionProject(
+                file_path=file_path,
+                name=f"project {i}",
+                view_state={"zoom": 1.5, "center": [10.0, -2.0]},
+            )
+            for (i, file_path) in enumerate(project_files)
+        ],
+        active_index=1,
+    )
+
+    project_session.save(session, session_file)
+
+    assert project_session.load(session_file) == session
+
+
+def test_load_discards_missing_files(project_files, session_file, tmpdir):
+    missing_file_path = str(tmpdir.join("missing.dial"))
+
+    project_session.save(
+        project_session.Session(
+            projects=[
+                project_session.SessionProject(file_path=missing_file_path, name="x"),
+                project_session.SessionProject(file_path=project_files[0], name="a"),
+                project_session.SessionProject(file_path=project_files[2], name="c"),
+            ],
+            active_index=2,
+        ),
+        session_file,
+    )
+
+    session = project_session.load(session_file)
+
+    assert [project.name for project in session.projects] == ["a", "c"]
+    assert session.active_index == 1
+
+
+def test_load_without_session(session_file):
+    assert project_session.load(session_file) is None
+
+
+def test_load_invalid_session(session_file):
+    with open(session_file, "w") as invalid_file:
+        invalid_file.write("{not json")
+
+    assert project_session.load(session_file) is None
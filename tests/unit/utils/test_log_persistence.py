@@ -0,0 +1,92 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import json
+import logging
+import os
+
+import pytest
+
+from dial_gui.utils.log_persistence import LogPersistence
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("test_log_persistence")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    return logger
+
+
+def read_records(log_file):
+    with open(log_file, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_write_records(tmpdir, logger):
+    log_file = os.path.join(tmpdir, "logs", "dial.jsonl")
+
+    log_persistence = LogPersistence(log_file)
+    log_persistence.start(logger)
+
+    assert log_persistence.is_running
+
+    logger.info("Loaded %d nodes", 3)
+
+    try:
+        raise ValueError("Invalid node")
+    except ValueError:
+        logger.exception("Node failed")
+
+    log_persistence.stop(logger)
+
+    assert not log_persistence.is_running
+
+    records = read_records(log_file)
+
+    assert len(records) == 2
+    assert records[0]["message"] == "Loaded 3 nodes"
+    assert records[0]["level"] == "INFO"
+    assert records[0]["logger"] == "test_log_persistence"
+    assert records[1]["message"].startswith("Node failed\n")
+    assert "ValueError: Invalid node" in records[1]["message"]
+
+
+def test_rotation(tmpdir, logger):
+    log_file = os.path.join(tmpdir, "dial.jsonl")
+
+    log_persistence = LogPersistence(log_file, max_bytes=500, backup_count=2)
+    log_persistence.start(logger)
+
+    for i in range(50):
+        logger.info("Message %d", i)
+
+    log_persistence.stop(logger)
+
+    assert os.path.isfile(log_file + ".1")
+    assert os.path.isfile(log_file + ".2")
+    assert not os.path.isfile(log_file + ".3")
+
+    assert read_records(log_file)[-1]["message"] == "Message 49"
+
+
+def test_records_not_modified(tmpdir, logger):
+    log_persistence = LogPersistence(os.path.join(tmpdir, "dial.jsonl"))
+    log_persistence.start(logger)
+
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+
+    try:
+        raise ValueError("Invalid node")
+    except ValueError:
+        logger.exception("Node %s failed", "a")
+
+    logger.removeHandler(handler)
+    log_persistence.stop(logger)
+
+    assert records[0].msg == "Node %s failed"
+    assert records[0].args == ("a",)
+    assert records[0].exc_info is not None
@@ -0,0 +1,89 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import logging
+
+import pytest
+
+from dial_gui.utils.log_records_buffer import LogRecordsBuffer
+
+
+def log_record(name, level, message):
+    return logging.LogRecord(name, level, __file__, 0, message, None, None)
+
+
+@pytest.fixture
+def records_buffer():
+    records_buffer = LogRecordsBuffer(capacity=4)
+
+    records_buffer.handle(log_record("dial_gui", logging.INFO, "Started"))
+    records_buffer.handle(log_record("dial_gui.project", logging.WARNING, "No path"))
+    records_buffer.handle(log_record("dial_core", logging.DEBUG, "Loading nodes"))
+    records_buffer.handle(log_record("dial_gui", logging.ERROR, "Node failed"))
+
+    return records_buffer
+
+
+def test_entries(records_buffer):
+    assert len(records_buffer) == 4
+    assert records_buffer.entry(1).message == "No path"
+    assert records_buffer.entry(1).name == "dial_gui.project"
+    assert records_buffer.entry(4) is None
+
+
+def test_capacity_discards_oldest(records_buffer):
+    records_buffer.handle(log_record("plugin", logging.INFO, "Plugin loaded"))
+
+    assert len(records_buffer) == 4
+    assert records_buffer.first_sequence == 1
+    assert records_buffer.entry(0) is None
+    assert records_buffer.entry(4).message == "Plugin loaded"
+    assert records_buffer.filtered() == [1, 2, 3, 4]
+    assert records_buffer.filtered(min_level=logging.INFO) == [1, 3, 4]
+
+
+def test_filter_by_level(records_buffer):
+    assert records_buffer.filtered(min_level=logging.WARNING) == [1, 3]
+    assert records_buffer.filtered(min_level=logging.DEBUG) == [0, 1, 2, 3]
+
+
+def test_filter_by_logger_name(records_buffer):
+    assert records_buffer.filtered(logger_name="dial_gui") == [0, 1, 3]
+    assert records_buffer.filtered(logger_name="dial_gui.project") == [1]
+    assert records_buffer.filtered(logger_name="dial") == []
+
+
+def test_filter_by_text(records_buffer):
+    assert records_buffer.filtered(text="node") == [2, 3]
+    assert records_buffer.filtered(text="NODE", min_level=logging.INFO) == [3]
+
+
+def test_filter_range(records_buffer):
+    assert records_buffer.filtered(start=2) == [2, 3]
+    assert records_buffer.filtered(logger_name="dial_gui", start=1, stop=3) == [1]
+
+
+def test_filter_limit(records_buffer):
+    assert records_buffer.filtered(limit=2) == [2, 3]
+    assert records_buffer.filtered(stop=3, limit=2) == [1, 2]
+    assert records_buffer.filtered(text="node", limit=1) == [3]
+    assert records_buffer.filtered(min_level=logging.INFO, limit=5) == [0, 1, 3]
+
+
+def test_logger_names(records_buffer):
+    assert records_buffer.logger_names() == [
+        "dial_core",
+        "dial_gui",
+        "dial_gui.project",
+    ]
+
+
+def test_clear(records_buffer):
+    records_buffer.clear()
+
+    assert len(records_buffer) == 0
+    assert records_buffer.filtered() == []
+    assert records_buffer.logger_names() == []
+
+    records_buffer.handle(log_record("dial_gui", logging.INFO, "Restarted"))
+
+    assert records_buffer.filtered(logger_name="dial_gui") == [4]
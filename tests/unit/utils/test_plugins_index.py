@@ -0,0 +1,102 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import os
+
+import pkg_resources
+import pytest
+
+from dial_gui.utils.plugins_index import PluginsIndex
+
+
+def add_distribution(install_directory, name, version, requires=()):
+    module_name = name.replace("-", "_")
+    metadata_directory = os.path.join(
+        install_directory, f"{module_name}-{version}.dist-info"
+    )
+    os.mkdir(metadata_directory)
+
+    with open(os.path.join(metadata_directory, "METADATA"), "w") as metadata_file:
+        metadata_file.write(
+            f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+            f"Summary: The {name} plugin\n"
+        )
+        for requirement in requires:
+            metadata_file.write(f"Requires-Dist: {requirement}\n")
+
+    with open(os.path.join(metadata_directory, "entry_points.txt"), "w") as ep_file:
+        ep_file.write(f"[dial.plugins]\n{name} = {module_name}:load_plugin\n")
+
+
+@pytest.fixture
+def install_directory(tmpdir):
+    directory = str(tmpdir.mkdir("site-packages"))
+
+    add_distribution(directory, "plugin-a", "1.0", requires=["plugin-b"])
+    add_distribution(directory, "plugin-b", "2.0")
+
+    return directory
+
+
+@pytest.fixture
+def index_file(tmpdir):
+    return str(tmpdir.join("plugins_index.json"))
+
+
+def test_rebuild_writes_metadata(install_directory, index_file):
+    plugins_index = PluginsIndex(install_directory, index_file)
+
+    assert not plugins_index.is_up_to_date()
+
+    plugins_index.rebuild()
+
+    assert os.path.isfile(index_file)
+    assert plugins_index.version("plugin-a") == "1.0"
+    assert plugins_index.requirements("plugin-a") == ["plugin-b"]
+    assert plugins_index.entry_points("plugin-b") == {
+        "dial.plugins": ["plugin-b = plugin_b:load_plugin"]
+    }
+    assert plugins_index.distributions()["plugin-b"]["summary"] == "The plugin-b plugin"
+
+
+def test_index_reused_while_up_to_date(install_directory, index_file):
+    PluginsIndex(install_directory, index_file).rebuild()
+
+    plugins_index = PluginsIndex(install_directory, index_file)
+
+    assert plugins_index.is_up_to_date()
+    assert plugins_index.version("plugin-b") == "2.0"
+
+
+def test_index_invalidated_by_new_distribution(install_directory, index_file):
+    PluginsIndex(install_directory, index_file).rebuild()
+
+    add_distribution(install_directory, "plugin-c", "0.1")
+    os.utime(install_directory, ns=(0, 0))
+
+    assert not PluginsIndex(install_directory, index_file).is_up_to_date()
+
+
+def test_register_distributions_from_index(install_directory, index_file):
+    PluginsIndex(install_directory, index_file).rebuild()
+
+    working_set = pkg_resources.WorkingSet([])
+    PluginsIndex(install_directory, index_file).register_distributions(working_set)
+
+    distribution = working_set.find(pkg_resources.Requirement.parse("plugin-a"))
+
+    assert distribution.version == "1.0"
+    assert [req.project_name for req in distribution.requires()] == ["plugin-b"]
+
+
+def test_invalidate_checks_install_directory_again(install_directory, index_file):
+    plugins_index = PluginsIndex(install_directory, index_file)
+    plugins_index.rebuild()
+
+    add_distribution(install_directory, "plugin-c", "0.1")
+    os.utime(install_directory, ns=(0, 0))
+
+    assert plugins_index.is_up_to_date()
+
+    plugins_index.invalidate()
+
+    assert not plugins_index.is_up_to_date()
@@ -0,0 +1,81 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+import logging
+
+import pytest
+
+from dial_gui.utils.log_records_buffer import LogRecordsBuffer
+from dial_gui.widgets.log import LogRecordsModel
+
+
+def log_record(name, level, message):
+    return logging.LogRecord(name, level, __file__, 0, message, None, None)
+
+
+@pytest.fixture
+def records_buffer():
+    records_buffer = LogRecordsBuffer(capacity=3)
+
+    records_buffer.handle(log_record("dial_gui", logging.INFO, "Started"))
+    records_buffer.handle(log_record("dial_core", logging.WARNING, "No path"))
+
+    return records_buffer
+
+
+@pytest.fixture
+def records_model(records_buffer):
+    return LogRecordsModel(records_buffer)
+
+
+def test_rows(qtbot, records_model):
+    assert records_model.rowCount() == 2
+    assert records_model.entry(1).message == "No path"
+    assert records_model.data(records_model.index(0, 1)) == "INFO"
+
+
+def test_set_filter(qtbot, records_model):
+    records_model.set_filter(min_level=logging.WARNING)
+
+    assert records_model.rowCount() == 1
+
+    records_model.set_filter(min_level=logging.NOTSET, text="start")
+
+    assert records_model.rowCount() == 1
+    assert records_model.entry(0).message == "Started"
+
+
+def test_refresh(qtbot, records_buffer, records_model):
+    records_buffer.handle(log_record("dial_gui", logging.ERROR, "Failed"))
+    records_buffer.handle(log_record("dial_gui", logging.INFO, "Retrying"))
+
+    records_model.refresh()
+
+    assert records_model.rowCount() == 3
+    assert [records_model.entry(row).message for row in range(3)] == [
+        "No path",
+        "Failed",
+        "Retrying",
+    ]
+
+
+def test_fetch_older(qtbot):
+    records_buffer = LogRecordsBuffer(capacity=10)
+
+    for i in range(5):
+        records_buffer.handle(log_record("dial_gui", logging.INFO, f"Message {i}"))
+
+    records_model = LogRecordsModel(records_buffer, page_size=2)
+
+    assert records_model.rowCount() == 2
+    assert records_model.entry(0).message == "Message 3"
+    assert records_model.has_older_records()
+
+    assert records_model.fetch_older() == 2
+    assert records_model.entry(0).message == "Message 1"
+
+    assert records_model.fetch_older() == 1
+    assert records_model.entry(0).message == "Message 0"
+    assert not records_model.has_older_records()
+
+    assert records_model.fetch_older() == 0
+    assert records_model.rowCount() == 5
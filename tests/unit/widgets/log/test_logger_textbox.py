@@ -1,5 +1,8 @@
 # vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
 
+import logging
+import threading
+
 import pytest
 
 from dial_gui.widgets.log import LoggerTextboxFactory
@@ -18,3 +21,42 @@ def test_set_plain_text(qtbot, logger_textbox):
     logger_textbox.set_plain_text("bar")
 
     assert logger_textbox.text == "bar"
+
+
+def log_record(message):
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def test_emit_from_worker_thread(qtbot, logger_textbox):
+    def log_lines():
+        for i in range(3):
+            logger_textbox.handle(log_record(f"line {i}"))
+
+    worker = threading.Thread(target=log_lines)
+    worker.start()
+    worker.join()
+
+    qtbot.waitUntil(lambda: logger_textbox._textbox.blockCount() == 3)
+
+    assert logger_textbox._textbox.toPlainText().endswith("line 2")
+
+
+def test_lines_appended_in_batches(qtbot, logger_textbox):
+    logger_textbox.max_lines_per_flush = 2
+
+    for i in range(5):
+        logger_textbox.handle(log_record(f"line {i}"))
+
+    qtbot.waitUntil(lambda: logger_textbox._textbox.toPlainText() != "")
+
+    assert logger_textbox._textbox.blockCount() == 2
+
+    assert logger_textbox.text.splitlines()[-1].endswith("line 4")
+
+
+def test_set_plain_text_discards_pending_lines(qtbot, logger_textbox):
+    logger_textbox.handle(log_record("pending"))
+
+    logger_textbox.set_plain_text("foo")
+
+    assert logger_textbox.text == "foo"